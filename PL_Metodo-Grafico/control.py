@@ -0,0 +1,70 @@
+import threading
+from time import perf_counter
+
+# Motivos por los que se detiene una resolución
+MENSAJES = {
+    'cancelado': "Resolución cancelada.",
+    'limite_tiempo': "Se alcanzó el límite de tiempo.",
+    'limite_iteraciones': "Se alcanzó el límite de iteraciones.",
+}
+
+class Detenido(Exception):
+    """
+    Interrumpe la resolución. `estado` es 'cancelado', 'limite_tiempo' o
+    'limite_iteraciones'.
+    """
+    def __init__(self, estado):
+        super().__init__(MENSAJES[estado])
+        self.estado = estado
+
+class ControlResolucion:
+    """
+    Presupuesto y cancelación de una resolución que corre en otro hilo. La
+    intersección de semiplanos llama a `iteracion` por cada semiplano que
+    procesa; lanza Detenido si se pidió cancelar o se agotó el tiempo o las
+    iteraciones, y pasa a `progreso` un diccionario con 'iteraciones',
+    'segundos' y los datos del bucle, como mucho una vez cada `intervalo`
+    segundos.
+    """
+    def __init__(self, max_segundos=None, max_iteraciones=None, progreso=None, intervalo=0.1):
+        self.max_segundos = max_segundos
+        self.max_iteraciones = max_iteraciones
+        self.progreso = progreso
+        self.intervalo = intervalo
+        self.iteraciones = 0
+        self.inicio = perf_counter()
+        self._ultimo_aviso = -intervalo
+        self._cancelar = threading.Event()
+
+    def cancelar(self):
+        """
+        Pide detener la resolución; es seguro llamarlo desde otro hilo.
+        """
+        self._cancelar.set()
+
+    @property
+    def cancelado(self):
+        return self._cancelar.is_set()
+
+    @property
+    def segundos(self):
+        return perf_counter() - self.inicio
+
+    def verificar(self):
+        if self._cancelar.is_set():
+            raise Detenido('cancelado')
+        if self.max_segundos is not None and self.segundos > self.max_segundos:
+            raise Detenido('limite_tiempo')
+        if self.max_iteraciones is not None and self.iteraciones > self.max_iteraciones:
+            raise Detenido('limite_iteraciones')
+
+    def informar(self, **info):
+        self.verificar()
+        segundos = self.segundos
+        if self.progreso is not None and segundos - self._ultimo_aviso >= self.intervalo:
+            self._ultimo_aviso = segundos
+            self.progreso(dict(info, iteraciones=self.iteraciones, segundos=segundos))
+
+    def iteracion(self, **info):
+        self.iteraciones += 1
+        self.informar(**info)
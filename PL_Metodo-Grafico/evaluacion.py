@@ -0,0 +1,48 @@
+import numpy as np
+
+from problema import como_problema
+
+def holguras(A, b, sentidos, puntos):
+    """
+    Holgura de cada restricción en cada punto, matriz (m, k) con un solo
+    producto A @ P.T: b - a·p para '<=', a·p - b para '>=' y -|a·p - b|
+    para '='. Es negativa donde se viola.
+    """
+    puntos = np.asarray(puntos, dtype=float).reshape(-1, 2)
+    diferencia = b[:, None] - A @ puntos.T
+    return np.where(sentidos[:, None] == 0, -np.abs(diferencia), sentidos[:, None] * diferencia)
+
+def restricciones_violadas(A, b, sentidos, puntos, tol=1e-9):
+    """
+    Matriz (m, k) que indica qué restricciones viola cada punto del bloque,
+    con tolerancia relativa tol * (1 + |b|).
+    """
+    return holguras(A, b, sentidos, puntos) < -tol * (1 + np.abs(b))[:, None]
+
+def mascara_factibles(A, b, sentidos, puntos, tol=1e-9):
+    """
+    Evalúa todas las restricciones sobre un bloque de puntos con un solo producto.
+    """
+    return ~restricciones_violadas(A, b, sentidos, puntos, tol).any(axis=0)
+
+def evaluar(restricciones, puntos, tol=1e-9):
+    """
+    Evalúa un bloque de puntos (k, 2) sobre un Problema (o la lista de
+    diccionarios). Devuelve 'factibles' (k,), 'violadas' (m, k), 'holguras'
+    (m, k) y 'violacion' (k,), la mayor violación de cada punto.
+    """
+    problema = como_problema(restricciones)
+    h = holguras(problema.A, problema.b, problema.sentidos, puntos)
+    violadas = h < -tol * (1 + np.abs(problema.b))[:, None]
+    return {
+        'factibles': ~violadas.any(axis=0),
+        'violadas': violadas,
+        'holguras': h,
+        'violacion': np.maximum(-h.min(axis=0), 0.0) if len(h) else np.zeros(h.shape[1]),
+    }
+
+def es_factible(punto, restricciones, tol=1e-9):
+    """
+    Verifica si un punto (x, y) satisface todas las restricciones.
+    """
+    return bool(evaluar(restricciones, punto, tol)['factibles'][0])
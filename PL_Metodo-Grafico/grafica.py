@@ -2,24 +2,20 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-def es_factible(x, y, restricciones):
-    for r in restricciones:
-        lhs = r['a'] * x + r['b'] * y
-        if r['inecuacion'] == '<=' and lhs > r['c'] + 1e-9:
-            return False
-        elif r['inecuacion'] == '>=' and lhs < r['c'] - 1e-9:
-            return False
-    return True
+from evaluacion import evaluar
+from problema import INECUACIONES, como_problema
 
-def dibujar_grafico(restricciones, puntos_factibles, punto_optimo, container):
+def dibujar_grafico(restricciones, puntos_factibles, punto_optimo, container, poligono=None):
+    problema = como_problema(restricciones)
+    # El origen decide qué lado de cada recta inclinada se sombrea
+    origen_factible = ~evaluar(problema, (0.0, 0.0))['violadas'][:, 0]
     fig, ax = plt.subplots(figsize=(5, 4), dpi=100)
     
     x_max = max([p[0] for p in puntos_factibles]) + 2 if puntos_factibles else 10
     y_max = max([p[1] for p in puntos_factibles]) + 2 if puntos_factibles else 10
     
-    for r in restricciones:
-        a, b, c = r['a'], r['b'], r['c']
-        ineq = r['inecuacion']
+    for (a, b), c, sentido, en_origen in zip(problema.A, problema.b, problema.sentidos, origen_factible):
+        ineq = INECUACIONES[int(sentido)]
         x_vals = np.linspace(0, x_max, 400)
         
         if a == 0:
@@ -42,12 +38,20 @@ def dibujar_grafico(restricciones, puntos_factibles, punto_optimo, container):
             # Caso general (línea inclinada)
             y_vals = (c - a * x_vals) / b
             ax.plot(x_vals, y_vals, label=f'{a}x + {b}y {ineq} {c}')
-            if es_factible(0, 0, [r]):
+            if en_origen:
                 ax.fill_between(x_vals, y_vals, -10, alpha=0.1)
             else:
                 ax.fill_between(x_vals, y_vals, 10, alpha=0.1)
     
-    if len(puntos_factibles) >= 3:
+    if poligono is not None and len(poligono) >= 3:
+        # El polígono ya viene ordenado; si la región no está acotada llega
+        # recortado por una caja grande, así que se conservan los límites
+        limites = ax.get_xlim(), ax.get_ylim()
+        polygon = np.array(poligono)
+        ax.fill(polygon[:,0], polygon[:,1], color='gray', alpha=0.3, label='Región Factible')
+        ax.set_xlim(limites[0])
+        ax.set_ylim(limites[1])
+    elif len(puntos_factibles) >= 3:
         centroid = (np.mean([p[0] for p in puntos_factibles]), np.mean([p[1] for p in puntos_factibles]))
         sorted_points = sorted(puntos_factibles, key=lambda p: np.arctan2(p[1]-centroid[1], p[0]-centroid[0]))
         polygon = np.array(sorted_points)
@@ -0,0 +1,110 @@
+import numpy as np
+
+class IndicePoligono:
+    """
+    Índice sobre la región factible ya calculada: ordena por ángulo las
+    normales exteriores de las aristas para responder, por búsqueda binaria,
+    qué vértice maximiza o minimiza cualquier función objetivo c1·x + c2·y.
+    """
+    def __init__(self, region):
+        self.region = region
+        self.vertices = np.array(region['poligono'], dtype=float).reshape(-1, 2)
+        self.en_caja = np.array(region['en_caja'], dtype=bool)
+        self.normales = np.asarray(region['normales'], dtype=float).reshape(-1, 2)
+        self.limites = np.asarray(region['limites'], dtype=float)
+        k = len(self.vertices)
+
+        if k >= 3:
+            aristas = np.roll(self.vertices, -1, axis=0) - self.vertices
+            normales = np.column_stack((aristas[:, 1], -aristas[:, 0]))
+            angulos = np.arctan2(normales[:, 1], normales[:, 0])
+            self._inicio = int(np.argmin(angulos))
+            self._angulos = np.roll(angulos, -self._inicio)
+        else:
+            self._inicio = 0
+            self._angulos = None
+
+        # Vértices reales que limitan con la caja (extremos de la cadena real)
+        reales = np.where(~self.en_caja)[0]
+        bordes = [i for i in reales if self.en_caja[(i - 1) % k] or self.en_caja[(i + 1) % k]]
+        self._bordes = np.array(bordes, dtype=int)
+
+    def optimizar_lote(self, objetivos, tipo='max'):
+        """
+        Resuelve a la vez una pila de objetivos (k, 2). Devuelve los vértices
+        óptimos (k, 2) y sus valores; si no está acotado el valor es ±inf y
+        el punto NaN.
+        """
+        C = np.atleast_2d(np.asarray(objetivos, dtype=float))
+        if not len(self.vertices):
+            return np.full((len(C), 2), np.nan), np.full(len(C), np.nan)
+        direcciones = C if tipo == 'max' else -C
+        if not np.any(~self.en_caja):
+            puntos, valores = self._optimizar_sin_vertices(C, direcciones, tipo)
+            puntos[np.isinf(valores)] = np.nan
+            return puntos, valores
+
+        if self._angulos is None:
+            # Región degenerada (punto o segmento): basta evaluar sus vértices
+            indices = np.argmax(direcciones @ self.vertices.T, axis=1)
+        else:
+            theta = np.arctan2(direcciones[:, 1], direcciones[:, 0])
+            posicion = np.searchsorted(self._angulos, theta) % len(self.vertices)
+            indices = (posicion + self._inicio) % len(self.vertices)
+
+        puntos = self.vertices[indices]
+        valores = np.einsum('ij,ij->i', C, puntos)
+
+        # Si el óptimo cae en la caja, el objetivo crece sin límite salvo
+        # empate con un vértice real del borde de la región
+        en_caja = self.en_caja[indices]
+        if np.any(en_caja):
+            infinito = np.inf if tipo == 'max' else -np.inf
+            if len(self._bordes):
+                valores_borde = direcciones[en_caja] @ self.vertices[self._bordes].T
+                mejor = np.argmax(valores_borde, axis=1)
+                escala = 1e-6 * (1 + np.abs(valores_borde.max(axis=1)))
+                empate = np.einsum('ij,ij->i', direcciones[en_caja], puntos[en_caja]) <= valores_borde.max(axis=1) + escala
+            else:
+                mejor = np.zeros(np.count_nonzero(en_caja), dtype=int)
+                empate = np.zeros(np.count_nonzero(en_caja), dtype=bool)
+            filas = np.where(en_caja)[0]
+            valores[filas[~empate]] = infinito
+            if np.any(empate):
+                puntos[filas[empate]] = self.vertices[self._bordes[mejor[empate]]]
+                valores[filas[empate]] = np.einsum('ij,ij->i', C[filas[empate]], puntos[filas[empate]])
+        puntos[np.isinf(valores)] = np.nan
+        return puntos, valores
+
+    def _optimizar_sin_vertices(self, C, direcciones, tipo, tol=1e-9):
+        """
+        Óptimos en una región no vacía sin vértices (semiplano, franja o
+        recta). Todas sus normales son paralelas a una dirección u y la
+        región contiene las rectas perpendiculares a u, así que un objetivo
+        solo está acotado si es paralelo a u y alguna restricción con normal
+        en su mismo sentido lo limita; gana la más restrictiva.
+        """
+        normas = np.linalg.norm(direcciones, axis=1)
+        alineadas = self.normales @ direcciones.T >= (1 - tol) * normas
+        limites = np.where(alineadas, self.limites[:, None], np.inf)
+        mejor = np.argmin(limites, axis=0) if len(self.limites) else np.zeros(len(C), dtype=int)
+        acotados = np.any(alineadas, axis=0) & (normas > tol)
+
+        # Objetivo nulo: cualquier punto de la región es óptimo (el centro del polígono recortado)
+        puntos = np.tile(self.vertices.mean(axis=0), (len(C), 1))
+        if np.any(acotados):
+            puntos[acotados] = self.normales[mejor[acotados]] * self.limites[mejor[acotados], None]
+        valores = np.einsum('ij,ij->i', C, puntos)
+        infinito = np.inf if tipo == 'max' else -np.inf
+        valores[~acotados & (normas > tol)] = infinito
+        return puntos, valores
+
+    def optimizar(self, coeff, tipo='max'):
+        """
+        Óptimo de una sola función objetivo: (punto, valor), con punto None
+        si no está acotado.
+        """
+        puntos, valores = self.optimizar_lote([coeff], tipo)
+        if np.isinf(valores[0]):
+            return None, float(valores[0])
+        return tuple(float(v) for v in puntos[0]), float(valores[0])
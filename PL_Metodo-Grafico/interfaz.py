@@ -2,9 +2,15 @@ import customtkinter as ctk
 import tkinter as tk
 import json
 import os
+import queue
+import threading
 import google.generativeai as genai
+from control import ControlResolucion, Detenido
 from optimizacion import resolver_optimizacion
 from grafica import dibujar_grafico
+from indice_poligono import IndicePoligono
+from problema import Problema
+from semiplanos import interseccion_semiplanos
 
 class FilaDeRestricciones(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
@@ -63,6 +69,14 @@ class App(ctk.CTk):
         self.frame_right = ctk.CTkFrame(self)
         self.frame_right.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
 
+        # Región factible de la última resolución, reutilizable si solo cambia el objetivo
+        self.indice = None
+        self.problema_indice = None
+        
+        # Resolución en curso en el hilo de trabajo: su control y la cola de avisos hacia la interfaz
+        self.control = None
+        self.cola = queue.Queue()
+
         self.cambiar_modo()
 
     def construir_modo_manual(self):
@@ -100,6 +114,18 @@ class App(ctk.CTk):
         self.button_solve = ctk.CTkButton(self.frame_left, text="Resolver Optimización", command=self.resolver)
         self.button_solve.pack(pady=10)
         
+        # Presupuesto de la resolución (vacío = sin límite) y cancelación
+        self.frame_control = ctk.CTkFrame(self.frame_left)
+        self.frame_control.pack(pady=5)
+        
+        self.entry_max_segundos = ctk.CTkEntry(self.frame_control, width=110, placeholder_text="Tiempo máx. (s)")
+        self.entry_max_segundos.grid(row=0, column=0, padx=5, pady=5)
+        self.entry_max_iteraciones = ctk.CTkEntry(self.frame_control, width=110, placeholder_text="Iteraciones máx.")
+        self.entry_max_iteraciones.grid(row=0, column=1, padx=5, pady=5)
+        
+        self.button_cancel = ctk.CTkButton(self.frame_control, text="Cancelar", command=self.cancelar, state="disabled")
+        self.button_cancel.grid(row=0, column=2, padx=5, pady=5)
+        
         self.text_output = ctk.CTkTextbox(self.frame_left, height=150)
         self.text_output.pack(pady=5, fill="both", expand=True)
 
@@ -222,6 +248,24 @@ class App(ctk.CTk):
             filas = self.filas_restricciones.pop()
             filas.destroy()
         
+    def mostrar_progreso(self, info):
+        """
+        Muestra el avance del cálculo de la región: semiplanos procesados.
+        """
+        linea = f"{info['segundos']:.1f} s  Semiplanos: {info['semiplanos']}/{info['total']}"
+        self.text_output.insert(tk.END, linea + "\n")
+        self.text_output.see(tk.END)
+        
+    def leer_presupuesto(self):
+        """
+        Lee el tiempo y las iteraciones máximas; un campo vacío es sin límite.
+        """
+        texto_segundos = self.entry_max_segundos.get().strip()
+        texto_iteraciones = self.entry_max_iteraciones.get().strip()
+        max_segundos = float(texto_segundos) if texto_segundos else None
+        max_iteraciones = int(texto_iteraciones) if texto_iteraciones else None
+        return max_segundos, max_iteraciones
+        
     def resolver(self):
         self.text_output.delete("1.0", tk.END)
         
@@ -241,10 +285,74 @@ class App(ctk.CTk):
                 return
             restricciones.append(restriccion)
         
-        resultado, mensaje, puntos_factibles = resolver_optimizacion(objetivo, restricciones)
+        try:
+            max_segundos, max_iteraciones = self.leer_presupuesto()
+        except ValueError:
+            self.text_output.insert(tk.END, "Error en el tiempo o las iteraciones máximas.\n")
+            return
+        
+        problema = Problema.desde_restricciones(restricciones)
+        indice = self.indice if problema == self.problema_indice else None
+        
+        # El hilo de trabajo no toca los widgets: los avisos y el resultado llegan por la cola
+        self.control = ControlResolucion(max_segundos, max_iteraciones,
+                                         progreso=lambda info: self.cola.put(('progreso', info)))
+        control = self.control
+        def trabajo():
+            nuevo_indice = indice
+            try:
+                if nuevo_indice is None:
+                    nuevo_indice = IndicePoligono(interseccion_semiplanos(problema, control=control))
+                salida = resolver_optimizacion(objetivo, problema, nuevo_indice)
+            except Detenido as e:
+                # Una región a medio recortar no da puntos factibles: solo vuelve el estado
+                nuevo_indice = None
+                salida = ({'punto_optimo': None, 'valor_optimo': None, 'estado': e.estado}, str(e), [], [])
+            except Exception as e:
+                nuevo_indice, salida = None, (None, f"Error: {str(e)}", [], [])
+            self.cola.put(('fin', (problema, nuevo_indice, salida)))
+        
+        self.button_solve.configure(state="disabled")
+        self.button_cancel.configure(state="normal")
+        threading.Thread(target=trabajo, daemon=True).start()
+        self.after(100, self.revisar_cola)
+        
+    def cancelar(self):
+        if self.control is not None:
+            self.control.cancelar()
+        
+    def revisar_cola(self):
+        """
+        Atiende en el hilo de la interfaz los avisos del hilo de trabajo y
+        vuelve a revisar la cola hasta que llega el resultado.
+        """
+        while True:
+            try:
+                tipo, datos = self.cola.get_nowait()
+            except queue.Empty:
+                self.after(100, self.revisar_cola)
+                return
+            if tipo == 'progreso':
+                self.mostrar_progreso(datos)
+            else:
+                break
+        
+        problema, indice, salida = datos
+        self.control = None
+        self.button_solve.configure(state="normal")
+        self.button_cancel.configure(state="disabled")
+        # La región solo se reutiliza si se llegó a calcular entera
+        if indice is not None:
+            self.indice = indice
+            self.problema_indice = problema
+        
+        resultado, mensaje, puntos_factibles, poligono = salida
         self.text_output.insert(tk.END, mensaje + "\n")
+        if resultado is not None:
+            self.text_output.insert(tk.END, f"Estado: {resultado['estado']}\n")
+        self.text_output.see(tk.END)
         
-        if resultado is None:
+        if resultado is None or resultado['punto_optimo'] is None:
             return
         
-        dibujar_grafico(restricciones, puntos_factibles, resultado['punto_optimo'], self.frame_right)
+        dibujar_grafico(problema, puntos_factibles, resultado['punto_optimo'], self.frame_right, poligono)
@@ -1,58 +1,54 @@
 import numpy as np
+from control import Detenido
+from indice_poligono import IndicePoligono
+from semiplanos import interseccion_semiplanos
 
-def encontrar_interseccion(restriccion1, restriccion2):
-    a1, b1, c1 = restriccion1['a'], restriccion1['b'], restriccion1['c']
-    a2, b2, c2 = restriccion2['a'], restriccion2['b'], restriccion2['c']
+def resolver_optimizacion(objetivo, restricciones, indice=None, control=None):
+    """
+    Resuelve el problema con la intersección de semiplanos y devuelve el
+    resultado, el mensaje, los puntos factibles y el polígono de la región
+    (ordenado en sentido antihorario, listo para dibujar).
+    Si se pasa el `indice` de una resolución anterior con las mismas
+    restricciones, la región no se vuelve a calcular.
+    Con un `control` (control.ControlResolucion) el cálculo de la región se
+    puede cancelar o limitar; si se detiene, el resultado no tiene punto
+    óptimo y su 'estado' es 'cancelado', 'limite_tiempo' o 'limite_iteraciones'
+    (con solución, 'optimo').
+    """
+    if indice is None:
+        try:
+            indice = IndicePoligono(interseccion_semiplanos(restricciones, control=control))
+        except Detenido as e:
+            return {'punto_optimo': None, 'valor_optimo': None, 'estado': e.estado}, str(e), [], []
+    region = indice.region
+    poligono = region['poligono']
+    puntos_factibles = [(round(x, 3), round(y, 3)) for (x, y) in region['vertices']]
     
-    denominador = a1 * b2 - a2 * b1
-    if abs(denominador) < 1e-9:
-        return None
-    x = (b2 * c1 - b1 * c2) / denominador
-    y = (a1 * c2 - a2 * c1) / denominador
-    return (x, y)
-
-def es_factible(x, y, restricciones):
-    for r in restricciones:
-        lhs = r['a'] * x + r['b'] * y
-        if r['inecuacion'] == '<=' and lhs > r['c'] + 1e-9:
-            return False
-        elif r['inecuacion'] == '>=' and lhs < r['c'] - 1e-9:
-            return False
-    return True
-
-def resolver_optimizacion(objetivo, restricciones):
-    intersecciones = []
-    n = len(restricciones)
-    for i in range(n):
-        for j in range(i+1, n):
-            punto = encontrar_interseccion(restricciones[i], restricciones[j])
-            if punto is not None:
-                intersecciones.append(punto)
-    
-    puntos_factibles = []
-    for punto in intersecciones:
-        x, y = punto
-        if es_factible(x, y, restricciones):
-            puntos_factibles.append((x, y))
+    if region['estado'] == 'infactible':
+        return None, "No hay solución factible", [], []
     
-    puntos_factibles = list(set([(round(x, 3), round(y, 3)) for (x, y) in puntos_factibles]))
+    # Óptimo por búsqueda binaria sobre las normales del polígono (o, sin
+    # vértices, por la restricción paralela al objetivo que lo limita)
+    punto, valor = indice.optimizar(objetivo['coeff'], objetivo['type'])
+    if np.isinf(valor):
+        return None, "Región no acotada: la función objetivo no tiene óptimo finito", puntos_factibles, poligono
     
-    if not puntos_factibles:
-        return None, "No hay solución factible", []
-    
-    coeficiente_objetivo = objetivo['coeff']
-    tipo_objetivo = objetivo['type']
-    valores = []
-    for punto in puntos_factibles:
-        x, y = punto
-        z = coeficiente_objetivo[0] * x + coeficiente_objetivo[1] * y
-        valores.append((z, punto))
-    
-    if tipo_objetivo == 'max':
-        optimo = max(valores, key=lambda v: v[0])
-    else:
-        optimo = min(valores, key=lambda v: v[0])
+    optimo = (valor, (round(punto[0], 3), round(punto[1], 3)))
     
     mensaje = (f"Solución óptima en (x, y) = ({optimo[1][0]:.2f}, {optimo[1][1]:.2f})\n"
             f"Valor óptimo: {optimo[0]:.2f}")
-    return {'punto_optimo': optimo[1], 'valor_optimo': optimo[0]}, mensaje, puntos_factibles
+    if region['estado'] == 'no_acotada':
+        mensaje += "\nLa región factible no está acotada"
+    return {'punto_optimo': optimo[1], 'valor_optimo': optimo[0], 'estado': 'optimo'}, mensaje, puntos_factibles, poligono
+
+def resolver_escenarios(objetivos, restricciones, tipo='max', indice=None):
+    """
+    Evalúa muchas funciones objetivo (array (k, 2)) sobre la misma región en
+    una sola llamada vectorizada. Devuelve los puntos óptimos (k, 2) y los
+    valores óptimos (k,), con ±inf (y punto NaN) donde el objetivo no está
+    acotado y NaN si la región es vacía. Coincide con resolver_optimizacion
+    objetivo a objetivo, también en regiones sin vértices.
+    """
+    if indice is None:
+        indice = IndicePoligono(interseccion_semiplanos(restricciones))
+    return indice.optimizar_lote(objetivos, tipo)
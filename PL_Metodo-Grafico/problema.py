@@ -0,0 +1,83 @@
+import numpy as np
+
+# Códigos de sentido de las restricciones
+SENTIDOS = {'<=': 1, '>=': -1, '=': 0}
+INECUACIONES = {1: '<=', -1: '>=', 0: '='}
+
+class Problema:
+    """
+    Restricciones a·x + b·y (<=, >=, =) c guardadas en arrays contiguos de
+    solo lectura, con los mismos nombres que el Problema de la aplicación
+    simplex: la matriz A (m, 2), el lado derecho b (m,) (la 'c' de los
+    diccionarios) y los sentidos como códigos int8 (1 para '<=', -1 para
+    '>=' y 0 para '='). Se construye una vez, es inmutable y se puede usar
+    como clave de diccionario. Se comporta también como la lista de
+    diccionarios {'a', 'b', 'c', 'inecuacion'}.
+    """
+    __slots__ = ('A', 'b', 'sentidos', '_hash')
+
+    def __init__(self, A, b, sentidos):
+        # + 0.0 cambia -0.0 por 0.0 para que el hash sea coherente con la igualdad
+        b = np.array(b, dtype=float).reshape(-1) + 0.0
+        A = np.array(A, dtype=float).reshape(len(b), 2) + 0.0
+        sentidos = np.asarray(sentidos)
+        if sentidos.dtype.kind in 'UO':
+            sentidos = [SENTIDOS[s] for s in sentidos]
+        sentidos = np.array(sentidos, dtype=np.int8).reshape(-1)
+        if len(sentidos) != len(b):
+            raise ValueError("A, b y los sentidos deben tener el mismo número de filas.")
+        for array in (A, b, sentidos):
+            array.setflags(write=False)
+        object.__setattr__(self, 'A', A)
+        object.__setattr__(self, 'b', b)
+        object.__setattr__(self, 'sentidos', sentidos)
+        object.__setattr__(self, '_hash', None)
+
+    @classmethod
+    def desde_restricciones(cls, restricciones):
+        """
+        Adaptador del formato de diccionarios {'a', 'b', 'c', 'inecuacion'}.
+        """
+        A = [(r['a'], r['b']) for r in restricciones]
+        b = [r['c'] for r in restricciones]
+        sentidos = [SENTIDOS[r['inecuacion']] for r in restricciones]
+        return cls(A, b, sentidos)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Problema es inmutable.")
+
+    def __reduce__(self):
+        return Problema, (self.A, self.b, self.sentidos)
+
+    def __len__(self):
+        return len(self.b)
+
+    def __getitem__(self, i):
+        return {'a': float(self.A[i, 0]), 'b': float(self.A[i, 1]), 'c': float(self.b[i]),
+                'inecuacion': INECUACIONES[int(self.sentidos[i])]}
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __eq__(self, otro):
+        if not isinstance(otro, Problema):
+            return NotImplemented
+        return (np.array_equal(self.A, otro.A) and np.array_equal(self.b, otro.b)
+                and np.array_equal(self.sentidos, otro.sentidos))
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash((self.A.tobytes(), self.b.tobytes(), self.sentidos.tobytes())))
+        return self._hash
+
+    def __repr__(self):
+        return f"Problema({len(self)} restricciones)"
+
+def como_problema(restricciones):
+    """
+    Devuelve `restricciones` como Problema, convirtiendo la lista de
+    diccionarios si hace falta.
+    """
+    if isinstance(restricciones, Problema):
+        return restricciones
+    return Problema.desde_restricciones(restricciones)
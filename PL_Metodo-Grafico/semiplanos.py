@@ -0,0 +1,163 @@
+import numpy as np
+from collections import deque
+
+from problema import como_problema
+
+def _semiplanos(restricciones):
+    """
+    Convierte cada restricción en semiplanos n·p <= c.
+    Las igualdades aportan dos semiplanos opuestos.
+    """
+    problema = como_problema(restricciones)
+    # '<=' y '=' aportan n·p <= c; '>=' y '=' aportan -n·p <= -c
+    menores = problema.sentidos >= 0
+    mayores = problema.sentidos <= 0
+    normales = np.vstack((problema.A[menores], -problema.A[mayores]))
+    limites = np.concatenate((problema.b[menores], -problema.b[mayores]))
+    return normales, limites
+
+def _cruz(u, v):
+    return u[0] * v[1] - u[1] * v[0]
+
+def _interseccion(p1, d1, p2, d2):
+    t = _cruz(p2 - p1, d2) / _cruz(d1, d2)
+    return p1 + t * d1
+
+def _recortar(normales, limites, tol, control=None):
+    """
+    Intersección de semiplanos por ordenación angular y doble cola.
+    Devuelve la lista de índices de semiplanos que forman el polígono en
+    orden antihorario, o None si la intersección es vacía. Con un `control`
+    cada semiplano procesado cuenta como una iteración.
+    """
+    direcciones = np.column_stack((-normales[:, 1], normales[:, 0])) + 0.0
+    puntos = normales * limites[:, None]
+    angulos = np.arctan2(direcciones[:, 1], direcciones[:, 0])
+    angulos[angulos <= -np.pi + tol] = np.pi
+
+    # Para direcciones iguales basta con el semiplano más restrictivo
+    orden = np.lexsort((limites, np.round(angulos / tol) * tol))
+    elegidos = [orden[0]]
+    for i in orden[1:]:
+        if abs(angulos[i] - angulos[elegidos[-1]]) > tol:
+            elegidos.append(i)
+
+    def fuera(i, q):
+        return _cruz(direcciones[i], q - puntos[i]) < -tol
+
+    def vertice(i, j):
+        return _interseccion(puntos[i], direcciones[i], puntos[j], direcciones[j])
+
+    cola = deque()
+    for k, i in enumerate(elegidos):
+        if control is not None:
+            control.iteracion(semiplanos=k, total=len(elegidos))
+        while len(cola) > 1 and fuera(i, vertice(cola[-1], cola[-2])):
+            cola.pop()
+        while len(cola) > 1 and fuera(i, vertice(cola[0], cola[1])):
+            cola.popleft()
+        if cola and abs(_cruz(direcciones[i], direcciones[cola[-1]])) < tol:
+            # Semiplanos paralelos con sentidos opuestos que no se solapan
+            if direcciones[i] @ direcciones[cola[-1]] < 0:
+                if fuera(i, puntos[cola[-1]]) or fuera(cola[-1], puntos[i]):
+                    return None
+            elif fuera(i, puntos[cola[-1]]):
+                cola.pop()
+            else:
+                continue
+        cola.append(i)
+
+    while len(cola) > 2 and fuera(cola[0], vertice(cola[-1], cola[-2])):
+        cola.pop()
+    while len(cola) > 2 and fuera(cola[-1], vertice(cola[0], cola[1])):
+        cola.popleft()
+    if len(cola) < 3:
+        return None
+    return list(cola)
+
+def interseccion_semiplanos(restricciones, tol=1e-9, control=None):
+    """
+    Calcula la región factible de un problema de dos variables en O(m log m).
+    Con un `control` (control.ControlResolucion) el cálculo puede cancelarse
+    o limitarse en tiempo y semiplanos procesados (lanza control.Detenido).
+    Devuelve un diccionario con:
+      - 'estado': 'acotada', 'no_acotada' o 'infactible'
+      - 'vertices': vértices de la región en orden antihorario
+      - 'poligono': la región recortada por una caja lo bastante grande para
+        contener todos los vértices (igual a 'vertices' si es acotada)
+      - 'en_caja': para cada punto de 'poligono', si lo define la caja
+      - 'normales', 'limites': los semiplanos normalizados n·p <= c
+    """
+    vacia = {'estado': 'infactible', 'vertices': [], 'poligono': [], 'en_caja': [],
+             'normales': np.zeros((0, 2)), 'limites': np.zeros(0)}
+    normales, limites = _semiplanos(restricciones)
+    normas = np.linalg.norm(normales, axis=1)
+
+    # Restricciones sin variables: 0 <= c es siempre cierta o nunca
+    nulas = normas < tol
+    if np.any(limites[nulas] < -tol):
+        return vacia
+    normales = normales[~nulas] / normas[~nulas, None]
+    limites = limites[~nulas] / normas[~nulas]
+
+    # La región es no acotada si las normales caben en un semiplano cerrado
+    if len(normales):
+        angulos = np.sort(np.arctan2(normales[:, 1], normales[:, 0]))
+        huecos = np.diff(np.append(angulos, angulos[0] + 2 * np.pi))
+        no_acotada = huecos.max() >= np.pi - tol
+    else:
+        no_acotada = True
+
+    caja = np.array([[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0], [0.0, -1.0]])
+    escala = 1.0 + (np.abs(limites).max() if len(limites) else 0.0)
+    radio = 1e3 * escala
+    anteriores = None
+    for _ in range(8):
+        todas_normales = np.vstack((normales, caja))
+        todos_limites = np.concatenate((limites, np.full(4, radio)))
+        es_caja = np.arange(len(todos_limites)) >= len(limites)
+        indices = _recortar(todas_normales, todos_limites, tol, control)
+        if indices is None:
+            return vacia
+
+        direcciones = np.column_stack((-todas_normales[:, 1], todas_normales[:, 0]))
+        puntos = todas_normales * todos_limites[:, None]
+        poligono, en_caja = [], []
+        for k, i in enumerate(indices):
+            j = indices[(k + 1) % len(indices)]
+            p = _interseccion(puntos[i], direcciones[i], puntos[j], direcciones[j])
+            if poligono and np.allclose(p, poligono[-1], rtol=tol, atol=tol * escala):
+                en_caja[-1] = en_caja[-1] and (es_caja[i] or es_caja[j])
+                continue
+            poligono.append(p)
+            en_caja.append(bool(es_caja[i] or es_caja[j]))
+        if len(poligono) > 1 and np.allclose(poligono[0], poligono[-1], rtol=tol, atol=tol * escala):
+            en_caja[0] = en_caja[0] and en_caja[-1]
+            poligono.pop()
+            en_caja.pop()
+
+        # Descartar puntos que no cumplen alguna restricción (regiones degeneradas)
+        poligono = np.array(poligono)
+        factibles = np.all(poligono @ normales.T <= limites + 1e-7 * escala, axis=1)
+        if not np.any(factibles):
+            return vacia
+        en_caja = [c for c, f in zip(en_caja, factibles) if f]
+        poligono = poligono[factibles]
+        vertices = [p for p, c in zip(poligono, en_caja) if not c]
+        # Si la región es acotada la caja no debe tocarla; si no lo es, la
+        # caja debe ser lo bastante grande para no cambiar los vértices reales
+        if not no_acotada and not any(en_caja):
+            break
+        if no_acotada and anteriores is not None and len(anteriores) == len(vertices):
+            break
+        anteriores = vertices
+        radio *= 1e3
+
+    return {
+        'estado': 'no_acotada' if no_acotada else 'acotada',
+        'vertices': [tuple(float(v) for v in p) for p in vertices],
+        'poligono': [tuple(float(v) for v in p) for p in poligono],
+        'en_caja': en_caja,
+        'normales': normales,
+        'limites': limites,
+    }
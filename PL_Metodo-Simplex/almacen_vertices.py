@@ -0,0 +1,132 @@
+import numpy as np
+from itertools import combinations, islice
+from math import comb
+
+from problema import SENTIDOS, fila_densa
+from evaluacion import restricciones_violadas
+from vertices import resolver_bloque, sin_duplicados
+
+class AlmacenVertices:
+    """
+    Almacén incremental de vértices indexado por el subconjunto de
+    restricciones que define cada punto. Guarda todas las intersecciones con
+    solución única junto con el número de restricciones que violan; los
+    vértices factibles son las que no violan ninguna. Al añadir la
+    restricción k solo se calculan los C(m, n-1) subconjuntos que la
+    contienen y al quitarla solo se actualizan los contadores.
+    """
+    def __init__(self, n_variables, tamano_bloque=4096, tol=1e-9):
+        self.n_variables = n_variables
+        self.tamano_bloque = tamano_bloque
+        self.tol = tol
+        self._filas = {}
+        self._siguiente_id = 0
+        self._claves = np.empty((0, n_variables), dtype=int)
+        self._puntos = np.empty((0, n_variables))
+        self._violaciones = np.empty(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self._filas)
+
+    def _fila(self, restriccion):
+        return (fila_densa(restriccion['a'], self.n_variables), float(restriccion['c']),
+                SENTIDOS[restriccion['inecuacion']])
+
+    def _matrices(self, ids):
+        A = np.array([self._filas[i][0] for i in ids], dtype=float).reshape(len(ids), self.n_variables)
+        b = np.array([self._filas[i][1] for i in ids], dtype=float)
+        sentidos = np.array([self._filas[i][2] for i in ids], dtype=np.int8)
+        return A, b, sentidos
+
+    def _incorporar(self, k, control=None):
+        """
+        Añade al almacén los puntos definidos por subconjuntos que contienen k
+        y cuenta las violaciones de k en los puntos existentes. Con un
+        `control` cada bloque de combinaciones se informa y puede detener el
+        cálculo (lanza control.Detenido y el almacén queda a medias).
+        """
+        ids = list(self._filas)
+        posicion = {i: p for p, i in enumerate(ids)}
+        A, b, sentidos = self._matrices(ids)
+
+        if len(self._puntos):
+            violada = restricciones_violadas(A[[posicion[k]]], b[[posicion[k]]], sentidos[[posicion[k]]],
+                                             self._puntos, self.tol)[0]
+            self._violaciones += violada.astype(np.int32)
+
+        otros = [i for i in ids if i != k]
+        combinaciones = combinations(otros, self.n_variables - 1)
+        total = comb(len(otros), self.n_variables - 1)
+        claves, puntos, violaciones = [], [], []
+        revisadas = 0
+        while True:
+            if control is not None:
+                control.informar(combinaciones=revisadas, total=total)
+            lista = list(islice(combinaciones, self.tamano_bloque))
+            bloque = np.array(lista, dtype=int).reshape(len(lista), self.n_variables - 1)
+            if not len(bloque):
+                break
+            revisadas += len(bloque)
+            bloque = np.hstack((bloque, np.full((len(bloque), 1), k)))
+            indices = np.vectorize(posicion.get, otypes=[int])(bloque)
+            nuevos, validos = resolver_bloque(A, b, indices)
+            if len(nuevos):
+                claves.append(bloque[validos])
+                puntos.append(nuevos)
+                violaciones.append(restricciones_violadas(A, b, sentidos, nuevos, self.tol).sum(axis=0))
+
+        if claves:
+            self._claves = np.vstack([self._claves] + claves)
+            self._puntos = np.vstack([self._puntos] + puntos)
+            self._violaciones = np.concatenate([self._violaciones] + violaciones).astype(np.int32)
+
+    def _retirar(self, k):
+        """
+        Quita los puntos cuyo subconjunto contiene k y descuenta las violaciones de k.
+        """
+        conservar = ~np.any(self._claves == k, axis=1)
+        self._claves = self._claves[conservar]
+        self._puntos = self._puntos[conservar]
+        self._violaciones = self._violaciones[conservar]
+        if len(self._puntos):
+            a, c, sentido = self._filas[k]
+            violada = restricciones_violadas(a[None, :], np.array([c]), np.array([sentido], dtype=np.int8),
+                                             self._puntos, self.tol)[0]
+            self._violaciones -= violada.astype(np.int32)
+
+    def añadir(self, restriccion, control=None):
+        """
+        Añade una restricción y devuelve su identificador en el almacén.
+        """
+        k = self._siguiente_id
+        self._siguiente_id += 1
+        self._filas[k] = self._fila(restriccion)
+        self._incorporar(k, control)
+        return k
+
+    def eliminar(self, k):
+        self._retirar(k)
+        del self._filas[k]
+
+    def reemplazar(self, k, restriccion, control=None):
+        """
+        Sustituye la restricción k conservando su identificador.
+        """
+        self._retirar(k)
+        self._filas[k] = self._fila(restriccion)
+        self._incorporar(k, control)
+
+    def vertices_por_clave(self):
+        """
+        Diccionario {subconjunto de identificadores: vértice} de los vértices factibles.
+        """
+        factibles = self._violaciones == 0
+        return {tuple(sorted(int(i) for i in clave)): tuple(float(v) for v in punto)
+                for clave, punto in zip(self._claves[factibles], self._puntos[factibles])}
+
+    def vertices(self, decimales=2):
+        """
+        Puntos factibles en el mismo formato que `enumerar_vertices`.
+        """
+        puntos = sin_duplicados([self._puntos[self._violaciones == 0]], decimales, self.n_variables)
+        return [tuple(float(coord) for coord in p) for p in puntos]
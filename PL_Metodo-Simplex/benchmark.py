@@ -0,0 +1,119 @@
+import numpy as np
+from functools import partial
+from time import perf_counter
+
+from escalado import resolver_escalado
+from exacto import certificar_base
+from optimizacion import METODOS, resolver_simplex
+
+def instancia_mal_escalada(m, n, semilla=0, rango_filas=(-3, 5), rango_columnas=(-3, 3)):
+    """
+    Problema de maximización con m restricciones '<=' y n variables cuyas
+    filas y columnas se multiplican por potencias de 10 aleatorias.
+    """
+    rng = np.random.default_rng(semilla)
+    A = rng.uniform(0.1, 1.0, (m, n))
+    filas = 10.0 ** rng.integers(*rango_filas, m)
+    columnas = 10.0 ** rng.integers(*rango_columnas, n)
+    A = A * filas[:, None] * columnas[None, :]
+    b = rng.uniform(1.0, 10.0, m) * filas
+    objetivo = {'type': 'max', 'coeff': list(rng.uniform(1.0, 10.0, n))}
+    restricciones = [{'a': list(A[i]), 'c': float(b[i]), 'inecuacion': '<='} for i in range(m)]
+    return objetivo, restricciones
+
+def medir(motor, objetivo, restricciones):
+    """
+    Resuelve una vez y devuelve (iteraciones, segundos, valor óptimo); las
+    iteraciones son los pivotes del historial y el valor es None si falla.
+    """
+    inicio = perf_counter()
+    try:
+        _, valor, historial = motor(objetivo, restricciones)
+    except (ValueError, np.linalg.LinAlgError):
+        return None, perf_counter() - inicio, None
+    return len(historial), perf_counter() - inicio, valor
+
+def comparar_escalado(tamanos=((20, 5), (60, 10), (150, 20)), repeticiones=3, metodos=('tabla', 'revisado')):
+    """
+    Imprime iteraciones y tiempo medios con y sin escalado en instancias mal escaladas.
+    """
+    print(f"{'método':10} {'m x n':>9} {'iter':>7} {'iter esc':>9} {'t (s)':>8} {'t esc (s)':>10}")
+    for metodo in metodos:
+        for m, n in tamanos:
+            crudo, escalado = [], []
+            for semilla in range(repeticiones):
+                objetivo, restricciones = instancia_mal_escalada(m, n, semilla)
+                crudo.append(medir(METODOS[metodo], objetivo, restricciones))
+                escalado.append(medir(partial(resolver_escalado, METODOS[metodo]), objetivo, restricciones))
+            iteraciones = np.mean([r[0] for r in crudo if r[0] is not None] or [np.nan])
+            iteraciones_esc = np.mean([r[0] for r in escalado if r[0] is not None] or [np.nan])
+            tiempo = np.mean([r[1] for r in crudo])
+            tiempo_esc = np.mean([r[1] for r in escalado])
+            fallos = sum(r[0] is None for r in crudo), sum(r[0] is None for r in escalado)
+            print(f"{metodo:10} {f'{m}x{n}':>9} {iteraciones:7.1f} {iteraciones_esc:9.1f} {tiempo:8.4f} {tiempo_esc:10.4f}"
+                  + (f"  fallos {fallos[0]}/{fallos[1]}" if any(fallos) else ""))
+
+def instancia_densa(m, n, semilla=0):
+    """
+    Problema denso acotado: max c x con A x <= b, A, b y c positivos.
+    """
+    rng = np.random.default_rng(semilla)
+    A = rng.uniform(0.0, 1.0, (m, n))
+    b = rng.uniform(1.0, 2.0, m) * n
+    objetivo = {'type': 'max', 'coeff': list(rng.uniform(1.0, 2.0, n))}
+    restricciones = [{'a': list(A[i]), 'c': float(b[i]), 'inecuacion': '<='} for i in range(m)]
+    return objetivo, restricciones
+
+def comparar_punto_interior(tamanos=((100, 50), (200, 100), (400, 200)), metodos=('tabla', 'revisado', 'punto_interior')):
+    """
+    Imprime el tiempo de cada motor en problemas densos grandes y la
+    mayor diferencia entre los valores óptimos obtenidos.
+    """
+    print(f"{'m x n':>9} " + " ".join(f"{metodo:>15}" for metodo in metodos) + f" {'dif. valor':>11}")
+    for m, n in tamanos:
+        objetivo, restricciones = instancia_densa(m, n)
+        resultados = [medir(partial(METODOS[metodo], decimales=None), objetivo, restricciones) for metodo in metodos]
+        valores = [r[2] for r in resultados if r[2] is not None]
+        diferencia = max(valores) - min(valores) if valores else np.nan
+        print(f"{f'{m}x{n}':>9} " + " ".join(f"{r[1]:14.3f}s" for r in resultados) + f" {diferencia:11.2e}")
+
+def instancia_degenerada(m, n, semilla=0):
+    """
+    Problema de aula degenerado: coeficientes enteros pequeños y con
+    decimales, muchos lados derechos iguales (varios vértices coinciden).
+    """
+    rng = np.random.default_rng(semilla)
+    A = rng.integers(1, 6, (m, n)) / rng.choice([1, 2, 4, 5, 10], (m, n))
+    b = rng.choice([10.0, 10.0, 20.0], m)
+    objetivo = {'type': 'max', 'coeff': list(rng.integers(1, 6, n) / 10)}
+    restricciones = [{'a': list(A[i]), 'c': float(b[i]), 'inecuacion': '<='} for i in range(m)]
+    return objetivo, restricciones
+
+def comparar_exacto(tamanos=((10, 5), (20, 10), (40, 20)), repeticiones=3):
+    """
+    Imprime el tiempo medio del simplex en coma flotante, del simplex exacto
+    y de la certificación exacta de la base flotante, y cuántas bases
+    flotantes quedaron certificadas como óptimas.
+    """
+    print(f"{'m x n':>9} {'flotante':>10} {'exacto':>10} {'certificar':>11} {'certificadas':>13}")
+    for m, n in tamanos:
+        flotante, exacto, certificacion, certificadas = [], [], [], 0
+        for semilla in range(repeticiones):
+            objetivo, restricciones = instancia_degenerada(m, n, semilla)
+            final = {}
+            inicio = perf_counter()
+            resolver_simplex(objetivo, restricciones, decimales=None, final=final)
+            flotante.append(perf_counter() - inicio)
+            exacto.append(medir(METODOS['exacto'], objetivo, restricciones)[1])
+            inicio = perf_counter()
+            certificadas += certificar_base(objetivo, restricciones, final['base'])['optima']
+            certificacion.append(perf_counter() - inicio)
+        print(f"{f'{m}x{n}':>9} {np.mean(flotante):9.4f}s {np.mean(exacto):9.4f}s {np.mean(certificacion):10.4f}s"
+              f" {certificadas:>9}/{repeticiones}")
+
+if __name__ == "__main__":
+    comparar_escalado()
+    print()
+    comparar_punto_interior()
+    print()
+    comparar_exacto()
@@ -0,0 +1,226 @@
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+
+from dispersa import densa
+from optimizacion import resolver_optimizacion
+from problema import como_problema
+
+# Opciones de resolver_optimizacion que no cambian el resultado
+OPCIONES_SIN_EFECTO = ('almacen', 'progreso', 'n_procesos', 'tamano_bloque', 'control')
+
+def forma_canonica(restricciones, n_variables, decimales=12):
+    """
+    Restricciones en forma canónica para comparar modelos: las '>=' pasan a
+    '<=' cambiando el signo, las '=' se orientan con el primer coeficiente no
+    nulo positivo, cada fila se divide por su mayor coeficiente en valor
+    absoluto y las filas se ordenan. Devuelve (A, b, sentidos) redondeados a
+    `decimales` para que el reescalado no dependa del último bit.
+    """
+    A, b, sentidos, _, _ = _canonica(restricciones, n_variables, decimales)
+    return A, b, sentidos
+
+def _canonica(restricciones, n_variables, decimales=12):
+    """
+    forma_canonica más la transformación de las filas: la fila canónica k es
+    factores[orden[k]] por la fila original orden[k].
+    """
+    problema = como_problema(restricciones, n_variables)
+    A, b = np.array(densa(problema.A)), problema.b.copy()
+    sentidos = problema.sentidos.astype(np.int8)
+
+    # Sentido: '>=' como -a x <= -b; '=' con el primer coeficiente no nulo positivo
+    signos = np.where(sentidos == -1, -1.0, 1.0)
+    igualdades = np.where(sentidos == 0)[0]
+    if len(igualdades):
+        filas = np.hstack((A[igualdades], b[igualdades, None]))
+        primero = filas[np.arange(len(filas)), np.argmax(filas != 0, axis=1)]
+        signos[igualdades] = np.where(primero < 0, -1.0, 1.0)
+    sentidos = np.where(sentidos == 0, 0, 1).astype(np.int8)
+
+    # Escala: mayor coeficiente (incluido b) igual a 1
+    escala = np.abs(np.hstack((A, b[:, None]))).max(axis=1, initial=0.0)
+    escala[escala == 0] = 1.0
+    factores = signos / escala
+    A = np.round(A * factores[:, None], decimales) + 0.0
+    b = np.round(b * factores, decimales) + 0.0
+
+    orden = np.lexsort(np.vstack((sentidos, b, A.T[::-1]))) if len(b) else np.arange(0)
+    return A[orden], b[orden], sentidos[orden], orden, factores
+
+def huella(objetivo, restricciones, **opciones):
+    """
+    Huella estable (SHA-256 en hexadecimal, igual entre ejecuciones) del
+    objetivo, la forma canónica de las restricciones y las opciones de
+    resolución que afectan al resultado.
+    """
+    return _huella_y_filas(objetivo, restricciones, **opciones)[0]
+
+def _huella_y_filas(objetivo, restricciones, **opciones):
+    n_variables = len(objetivo['coeff'])
+    A, b, sentidos, orden, factores = _canonica(restricciones, n_variables)
+    h = hashlib.sha256()
+    h.update(objetivo['type'].encode())
+    h.update(np.asarray(objetivo['coeff'], dtype=float).tobytes())
+    h.update(np.array(A.shape, dtype=np.int64).tobytes())
+    for array in (A, b, sentidos):
+        h.update(np.ascontiguousarray(array).tobytes())
+    relevantes = sorted((k, v) for k, v in opciones.items() if k not in OPCIONES_SIN_EFECTO)
+    h.update(repr(relevantes).encode())
+    return h.hexdigest(), orden, factores
+
+def _sensibilidad_a_filas(sensibilidad, orden, factores, canonica):
+    """
+    Pasa los datos por fila de la sensibilidad (precios sombra y rangos del
+    lado derecho) del orden y escala del modelo a los de la forma canónica
+    o, con `canonica` falso, al revés. Si b_k = f b_i, el precio sombra se
+    divide por f y el rango se multiplica por f (invertido si f < 0).
+    """
+    precios = np.asarray(sensibilidad['precios_sombra'], dtype=float)
+    rangos = np.asarray(sensibilidad['rango_lado_derecho'], dtype=float)
+    f = factores[orden]
+    nuevos_precios, nuevos_rangos = np.empty_like(precios), np.empty_like(rangos)
+    if canonica:
+        nuevos_precios[:] = precios[orden] / f
+        nuevos_rangos[:] = rangos[orden] * f[:, None]
+    else:
+        nuevos_precios[orden] = precios * f
+        nuevos_rangos[orden] = rangos / f[:, None]
+    invertidos = nuevos_rangos[:, 0] > nuevos_rangos[:, 1]
+    nuevos_rangos[invertidos] = nuevos_rangos[invertidos, ::-1]
+    return dict(sensibilidad, precios_sombra=nuevos_precios + 0.0, rango_lado_derecho=nuevos_rangos + 0.0)
+
+class CacheResultados:
+    """
+    Memoización de resolver_optimizacion por huella del problema. Las
+    entradas se guardan serializadas (pickle) en una LRU en memoria acotada
+    por número de entradas y por bytes y, con `ruta`, en una base sqlite
+    que sobrevive a los reinicios (con `max_entradas_disco` se conservan
+    solo las usadas más recientemente). Cada entrada incluye el resultado, el
+    mensaje, los vértices y el historial de tablas, así que la gráfica se
+    redibuja sin volver a resolver. El historial es el del primer modelo
+    resuelto: para un modelo con las filas reordenadas los pivotes se
+    refieren al orden de aquel.
+    """
+    def __init__(self, max_entradas=128, max_bytes=64 * 2 ** 20, ruta=None, max_entradas_disco=None):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.max_entradas_disco = max_entradas_disco
+        self.memoria = OrderedDict()
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.conexion = None
+        self._cerrojo = threading.Lock()
+        if ruta is not None:
+            # La interfaz resuelve en un hilo de trabajo: la conexión se comparte con un cerrojo
+            self.conexion = sqlite3.connect(ruta, check_same_thread=False)
+            self.conexion.execute("CREATE TABLE IF NOT EXISTS resultados "
+                                  "(clave TEXT PRIMARY KEY, valor BLOB, usado REAL)")
+            self.conexion.commit()
+
+    def __len__(self):
+        return len(self.memoria)
+
+    def __contains__(self, clave):
+        with self._cerrojo:
+            if clave in self.memoria:
+                return True
+            return self.conexion is not None and self.conexion.execute(
+                "SELECT 1 FROM resultados WHERE clave = ?", (clave,)).fetchone() is not None
+
+    def _guardar_en_memoria(self, clave, datos):
+        if clave in self.memoria:
+            self.bytes -= len(self.memoria.pop(clave))
+        if len(datos) > self.max_bytes:
+            return
+        self.memoria[clave] = datos
+        self.bytes += len(datos)
+        while len(self.memoria) > self.max_entradas or self.bytes > self.max_bytes:
+            _, antiguo = self.memoria.popitem(last=False)
+            self.bytes -= len(antiguo)
+
+    def obtener(self, clave):
+        """
+        Devuelve una copia del valor guardado o None; un acierto en disco
+        se sube a la memoria.
+        """
+        with self._cerrojo:
+            datos = self._leer(clave)
+        if datos is None:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return pickle.loads(datos)
+
+    def _leer(self, clave):
+        datos = self.memoria.get(clave)
+        if datos is not None:
+            self.memoria.move_to_end(clave)
+        elif self.conexion is not None:
+            fila = self.conexion.execute("SELECT valor FROM resultados WHERE clave = ?", (clave,)).fetchone()
+            if fila is not None:
+                datos = fila[0]
+                self.conexion.execute("UPDATE resultados SET usado = ? WHERE clave = ?", (time.time(), clave))
+                self.conexion.commit()
+                self._guardar_en_memoria(clave, datos)
+        return datos
+
+    def guardar(self, clave, valor):
+        datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._cerrojo:
+            self._guardar_en_memoria(clave, datos)
+            if self.conexion is not None:
+                self.conexion.execute("INSERT OR REPLACE INTO resultados VALUES (?, ?, ?)",
+                                      (clave, sqlite3.Binary(datos), time.time()))
+                if self.max_entradas_disco is not None:
+                    self.conexion.execute("DELETE FROM resultados WHERE clave NOT IN "
+                                          "(SELECT clave FROM resultados ORDER BY usado DESC LIMIT ?)",
+                                          (self.max_entradas_disco,))
+                self.conexion.commit()
+
+    def limpiar(self, disco=False):
+        """
+        Vacía la memoria y, con `disco`, también la base sqlite.
+        """
+        with self._cerrojo:
+            self.memoria.clear()
+            self.bytes = 0
+            if disco and self.conexion is not None:
+                self.conexion.execute("DELETE FROM resultados")
+                self.conexion.commit()
+
+    def cerrar(self):
+        with self._cerrojo:
+            if self.conexion is not None:
+                self.conexion.close()
+                self.conexion = None
+
+def resolver_con_cache(cache, objetivo, restricciones, **opciones):
+    """
+    resolver_optimizacion con memoización: si el problema (con filas en
+    cualquier orden, escala o sentido equivalente) ya se resolvió con las
+    mismas opciones, devuelve el resultado guardado. La sensibilidad se
+    guarda en el orden y la escala de la forma canónica y se devuelve en los
+    de las filas recibidas; su 'base', como el historial de tablas, es la
+    del primer modelo resuelto. Los errores y las resoluciones detenidas por
+    un control no se guardan.
+    """
+    clave, orden, factores = _huella_y_filas(objetivo, restricciones, **opciones)
+    salida = cache.obtener(clave)
+    if salida is not None:
+        resultado = salida[0]
+        if 'sensibilidad' in resultado:
+            resultado['sensibilidad'] = _sensibilidad_a_filas(resultado['sensibilidad'], orden, factores, False)
+        return salida
+    salida = resolver_optimizacion(objetivo, restricciones, **opciones)
+    resultado = salida[0]
+    if resultado is not None and resultado.get('estado', 'optimo') == 'optimo':
+        if 'sensibilidad' in resultado:
+            resultado = dict(resultado, sensibilidad=_sensibilidad_a_filas(resultado['sensibilidad'], orden, factores, True))
+        cache.guardar(clave, (resultado,) + tuple(salida[1:]))
+    return salida
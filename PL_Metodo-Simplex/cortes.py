@@ -0,0 +1,88 @@
+import numpy as np
+from functools import partial
+
+from dispersa import normas_filas
+from evaluacion import holguras
+from forma_estandar import forma_estandar, tabla_desde_forma
+from historial import HistorialSimplex
+from problema import como_problema
+from simplex_dual import base_inicial, problema_en_filas, simplex_dual_filas
+
+def _tabla_inicial(objetivo, restricciones):
+    return tabla_desde_forma(forma_estandar(objetivo, restricciones))
+
+def planos_de_corte(objetivo, restricciones, filas_por_ronda=None, max_rondas=1000, tol=1e-9):
+    """
+    Generación diferida de restricciones: resuelve con el simplex dual de
+    filas sobre un conjunto de trabajo que empieza con x >= 0 y la caja, y
+    en cada ronda evalúa todas las restricciones a la vez en la solución
+    actual (evaluacion.holguras), añade las `filas_por_ronda` más violadas
+    (por distancia al hiperplano) y reoptimiza desde la base anterior, que
+    sigue siendo dual factible. Termina cuando no hay violaciones.
+    Devuelve x, la base, las filas de G en el conjunto de trabajo y la
+    información de la resolución ('rondas', 'filas_trabajo', 'iteraciones').
+    """
+    n_variables = len(objetivo['coeff'])
+    problema = como_problema(restricciones, n_variables)
+    pf = problema_en_filas(objetivo, problema)
+    G, h, c, origen = pf['G'], pf['h'].copy(), pf['c'], pf['origen']
+    if filas_por_ronda is None:
+        filas_por_ronda = max(10, n_variables)
+    normas = np.maximum(normas_filas(problema.A), tol)
+    tolerancias = tol * (1.0 + np.abs(problema.b))
+
+    # Filas de G de cada restricción original ('=' aporta dos)
+    orden = np.argsort(origen[origen >= 0], kind='stable')
+    inicio = np.searchsorted(origen[origen >= 0][orden], np.arange(len(problema) + 1))
+    en_trabajo = np.zeros(len(problema), dtype=bool)
+    trabajo = list(np.where(origen < 0)[0])
+    base = [trabajo.index(fila) for fila in base_inicial(pf)]
+    caja = origen == -2
+    iteraciones, ampliado = 0, False
+
+    for ronda in range(1, max_rondas + 1):
+        x, base, y, pasos = simplex_dual_filas(G[trabajo], h[trabajo], c, base, tol=tol)
+        iteraciones += pasos
+
+        # Barrido vectorizado de todas las restricciones en x
+        distancia = -holguras(problema.A, problema.b, problema.sentidos, x)[:, 0]
+        violadas = np.where((distancia > tolerancias) & ~en_trabajo)[0]
+        if len(violadas):
+            peores = violadas[np.argsort(-distancia[violadas] / normas[violadas])[:filas_por_ronda]]
+            en_trabajo[peores] = True
+            for i in peores:
+                trabajo.extend(orden[inicio[i]:inicio[i + 1]])
+            continue
+
+        # Caja activa con multiplicador positivo: se agranda una vez, como en optimizar_filas
+        if not np.any(caja[np.asarray(trabajo)[base]] & (y > tol * (1.0 + np.abs(c).max()))):
+            info = {'rondas': ronda, 'filas_trabajo': len(trabajo), 'iteraciones': iteraciones}
+            return x, base, trabajo, info
+        if ampliado:
+            raise ValueError("El problema no está acotado.")
+        h[caja] *= 1e3
+        ampliado = True
+    raise ValueError("Se alcanzó el máximo de rondas de planos de corte.")
+
+def resolver_cortes(objetivo, restricciones, decimales=2, filas_por_ronda=None, info=None):
+    """
+    Resuelve el problema por planos de corte (ver planos_de_corte); conviene
+    con pocas variables y muchísimas restricciones, de las que solo unas
+    pocas son activas en el óptimo. La tabla inicial del historial solo se
+    construye si se consulta. Si se pasa el diccionario `info`, se guardan
+    en él las rondas, el tamaño del conjunto de trabajo y las iteraciones.
+    Con `decimales=None` la solución no se redondea.
+    """
+    x, _, _, resumen = planos_de_corte(objetivo, restricciones, filas_por_ronda)
+    if info is not None:
+        info.update(resumen)
+
+    historial = HistorialSimplex(constructor=partial(_tabla_inicial, objetivo, restricciones))
+
+    valor_optimo = np.dot(objetivo['coeff'], x)
+    if decimales is None:
+        return [float(v) for v in x], float(valor_optimo), historial
+    solucion = [float(round(v, decimales)) + 0.0 for v in x]  # Redondear (2 decimales por defecto)
+    valor_optimo = float(round(valor_optimo, decimales))  # Redondear (2 decimales por defecto)
+
+    return solucion, valor_optimo, historial
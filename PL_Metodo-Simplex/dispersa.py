@@ -0,0 +1,180 @@
+import numpy as np
+
+from problema import Problema
+
+class MatrizDispersa:
+    """
+    Matriz dispersa en formato CSR (datos, índices de columna y punteros de
+    fila). La traspuesta, que es la forma CSC de la matriz, se calcula una
+    sola vez cuando se piden columnas o productos A^T y.
+    """
+    def __init__(self, datos, indices, punteros, forma):
+        self.datos = np.asarray(datos, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.punteros = np.asarray(punteros, dtype=np.int64)
+        self.shape = tuple(forma)
+        self._filas = np.repeat(np.arange(self.shape[0]), np.diff(self.punteros))
+        self._traspuesta = None
+
+    @classmethod
+    def desde_coordenadas(cls, filas, columnas, valores, forma):
+        """
+        Construye la matriz a partir de tripletas (fila, columna, valor);
+        las entradas repetidas se suman y los ceros se descartan.
+        """
+        filas = np.asarray(filas, dtype=np.int64)
+        columnas = np.asarray(columnas, dtype=np.int64)
+        valores = np.asarray(valores, dtype=float)
+        clave = filas * forma[1] + columnas
+        unicas, inverso = np.unique(clave, return_inverse=True)
+        sumas = np.bincount(inverso, weights=valores, minlength=len(unicas))
+        no_nulos = sumas != 0
+        unicas, sumas = unicas[no_nulos], sumas[no_nulos]
+        filas, columnas = unicas // forma[1], unicas % forma[1]
+        punteros = np.concatenate(([0], np.cumsum(np.bincount(filas, minlength=forma[0]))))
+        return cls(sumas, columnas, punteros, forma)
+
+    @classmethod
+    def desde_densa(cls, M):
+        M = np.atleast_2d(np.asarray(M, dtype=float))
+        filas, columnas = np.nonzero(M)
+        return cls.desde_coordenadas(filas, columnas, M[filas, columnas], M.shape)
+
+    @classmethod
+    def desde_restricciones(cls, restricciones, n_variables):
+        """
+        Matriz de coeficientes de las restricciones; cada 'a' puede ser una
+        lista densa o un diccionario {índice: coeficiente}.
+        """
+        if isinstance(restricciones, Problema):
+            return restricciones.A if restricciones.dispersa else cls.desde_densa(restricciones.A)
+        filas, columnas, valores = [], [], []
+        for i, r in enumerate(restricciones):
+            a = r['a']
+            if isinstance(a, dict):
+                indices, coeficientes = list(a.keys()), list(a.values())
+            else:
+                a = np.asarray(a, dtype=float)
+                indices = np.nonzero(a)[0]
+                coeficientes = a[indices]
+            filas.extend([i] * len(indices))
+            columnas.extend(indices)
+            valores.extend(coeficientes)
+        return cls.desde_coordenadas(filas, columnas, valores, (len(restricciones), n_variables))
+
+    @property
+    def nnz(self):
+        return len(self.datos)
+
+    @property
+    def densidad(self):
+        return self.nnz / max(self.shape[0] * self.shape[1], 1)
+
+    @property
+    def T(self):
+        if self._traspuesta is None:
+            orden = np.lexsort((self._filas, self.indices))
+            punteros = np.concatenate(([0], np.cumsum(np.bincount(self.indices, minlength=self.shape[1]))))
+            self._traspuesta = MatrizDispersa(self.datos[orden], self._filas[orden], punteros,
+                                              (self.shape[1], self.shape[0]))
+            self._traspuesta._traspuesta = self
+        return self._traspuesta
+
+    def bloque_filas(self, inicio, fin):
+        """
+        Filas inicio..fin-1 como MatrizDispersa, sin copiar el resto.
+        """
+        p0, p1 = self.punteros[inicio], self.punteros[fin]
+        return MatrizDispersa(self.datos[p0:p1], self.indices[p0:p1], self.punteros[inicio:fin + 1] - p0,
+                              (fin - inicio, self.shape[1]))
+
+    def densa(self):
+        M = np.zeros(self.shape)
+        M[self._filas, self.indices] = self.datos
+        return M
+
+    def escalar_filas(self, factores):
+        """
+        Nueva matriz diag(factores) A.
+        """
+        return MatrizDispersa(self.datos * np.asarray(factores)[self._filas], self.indices, self.punteros, self.shape)
+
+    def __matmul__(self, X):
+        X = np.asarray(X, dtype=float)
+        vector = X.ndim == 1
+        productos = self.datos[:, None] * X.reshape(X.shape[0], -1)[self.indices]
+        resultado = np.zeros((self.shape[0], productos.shape[1]))
+        no_vacias = np.diff(self.punteros) > 0
+        if self.nnz:
+            resultado[no_vacias] = np.add.reduceat(productos, self.punteros[:-1][no_vacias], axis=0)
+        return resultado[:, 0] if vector else resultado
+
+    def _filas_densas(self, seleccion):
+        """
+        Filas seleccionadas (array de índices de cualquier forma) como array denso.
+        """
+        seleccion = np.asarray(seleccion, dtype=np.int64)
+        planas = seleccion.ravel()
+        longitudes = np.diff(self.punteros)[planas]
+        inicios = self.punteros[planas]
+        desplazamiento = np.cumsum(longitudes) - longitudes
+        posiciones = np.arange(longitudes.sum()) - np.repeat(desplazamiento, longitudes) + np.repeat(inicios, longitudes)
+        salida = np.zeros((len(planas), self.shape[1]))
+        salida[np.repeat(np.arange(len(planas)), longitudes), self.indices[posiciones]] = self.datos[posiciones]
+        return salida.reshape(seleccion.shape + (self.shape[1],))
+
+    def __getitem__(self, clave):
+        """
+        Admite A[i], A[array de filas] y A[:, j]; el resultado es denso.
+        """
+        if isinstance(clave, tuple):
+            filas, columna = clave
+            if isinstance(filas, slice) and filas == slice(None) and np.isscalar(columna):
+                return self.T._filas_densas(columna)
+            raise IndexError("Índice no admitido en MatrizDispersa.")
+        return self._filas_densas(clave)
+
+def densa(A):
+    """
+    Devuelve A como array denso, sea MatrizDispersa o array.
+    """
+    return A.densa() if isinstance(A, MatrizDispersa) else A
+
+def apilar(superior, inferior):
+    """
+    Une por filas dos matrices densas o MatrizDispersa; el resultado es
+    disperso si alguna de las dos lo es.
+    """
+    if not isinstance(superior, MatrizDispersa) and not isinstance(inferior, MatrizDispersa):
+        return np.vstack((superior, inferior))
+    superior, inferior = [M if isinstance(M, MatrizDispersa) else MatrizDispersa.desde_densa(M)
+                          for M in (superior, inferior)]
+    return MatrizDispersa(np.concatenate((superior.datos, inferior.datos)),
+                          np.concatenate((superior.indices, inferior.indices)),
+                          np.concatenate((superior.punteros, inferior.punteros[1:] + superior.nnz)),
+                          (superior.shape[0] + inferior.shape[0], superior.shape[1]))
+
+def normas_filas(A):
+    """
+    Norma euclídea de cada fila de A, sea MatrizDispersa o array.
+    """
+    if isinstance(A, MatrizDispersa):
+        return np.sqrt(np.bincount(A._filas, weights=A.datos ** 2, minlength=A.shape[0]))
+    return np.linalg.norm(A, axis=1)
+
+def conviene_dispersa(restricciones, n_variables, densidad_maxima=0.05, tamano_minimo=10000):
+    """
+    Decide si usar almacenamiento disperso: si alguna fila viene como
+    diccionario o si la matriz es grande y tiene pocos no nulos.
+    """
+    if isinstance(restricciones, Problema):
+        if restricciones.dispersa:
+            return True
+        A = restricciones.A
+        return A.size >= tamano_minimo and np.count_nonzero(A) <= densidad_maxima * A.size
+    if any(isinstance(r['a'], dict) for r in restricciones):
+        return True
+    if len(restricciones) * n_variables < tamano_minimo:
+        return False
+    no_nulos = sum(np.count_nonzero(r['a']) for r in restricciones)
+    return no_nulos <= densidad_maxima * len(restricciones) * n_variables
@@ -0,0 +1,229 @@
+import heapq
+import os
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import count
+
+from control import Detenido
+from simplex_dual import base_inicial, optimizar_filas, problema_en_filas
+
+def problema_entero(objetivo, restricciones, enteras=None):
+    """
+    Problema en filas (ver simplex_dual.problema_en_filas) con una fila
+    x_j <= u_j más por cada variable entera para las ramas superiores; las
+    ramas inferiores cambian el lado derecho de la fila -x_j <= 0.
+    `enteras` son los índices de las variables enteras (None: todas).
+    """
+    pf = problema_en_filas(objetivo, restricciones)
+    n = pf['n_variables']
+    enteras = np.arange(n) if enteras is None else np.asarray(enteras, dtype=int).reshape(-1)
+    m = len(pf['h'])
+    pf['base'] = base_inicial(pf)
+    pf['G'] = np.vstack((pf['G'], np.eye(n)[enteras]))
+    pf['h'] = np.concatenate((pf['h'], np.full(len(enteras), np.inf)))
+    pf['origen'] = np.concatenate((pf['origen'], np.full(len(enteras), -3)))
+    pf['enteras'] = enteras
+    pf['filas_inferiores'] = m - 2 * n + enteras
+    pf['filas_superiores'] = m + np.arange(len(enteras))
+    return pf
+
+def _evaluar(pf, l, u, base, tol):
+    """
+    Relajación lineal del nodo con cotas l <= x_E <= u, partiendo de la base
+    de filas del padre: cambiar cotas solo cambia h, así que la base sigue
+    siendo dual factible y el simplex dual la reoptimiza en pocos pasos.
+    Devuelve el nodo (cota, x, l, u, base) o None si es infactible.
+    """
+    h = pf['h'].copy()
+    h[pf['filas_inferiores']] = -l
+    h[pf['filas_superiores']] = u
+    try:
+        x, base, _, _ = optimizar_filas(dict(pf, h=h), base, tol=tol)
+    except ValueError as error:
+        if 'acotado' in str(error):
+            raise
+        return None
+    return float(pf['c'] @ x), x, l, u, base
+
+def _fraccionaria(x, enteras, tol):
+    """
+    Posición en `enteras` de la variable más fraccionaria, o None si todas son enteras.
+    """
+    distancia = np.abs(x[enteras] - np.round(x[enteras]))
+    k = int(np.argmax(distancia)) if len(distancia) else 0
+    return k if len(distancia) and distancia[k] > tol else None
+
+def _umbral(mejor_z, tol):
+    """
+    Cota que debe superar un nodo para poder mejorar al incumbente.
+    """
+    return mejor_z + tol * (1.0 + abs(mejor_z)) if np.isfinite(mejor_z) else -np.inf
+
+def ramificar(pf, nodos, mejor_z=-np.inf, mejor_x=None, max_nodos=None, max_abiertos=None, tol=1e-6,
+              avisar=None, cada=100):
+    """
+    Ramificación y acotación sobre una lista de nodos evaluados. Combina
+    búsqueda en profundidad (se baja por el mejor hijo hasta podar, lo que
+    encuentra pronto soluciones enteras) con mejor cota (al podar se sigue
+    por el nodo abierto de mayor cota). Se detiene al agotar el árbol, al
+    procesar `max_nodos` o al tener más de `max_abiertos` nodos abiertos.
+    `avisar(mejor_z, procesados, cota, mejor_x)` se llama al mejorar el
+    incumbente y cada `cada` nodos.
+    Devuelve el mejor x, su valor, los nodos procesados y los nodos abiertos.
+    """
+    enteras = pf['enteras']
+    orden = count()
+    abiertos = [(-nodo[0], next(orden), nodo) for nodo in nodos]
+    heapq.heapify(abiertos)
+    actual, procesados = None, 0
+    while actual is not None or abiertos:
+        if actual is None:
+            actual = heapq.heappop(abiertos)[2]
+        z, x, l, u, base = actual
+        actual = None
+        if z <= _umbral(mejor_z, tol):
+            continue
+        k = _fraccionaria(x, enteras, tol)
+        if k is None:
+            mejor_x = x.copy()
+            mejor_x[enteras] = np.round(x[enteras])
+            mejor_z = float(pf['c'] @ mejor_x)
+            if avisar is not None:
+                avisar(mejor_z, procesados, max(-abiertos[0][0] if abiertos else mejor_z, mejor_z), mejor_x)
+            continue
+        if (max_nodos is not None and procesados >= max_nodos) or \
+                (max_abiertos is not None and len(abiertos) >= max_abiertos):
+            heapq.heappush(abiertos, (-z, next(orden), (z, x, l, u, base)))
+            break
+        procesados += 1
+        if avisar is not None and procesados % cada == 0:
+            avisar(mejor_z, procesados, max(z, -abiertos[0][0] if abiertos else z), mejor_x)
+
+        # Ramas x_j <= floor(v) y x_j >= ceil(v)
+        v = x[enteras[k]]
+        u_abajo, l_arriba = u.copy(), l.copy()
+        u_abajo[k], l_arriba[k] = np.floor(v), np.ceil(v)
+        hijos = [_evaluar(pf, l, u_abajo, base, tol), _evaluar(pf, l_arriba, u, base, tol)]
+        hijos = sorted((h for h in hijos if h is not None and h[0] > _umbral(mejor_z, tol)),
+                       key=lambda h: -h[0])
+        if hijos:
+            actual = hijos[0]
+            for hijo in hijos[1:]:
+                heapq.heappush(abiertos, (-hijo[0], next(orden), hijo))
+    return mejor_x, mejor_z, procesados, [nodo for _, _, nodo in abiertos]
+
+def _explorar(pf, nodo, mejor_z, max_nodos, tol):
+    """
+    Trabajo de cada proceso: explora el subárbol de `nodo` con el valor del
+    incumbente como corte y devuelve lo que queda abierto al alcanzar max_nodos.
+    """
+    return ramificar(pf, [nodo], mejor_z, None, max_nodos=max_nodos, tol=tol)
+
+def resolver_entero(objetivo, restricciones, enteras=None, n_procesos=1, nodos_por_tarea=200, max_nodos=100000,
+                    progreso=None, tol=1e-6, decimales=2):
+    """
+    Resuelve el problema entero o mixto (solo las variables de `enteras`
+    deben ser enteras) por ramificación y acotación sobre el simplex dual de
+    filas, con arranque en caliente desde la base del nodo padre.
+    Con `n_procesos` distinto de 1 los subárboles se reparten entre procesos:
+    cada tarea explora hasta `nodos_por_tarea` nodos con el incumbente
+    vigente como corte y devuelve sus nodos abiertos a la cola común.
+    `progreso(info)` recibe durante la búsqueda un diccionario con
+    'incumbente', 'cota', 'brecha' y 'nodos' (valores en el sentido del objetivo).
+    Devuelve la solución, el valor óptimo y la información final, cuyo
+    'estado' es 'optimo' o 'limite' (se agotó `max_nodos`). Si `progreso`
+    detiene la búsqueda con control.Detenido, la excepción lleva el
+    incumbente en `mejor`.
+    """
+    pf = problema_entero(objetivo, restricciones, enteras)
+    signo = 1.0 if objetivo['type'] == 'max' else -1.0
+    n_enteras = len(pf['enteras'])
+    raiz = _evaluar(pf, np.zeros(n_enteras), np.full(n_enteras, np.inf), pf['base'], tol)
+    if raiz is None:
+        raise ValueError("El problema no tiene solución factible.")
+
+    estado = {'mejor_x': None, 'mejor_z': -np.inf, 'nodos': 0}
+    trabajadores = n_procesos or os.cpu_count() or 1
+
+    def avisar(incumbente, nodos, cota, x=None):
+        if x is not None and incumbente > estado['mejor_z']:
+            estado['mejor_x'], estado['mejor_z'] = x, incumbente
+        if progreso is None:
+            return
+        brecha = (cota - incumbente) / max(1.0, abs(incumbente)) if np.isfinite(incumbente) else np.inf
+        try:
+            progreso({'incumbente': signo * incumbente if np.isfinite(incumbente) else None,
+                      'cota': signo * cota, 'brecha': max(brecha, 0.0), 'nodos': nodos})
+        except Detenido as e:
+            if estado['mejor_x'] is not None:
+                e.mejor = _redondear(objetivo, estado['mejor_x'], decimales)
+            raise
+
+    def informar(abiertos, en_curso=()):
+        cotas = [n[0] for n in abiertos] + list(en_curso) + [estado['mejor_z']]
+        avisar(estado['mejor_z'], estado['nodos'], max(cotas))
+
+    def actualizar(x, z, procesados):
+        estado['nodos'] += procesados
+        if x is not None and z > estado['mejor_z']:
+            estado['mejor_x'], estado['mejor_z'] = x, z
+
+    abiertos = [raiz]
+    if trabajadores == 1:
+        x, z, procesados, abiertos = ramificar(pf, abiertos, max_nodos=max_nodos, tol=tol, avisar=avisar)
+        actualizar(x, z, procesados)
+    else:
+        # Arranque secuencial hasta tener trabajo para todos los procesos
+        x, z, procesados, abiertos = ramificar(pf, abiertos, max_nodos=max_nodos,
+                                               max_abiertos=2 * trabajadores, tol=tol)
+        actualizar(x, z, procesados)
+        informar(abiertos)
+        with ProcessPoolExecutor(max_workers=trabajadores) as ejecutor:
+            en_curso = {}
+            while (abiertos or en_curso) and estado['nodos'] < max_nodos:
+                abiertos.sort(key=lambda n: n[0])
+                while abiertos and len(en_curso) < 2 * trabajadores:
+                    nodo = abiertos.pop()
+                    if nodo[0] <= _umbral(estado['mejor_z'], tol):
+                        continue
+                    futuro = ejecutor.submit(_explorar, pf, nodo, estado['mejor_z'], nodos_por_tarea, tol)
+                    en_curso[futuro] = nodo[0]
+                if not en_curso:
+                    break
+                terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    del en_curso[futuro]
+                    x, z, procesados, restantes = futuro.result()
+                    actualizar(x, z, procesados)
+                    abiertos.extend(restantes)
+                informar(abiertos, en_curso.values())
+            for futuro in en_curso:
+                x, z, procesados, restantes = futuro.result()
+                actualizar(x, z, procesados)
+                abiertos.extend(restantes)
+
+    # Descartar los nodos abiertos que ya no pueden mejorar al incumbente
+    mejor_z = estado['mejor_z']
+    abiertos = [n for n in abiertos if n[0] > _umbral(mejor_z, tol)]
+    informar(abiertos)
+    if estado['mejor_x'] is None:
+        if abiertos:
+            raise ValueError("Se alcanzó el máximo de nodos sin encontrar una solución entera.")
+        raise ValueError("El problema no tiene solución entera factible.")
+
+    cota = max([n[0] for n in abiertos] + [mejor_z])
+    info = {
+        'estado': 'limite' if abiertos else 'optimo',
+        'nodos': estado['nodos'],
+        'cota': signo * cota,
+        'brecha': (cota - mejor_z) / max(1.0, abs(mejor_z)),
+    }
+    return _redondear(objetivo, estado['mejor_x'], decimales) + (info,)
+
+def _redondear(objetivo, solucion, decimales):
+    valor_optimo = np.dot(objetivo['coeff'], solucion)
+    if decimales is None:
+        return [float(v) for v in solucion], float(valor_optimo)
+    solucion = [float(round(v, decimales)) + 0.0 for v in solucion]  # Redondear (2 decimales por defecto)
+    valor_optimo = float(round(valor_optimo, decimales))  # Redondear (2 decimales por defecto)
+    return solucion, valor_optimo
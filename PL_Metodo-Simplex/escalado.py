@@ -0,0 +1,81 @@
+import numpy as np
+
+from problema import Problema
+from vertices import matrices_restricciones
+
+def _potencia_de_dos(factores):
+    """
+    Redondea los factores a potencias de 2 para que escalar no introduzca errores de redondeo.
+    """
+    return np.exp2(np.round(np.log2(factores)))
+
+def factores_escala(A, max_iteraciones=20, tol=0.05):
+    """
+    Factores de fila r y de columna s tales que diag(r) A diag(s) tenga
+    coeficientes cercanos a 1: primero iteraciones de media geométrica
+    (1 / sqrt(max |a| * min |a|) por filas y luego por columnas) hasta que
+    el cociente max/min deja de mejorar, y después equilibrado por el
+    máximo de cada fila y de cada columna.
+    """
+    m, n = A.shape
+    r, s = np.ones(m), np.ones(n)
+    no_nulos = np.abs(A) > 0
+    if not no_nulos.any():
+        return r, s
+
+    def extremos(M, eje):
+        maximo = np.where(no_nulos, M, 0.0).max(axis=eje)
+        minimo = np.where(no_nulos, M, np.inf).min(axis=eje)
+        vacios = ~no_nulos.any(axis=eje)
+        maximo[vacios], minimo[vacios] = 1.0, 1.0
+        return maximo, minimo
+
+    def dispersion(M):
+        valores = M[no_nulos]
+        return valores.max() / valores.min()
+
+    anterior = dispersion(np.abs(A))
+    for _ in range(max_iteraciones):
+        M = np.abs(A) * r[:, None] * s[None, :]
+        maximo, minimo = extremos(M, 1)
+        r /= np.sqrt(maximo * minimo)
+        M = np.abs(A) * r[:, None] * s[None, :]
+        maximo, minimo = extremos(M, 0)
+        s /= np.sqrt(maximo * minimo)
+        actual = dispersion(np.abs(A) * r[:, None] * s[None, :])
+        if actual > (1.0 - tol) * anterior:
+            break
+        anterior = actual
+
+    # Equilibrado: máximo 1 en cada fila y después en cada columna
+    maximo, _ = extremos(np.abs(A) * r[:, None] * s[None, :], 1)
+    r /= maximo
+    maximo, _ = extremos(np.abs(A) * r[:, None] * s[None, :], 0)
+    s /= maximo
+    return _potencia_de_dos(r), _potencia_de_dos(s)
+
+def escalar_problema(objetivo, restricciones, max_iteraciones=20):
+    """
+    Devuelve el problema escalado (objetivo y Problema) y los factores de
+    columna: el problema escalado en x' equivale al original con x = s * x'.
+    """
+    n_variables = len(objetivo['coeff'])
+    A, b, sentidos = matrices_restricciones(restricciones, n_variables)
+    r, s = factores_escala(A, max_iteraciones)
+    objetivo_escalado = {'type': objetivo['type'], 'coeff': list(np.array(objetivo['coeff'], dtype=float) * s)}
+    return objetivo_escalado, Problema(A * r[:, None] * s[None, :], b * r, sentidos), s
+
+def resolver_escalado(motor, objetivo, restricciones, decimales=2):
+    """
+    Ejecuta un motor simplex sobre el problema escalado y deshace el escalado
+    de la solución antes de redondearla.
+    """
+    objetivo_escalado, restricciones_escaladas, s = escalar_problema(objetivo, restricciones)
+    solucion, _, historial = motor(objetivo_escalado, restricciones_escaladas, decimales=None)
+    solucion = np.array(solucion) * s
+    valor_optimo = np.dot(objetivo['coeff'], solucion)
+    if decimales is None:
+        return [float(v) for v in solucion], float(valor_optimo), historial
+    solucion = [float(round(v, decimales)) + 0.0 for v in solucion]  # Redondear (2 decimales por defecto)
+    valor_optimo = float(round(valor_optimo, decimales))  # Redondear (2 decimales por defecto)
+    return solucion, valor_optimo, historial
@@ -0,0 +1,56 @@
+import numpy as np
+
+from problema import como_problema
+
+def holguras(A, b, sentidos, puntos):
+    """
+    Holgura de cada restricción en cada punto, matriz (m, k) con un solo
+    producto A @ P.T (A puede ser una MatrizDispersa): b - a·x para '<=',
+    a·x - b para '>=' y -|a·x - b| para '='. Es negativa donde se viola.
+    """
+    puntos = np.atleast_2d(np.asarray(puntos, dtype=float))
+    diferencia = b[:, None] - A @ puntos.T
+    return np.where(sentidos[:, None] == 0, -np.abs(diferencia), sentidos[:, None] * diferencia)
+
+def restricciones_violadas(A, b, sentidos, puntos, tol=1e-9):
+    """
+    Matriz (m, k) que indica qué restricciones viola cada punto del bloque,
+    con tolerancia relativa tol * (1 + |b|).
+    """
+    return holguras(A, b, sentidos, puntos) < -tol * (1 + np.abs(b))[:, None]
+
+def mascara_factibles(A, b, sentidos, puntos, tol=1e-9):
+    """
+    Evalúa todas las restricciones sobre un bloque de puntos con un solo producto.
+    """
+    return ~restricciones_violadas(A, b, sentidos, puntos, tol).any(axis=0)
+
+def violacion_maxima(A, b, sentidos, puntos):
+    """
+    Mayor violación de cada punto (k,), 0 si el punto es factible.
+    """
+    h = holguras(A, b, sentidos, puntos)
+    return np.maximum(-h.min(axis=0), 0.0) if len(h) else np.zeros(h.shape[1])
+
+def evaluar(restricciones, puntos, tol=1e-9):
+    """
+    Evalúa un bloque de puntos (k, n) sobre un Problema (o la lista de
+    diccionarios). Devuelve 'factibles' (k,), 'violadas' (m, k), 'holguras'
+    (m, k) y 'violacion' (k,), la mayor violación de cada punto.
+    """
+    puntos = np.atleast_2d(np.asarray(puntos, dtype=float))
+    problema = como_problema(restricciones, puntos.shape[1])
+    h = holguras(problema.A, problema.b, problema.sentidos, puntos)
+    violadas = h < -tol * (1 + np.abs(problema.b))[:, None]
+    return {
+        'factibles': ~violadas.any(axis=0),
+        'violadas': violadas,
+        'holguras': h,
+        'violacion': np.maximum(-h.min(axis=0), 0.0) if len(h) else np.zeros(len(puntos)),
+    }
+
+def es_factible(punto, restricciones, tol=1e-9):
+    """
+    Verifica si un punto satisface todas las restricciones.
+    """
+    return bool(evaluar(restricciones, punto, tol)['factibles'][0])
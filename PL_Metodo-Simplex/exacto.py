@@ -0,0 +1,279 @@
+import numpy as np
+from fractions import Fraction
+from functools import partial
+from math import lcm
+
+from forma_estandar import forma_estandar, tabla_desde_forma
+from dispersa import densa
+from historial import HistorialSimplex
+from problema import como_problema
+
+def fraccion(valor):
+    """
+    Valor exacto de un dato: los float se leen por su representación
+    decimal más corta (0.1 es 1/10, no el binario más cercano).
+    """
+    if isinstance(valor, (int, Fraction, str)):
+        return Fraction(valor)
+    return Fraction(repr(float(valor)))
+
+def _escala(valores):
+    """
+    Mínimo común múltiplo de los denominadores de una fila de fracciones.
+    """
+    return lcm(*(v.denominator for v in valores)) if len(valores) else 1
+
+def _fila_entera(valores):
+    """
+    Multiplica una fila de fracciones por _escala y la devuelve como enteros de Python.
+    """
+    escala = _escala(valores)
+    return [int(v * escala) for v in valores]
+
+def _datos_exactos(objetivo, restricciones):
+    """
+    Coeficientes exactos (A, b, c) tomados de la lista de diccionarios o de un Problema.
+    """
+    n_variables = len(objetivo['coeff'])
+    if isinstance(restricciones, list):
+        filas = [list(r['a']) + [0] * (n_variables - len(r['a'])) for r in restricciones]
+        b = [r['c'] for r in restricciones]
+    else:
+        problema = como_problema(restricciones, n_variables)
+        filas, b = densa(problema.A).tolist(), problema.b.tolist()
+    A = [[fraccion(v) for v in fila] for fila in filas]
+    return A, [fraccion(v) for v in b], [fraccion(v) for v in objetivo['coeff']]
+
+def pivotar_entero(T, d, fila_pivote, col_pivote):
+    """
+    Pivote sin fracciones (Edmonds/Bareiss) sobre una tabla de enteros cuyas
+    entradas son det(B) * (B^-1 [A | b]) y `d` = det(B): la división entre el
+    pivote anterior es exacta, así que los números crecen como determinantes
+    y no como productos de denominadores. Si el pivote es negativo se cambia
+    el signo de toda la tabla para mantener d > 0. Devuelve el nuevo d.
+    """
+    p = T[fila_pivote, col_pivote]
+    fila = T[fila_pivote].copy()
+    T[:] = (p * T - np.outer(T[:, col_pivote], fila)) // d
+    T[fila_pivote] = fila
+    if p < 0:
+        T[:] = -T
+        p = -p
+    return p
+
+def tabla_entera(objetivo, restricciones):
+    """
+    Tabla inicial de enteros con la misma disposición que
+    forma_estandar.tabla_desde_forma (filas, fase I si hace falta y fase II).
+    Cada fila se lleva a enteros con su propio factor; la variable básica de
+    la fila (holgura o artificial) se reescala para que la base inicial siga
+    siendo la identidad. Devuelve la tabla (dtype object) y la forma estándar.
+    """
+    fe = forma_estandar(objetivo, restricciones)
+    A, b, c = _datos_exactos(objetivo, restricciones)
+    n = fe['n_variables']
+    m, k = len(b), len(fe['filas_extra'])
+    filas = []
+    for i in range(m):
+        signo = int(fe['signos_fila'][i])
+        extra = [0] * k
+        for j in np.where(fe['filas_extra'] == i)[0]:
+            extra[j] = int(fe['signos_extra'][j])
+        fila = [signo * v for v in A[i]] + [signo * b[i]]
+        escala = _escala(fila)
+        enteros = [int(v * escala) for v in fila]
+        # Las columnas extra de la fila se multiplican por el mismo factor salvo la básica
+        extra = [e * escala for e in extra]
+        extra[fe['base'][i] - n] = 1
+        filas.append(enteros[:-1] + extra + enteros[-1:])
+
+    objetivos = []
+    if len(fe['artificiales']):
+        fase_uno = [0] * (n + k + 1)
+        for j in fe['artificiales']:
+            fase_uno[j] = 1
+        for i in fe['filas_extra'][fe['artificiales'] - n]:
+            fase_uno = [u - v for u, v in zip(fase_uno, filas[i])]
+        objetivos.append(fase_uno)
+    signo_c = -1 if objetivo['type'] == 'max' else 1
+    objetivos.append(_fila_entera([signo_c * v for v in c]) + [0] * (k + 1))
+
+    T = np.empty((len(filas) + len(objetivos), n + k + 1), dtype=object)
+    T[:] = filas + objetivos
+    return T, fe
+
+def _iterar(T, d, base, fila_objetivo, excluidas, historial, max_iteraciones=100000):
+    """
+    Simplex exacto: entra la columna de costo más negativo (Dantzig) y, tras
+    un pivote degenerado, la de menor índice (Bland), que impide ciclar; el
+    cociente se compara en enteros y los empates salen por menor índice básico.
+    """
+    m = len(base)
+    permitidas = np.ones(T.shape[1] - 1, dtype=bool)
+    permitidas[excluidas] = False
+    bland = False
+    for _ in range(max_iteraciones):
+        costos = T[fila_objetivo, :-1]
+        candidatas = [j for j in np.where(permitidas)[0] if costos[j] < 0]
+        if not candidatas:
+            return d
+        col = candidatas[0] if bland else min(candidatas, key=lambda j: costos[j])
+
+        fila = None
+        for i in range(m):
+            if T[i, col] <= 0:
+                continue
+            # T[i,-1] / T[i,col] < T[fila,-1] / T[fila,col] sin dividir
+            if fila is None:
+                fila = i
+                continue
+            izquierda, derecha = T[i, -1] * T[fila, col], T[fila, -1] * T[i, col]
+            if izquierda < derecha or (izquierda == derecha and base[i] < base[fila]):
+                fila = i
+        if fila is None:
+            raise ValueError("El problema no está acotado.")
+        bland = T[fila, -1] == 0
+        d = pivotar_entero(T, d, fila, col)
+        base[fila] = col
+        historial.registrar(fila, col)
+    raise ValueError("Se alcanzó el máximo de iteraciones del simplex exacto.")
+
+def _a_base(T, d, base, objetivo_base, historial):
+    """
+    Pivota la tabla hasta que la base contenga las columnas de `objetivo_base`.
+    Devuelve d o None si esas columnas no forman una base (matriz singular).
+    """
+    deseadas = set(int(j) for j in objetivo_base)
+    for j in deseadas - set(base):
+        filas = [i for i in range(len(base)) if base[i] not in deseadas and T[i, j] != 0]
+        if not filas:
+            return None
+        d = pivotar_entero(T, d, filas[0], j)
+        base[filas[0]] = j
+        historial.registrar(filas[0], j)
+    return d
+
+def _resultado(T, d, base, fe, c):
+    n = fe['n_variables']
+    solucion = [Fraction(0)] * n
+    for i, col in enumerate(base):
+        if col < n:
+            solucion[col] = Fraction(T[i, -1], d)
+    return solucion, sum((ci * xi for ci, xi in zip(c, solucion)), Fraction(0))
+
+def simplex_exacto(objetivo, restricciones, base=None):
+    """
+    Simplex de dos fases en aritmética entera exacta con pivotes sin
+    fracciones. Con `base` (la base óptima de un motor en coma flotante, en
+    la numeración de forma_estandar) se pivota directamente a ella y, si es
+    factible, la fase II parte de ahí: en el caso habitual solo se rehace
+    exactamente la base final.
+    Devuelve la solución y el valor óptimo como Fraction, la base y el historial.
+    """
+    T, fe = tabla_entera(objetivo, restricciones)
+    historial = HistorialSimplex(constructor=partial(tabla_desde_forma, fe))
+    _, _, c = _datos_exactos(objetivo, restricciones)
+    m = len(fe['b'])
+    artificiales = fe['artificiales']
+    actual, d = list(fe['base']), 1
+
+    if base is not None:
+        d_base = _a_base(T, d, actual, base, historial)
+        factible = d_base is not None and all(T[i, -1] >= 0 for i in range(m)) and \
+            all(T[i, -1] == 0 for i in range(m) if actual[i] in set(artificiales))
+        if factible:
+            d = _iterar(T, d_base, actual, -1, artificiales, historial)
+            return _resultado(T, d, actual, fe, c) + (actual, historial)
+        T, _ = tabla_entera(objetivo, restricciones)
+        historial = HistorialSimplex(constructor=partial(tabla_desde_forma, fe))
+        actual, d = list(fe['base']), 1
+
+    if len(artificiales):
+        # Fase I: minimizar la suma de las artificiales
+        d = _iterar(T, d, actual, m, [], historial)
+        if T[m, -1] != 0:
+            raise ValueError("El problema no tiene solución factible.")
+
+        # Sacar de la base las artificiales que quedaron con valor cero
+        es_artificial = np.zeros(T.shape[1] - 1, dtype=bool)
+        es_artificial[artificiales] = True
+        for fila, col in enumerate(actual):
+            if not es_artificial[col]:
+                continue
+            candidatas = [j for j in np.where(~es_artificial)[0] if T[fila, j] != 0]
+            if candidatas:
+                d = pivotar_entero(T, d, fila, candidatas[0])
+                actual[fila] = int(candidatas[0])
+                historial.registrar(fila, candidatas[0])
+
+    # Fase II con las artificiales fuera de la base
+    d = _iterar(T, d, actual, -1, artificiales, historial)
+    return _resultado(T, d, actual, fe, c) + (actual, historial)
+
+def certificar_base(objetivo, restricciones, base):
+    """
+    Comprueba en aritmética exacta si `base` (numeración de forma_estandar)
+    es óptima: se pivota solo hasta esa base y se verifican x_B >= 0 (con
+    las artificiales en cero) y costos reducidos no negativos. Devuelve un
+    diccionario con 'valida' (columnas independientes), 'factible',
+    'optima', y la 'solucion' y el 'valor' exactos de la base.
+    """
+    T, fe = tabla_entera(objetivo, restricciones)
+    _, _, c = _datos_exactos(objetivo, restricciones)
+    m = len(fe['b'])
+    actual = list(fe['base'])
+    d = _a_base(T, 1, actual, base, HistorialSimplex(constructor=partial(tabla_desde_forma, fe)))
+    if d is None:
+        return {'valida': False, 'factible': False, 'optima': False, 'solucion': None, 'valor': None}
+    artificiales = set(int(j) for j in fe['artificiales'])
+    factible = all(T[i, -1] >= 0 for i in range(m)) and \
+        all(T[i, -1] == 0 for i in range(m) if actual[i] in artificiales)
+    optima = factible and all(T[-1, j] >= 0 for j in range(T.shape[1] - 1) if j not in artificiales)
+    solucion, valor = _resultado(T, d, actual, fe, c)
+    return {'valida': True, 'factible': factible, 'optima': optima, 'solucion': solucion, 'valor': valor}
+
+def resolver_certificado(objetivo, restricciones, motor=None):
+    """
+    Resuelve en coma flotante y certifica exactamente la base final; si no
+    es óptima, el simplex exacto continúa desde ella. Devuelve la solución y
+    el valor exactos y el certificado de la base flotante.
+    """
+    if motor is None:
+        from optimizacion import resolver_simplex as motor
+    final = {}
+    motor(objetivo, restricciones, decimales=None, final=final)
+    certificado = certificar_base(objetivo, restricciones, final['base'])
+    if certificado['optima']:
+        return certificado['solucion'], certificado['valor'], certificado
+    solucion, valor, _, _ = simplex_exacto(objetivo, restricciones, base=final['base'])
+    return solucion, valor, certificado
+
+def resolver_simplex_exacto(objetivo, restricciones, decimales=2):
+    """
+    Resuelve el problema con el simplex exacto (ver simplex_exacto) y
+    devuelve la solución óptima, el valor óptimo y el historial de pivotes
+    como los demás motores. Con `decimales=None` la solución no se redondea.
+    """
+    solucion, valor_optimo, _, historial = simplex_exacto(objetivo, restricciones)
+    if decimales is None:
+        return [float(v) for v in solucion], float(valor_optimo), historial
+    solucion = [float(round(v, decimales)) + 0.0 for v in solucion]  # Redondear (2 decimales por defecto)
+    valor_optimo = float(round(valor_optimo, decimales))  # Redondear (2 decimales por defecto)
+    return solucion, valor_optimo, historial
+
+def resolver_sistema_exacto(A, b):
+    """
+    Resuelve A x = b (cuadrado) con eliminación de Gauss-Jordan sin
+    fracciones. Devuelve la solución como Fraction o None si A es singular.
+    """
+    n = len(b)
+    T = np.empty((n, n + 1), dtype=object)
+    T[:] = [_fila_entera([fraccion(v) for v in fila] + [fraccion(bi)]) for fila, bi in zip(A, b)]
+    d, fila_de = 1, []
+    for k in range(n):
+        filas = [i for i in range(n) if i not in fila_de and T[i, k] != 0]
+        if not filas:
+            return None
+        d = pivotar_entero(T, d, filas[0], k)
+        fila_de.append(filas[0])
+    return [Fraction(T[i, -1], d) for i in fila_de]
@@ -0,0 +1,94 @@
+import numpy as np
+
+from dispersa import densa
+from vertices import matrices_restricciones
+
+def forma_estandar(objetivo, restricciones, dispersa=False):
+    """
+    Lleva el problema a la forma estándar min c^T x, [A | E] x = b, x >= 0, b >= 0.
+    E está formada por columnas unitarias (fila, signo): holguras para '<=',
+    excesos para '>=' y artificiales para '>=' y '='. Las filas con lado
+    derecho negativo se multiplican por -1 invirtiendo su desigualdad
+    ('signos_fila' guarda el signo aplicado a cada fila). Con `dispersa`, A es
+    una MatrizDispersa y la memoria depende de los no nulos, no de m x (n+m).
+    """
+    n_variables = len(objetivo['coeff'])
+    coeff = np.array(objetivo['coeff'], dtype=float)
+    A, b, sentidos = matrices_restricciones(restricciones, n_variables, dispersa)
+
+    # Las filas con b < 0 cambian de signo y de sentido ('=' tiene código 0)
+    signos_fila = np.where(b < 0, -1.0, 1.0)
+    A = A.escalar_filas(signos_fila) if dispersa else A * signos_fila[:, None]
+    b = b * signos_fila
+    sentidos = sentidos * signos_fila.astype(np.int8)
+
+    filas_extra, signos_extra = [], []
+    base = [None] * len(b)
+
+    # Holguras y excesos
+    for i, sentido in enumerate(sentidos):
+        if sentido == 1:
+            base[i] = n_variables + len(filas_extra)
+            filas_extra.append(i)
+            signos_extra.append(1.0)
+        elif sentido == -1:
+            filas_extra.append(i)
+            signos_extra.append(-1.0)
+
+    # Artificiales para las filas sin holgura que sirva de base
+    artificiales = []
+    for i, sentido in enumerate(sentidos):
+        if sentido != 1:
+            base[i] = n_variables + len(filas_extra)
+            artificiales.append(base[i])
+            filas_extra.append(i)
+            signos_extra.append(1.0)
+
+    # Costos de fase II (minimización)
+    c = np.zeros(n_variables + len(filas_extra))
+    c[:n_variables] = -coeff if objetivo['type'] == 'max' else coeff
+
+    return {
+        'A': A,
+        'b': b,
+        'c': c,
+        'filas_extra': np.array(filas_extra, dtype=int),
+        'signos_extra': np.array(signos_extra, dtype=float),
+        'artificiales': np.array(artificiales, dtype=int),
+        'base': base,
+        'n_variables': n_variables,
+        'signos_fila': signos_fila,
+        'tipo': objetivo['type'],
+    }
+
+def costos_fase_uno(fe):
+    """
+    Costos de fase I: minimizar la suma de las variables artificiales.
+    """
+    c = np.zeros(len(fe['c']))
+    c[fe['artificiales']] = 1.0
+    return c
+
+def tabla_desde_forma(fe):
+    """
+    Construye la tabla simplex densa de la forma estándar.
+    Las filas son: restricciones, fila de fase I (solo si hay artificiales)
+    y, en último lugar, la fila objetivo de fase II.
+    """
+    A, b = densa(fe['A']), fe['b']
+    m = A.shape[0]
+    k = len(fe['filas_extra'])
+    E = np.zeros((m, k))
+    E[fe['filas_extra'], np.arange(k)] = fe['signos_extra']
+    filas = np.hstack((A, E, b.reshape(-1, 1)))
+
+    objetivos = []
+    if len(fe['artificiales']):
+        # Fila de fase I en forma canónica respecto a la base artificial
+        filas_artificiales = fe['filas_extra'][fe['artificiales'] - fe['n_variables']]
+        fila_fase_uno = np.concatenate((costos_fase_uno(fe), [0.0]))
+        fila_fase_uno -= filas[filas_artificiales].sum(axis=0)
+        objetivos.append(fila_fase_uno)
+    objetivos.append(np.concatenate((fe['c'], [0.0])))
+
+    return np.vstack([filas] + objetivos)
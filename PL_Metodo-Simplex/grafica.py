@@ -2,20 +2,21 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from mpl_toolkits.mplot3d import Axes3D  # Para gráficos 3D
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+from dispersa import densa
+from evaluacion import restricciones_violadas
+from problema import INECUACIONES, Problema, como_problema
+from vertices import caras_poliedro
 
-def es_factible(punto, restricciones):
+def dibujar_grafico(restricciones, puntos_factibles, punto_optimo, container):
     """
-    Verifica si un punto satisface todas las restricciones.
+    Dibuja la región en 2D o 3D; `restricciones` puede ser un Problema o la
+    lista de diccionarios.
     """
-    for r in restricciones:
-        lhs = sum(r['a'][i] * punto[i] for i in range(len(punto)))
-        if r['inecuacion'] == '<=' and lhs > r['c'] + 1e-9:
-            return False
-        elif r['inecuacion'] == '>=' and lhs < r['c'] - 1e-9:
-            return False
-    return True
-
-def dibujar_grafico(restricciones, puntos_factibles, punto_optimo, container):
+    restricciones = como_problema(restricciones)
+    if restricciones.dispersa:
+        # Con 2 o 3 variables la matriz densa es pequeña
+        restricciones = Problema(densa(restricciones.A), restricciones.b, restricciones.sentidos)
     n_variables = len(puntos_factibles[0]) if puntos_factibles else 0
     
     if n_variables == 2:
@@ -32,10 +33,11 @@ def _dibujar_grafico_2d(restricciones, puntos_factibles, punto_optimo, container
     x_max = max([p[0] for p in puntos_factibles]) + 2 if puntos_factibles else 10
     y_max = max([p[1] for p in puntos_factibles]) + 2 if puntos_factibles else 10
     
-    # Graficar restricciones
-    for r in restricciones:
-        a, b, c = r['a'][0], r['a'][1], r['c']
-        ineq = r['inecuacion']
+    # Graficar restricciones (el origen decide qué lado sombrear)
+    origen_factible = ~restricciones_violadas(restricciones.A, restricciones.b, restricciones.sentidos,
+                                              np.zeros((1, 2)))[:, 0]
+    for (a, b), c, sentido, en_origen in zip(restricciones.A, restricciones.b, restricciones.sentidos, origen_factible):
+        ineq = INECUACIONES[int(sentido)]
         x_vals = np.linspace(0, x_max, 400)
         
         if a == 0:
@@ -58,7 +60,7 @@ def _dibujar_grafico_2d(restricciones, puntos_factibles, punto_optimo, container
             # Caso general (línea inclinada)
             y_vals = (c - a * x_vals) / b
             ax.plot(x_vals, y_vals, label=f'{a}x + {b}y {ineq} {c}')
-            if es_factible((0, 0), [r]):
+            if en_origen:
                 ax.fill_between(x_vals, y_vals, -10, alpha=0.1)
             else:
                 ax.fill_between(x_vals, y_vals, 10, alpha=0.1)
@@ -101,9 +103,8 @@ def _dibujar_grafico_3d(restricciones, puntos_factibles, punto_optimo, container
     z_max = max([p[2] for p in puntos_factibles]) + 2 if puntos_factibles else 10
     
     # Graficar restricciones (planos)
-    for r in restricciones:
-        a, b, c, d = r['a'][0], r['a'][1], r['a'][2], r['c']
-        ineq = r['inecuacion']
+    for (a, b, c), d, sentido in zip(restricciones.A, restricciones.b, restricciones.sentidos):
+        ineq = INECUACIONES[int(sentido)]
         
         # Crear malla para el plano
         x_vals, y_vals = np.meshgrid(np.linspace(0, x_max, 10), np.linspace(0, y_max, 10))
@@ -111,6 +112,11 @@ def _dibujar_grafico_3d(restricciones, puntos_factibles, punto_optimo, container
         
         ax.plot_surface(x_vals, y_vals, z_vals, alpha=0.3, label=f'{a}x + {b}y + {c}z {ineq} {d}')
     
+    # Graficar región factible (caras del poliedro por doble descripción)
+    caras = caras_poliedro(restricciones)
+    if caras:
+        ax.add_collection3d(Poly3DCollection(caras, color='gray', alpha=0.3))
+    
     # Graficar puntos factibles
     if puntos_factibles:
         ax.scatter(*zip(*puntos_factibles), color='red', zorder=5)
@@ -130,4 +136,26 @@ def _dibujar_grafico_3d(restricciones, puntos_factibles, punto_optimo, container
         widget.destroy()
     canvas = FigureCanvasTkAgg(fig, master=container)
     canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True)
\ No newline at end of file
+    canvas.get_tk_widget().pack(fill='both', expand=True)
+
+def dibujar_curva_parametrica(barrido, container, etiqueta='Parámetro'):
+    """
+    Dibuja el valor óptimo frente al parámetro (ver parametrico) como la
+    poligonal que une los puntos de quiebre exactos.
+    """
+    fig, ax = plt.subplots(figsize=(5, 3), dpi=100)
+    ax.plot(barrido['parametros'], barrido['valores'], marker='o', label='Valor óptimo')
+    if barrido['estado'] != 'completo':
+        ax.axvline(x=barrido['parametros'][-1], color='red', linestyle='--', label=barrido['estado'].replace('_', ' '))
+    ax.set_xlabel(etiqueta)
+    ax.set_ylabel('Z')
+    ax.set_title('Análisis paramétrico')
+    ax.legend()
+    ax.grid(True)
+    
+    # Limpiar el contenedor y mostrar la gráfica
+    for widget in container.winfo_children():
+        widget.destroy()
+    canvas = FigureCanvasTkAgg(fig, master=container)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill='both', expand=True)
@@ -0,0 +1,96 @@
+from collections import OrderedDict
+
+import numpy as np
+
+def pivotear_tabla(tabla, fila_pivote, col_pivote):
+    """
+    Aplica en el sitio la operación de pivote sobre (fila_pivote, col_pivote).
+    """
+    tabla[fila_pivote] /= tabla[fila_pivote, col_pivote]
+    columna = tabla[:, col_pivote].copy()
+    columna[fila_pivote] = 0.0
+    tabla -= np.outer(columna, tabla[fila_pivote])
+
+class HistorialSimplex:
+    """
+    Historial compacto de las tablas simplex: la tabla inicial y el registro
+    de pivotes (fila, columna). Las tablas intermedias se reconstruyen bajo
+    demanda; opcionalmente se guardan puntos de control cada `intervalo`
+    pivotes en una caché acotada a `max_checkpoints` tablas.
+    """
+    def __init__(self, tabla_inicial=None, constructor=None, intervalo=0, max_checkpoints=0):
+        if tabla_inicial is None and constructor is None:
+            raise ValueError("Se necesita la tabla inicial o una función que la construya")
+        self._tabla_inicial = tabla_inicial
+        self._constructor = constructor
+        self.pivotes = []
+        self.intervalo = intervalo
+        self.max_checkpoints = max_checkpoints
+        self._checkpoints = OrderedDict()
+
+    @property
+    def tabla_inicial(self):
+        if self._tabla_inicial is None:
+            self._tabla_inicial = self._constructor()
+        return self._tabla_inicial
+
+    def registrar(self, fila_pivote, col_pivote):
+        self.pivotes.append((int(fila_pivote), int(col_pivote)))
+
+    def __len__(self):
+        return len(self.pivotes) + 1
+
+    def _guardar_checkpoint(self, indice, tabla):
+        if not self.intervalo or not self.max_checkpoints or indice % self.intervalo:
+            return
+        self._checkpoints[indice] = tabla.copy()
+        self._checkpoints.move_to_end(indice)
+        while len(self._checkpoints) > self.max_checkpoints:
+            self._checkpoints.popitem(last=False)
+
+    def tabla(self, indice):
+        """
+        Reconstruye la tabla tras `indice` pivotes (0 es la tabla inicial).
+        """
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice de tabla fuera de rango")
+
+        inicio = max((k for k in self._checkpoints if k <= indice), default=0)
+        if inicio:
+            self._checkpoints.move_to_end(inicio)
+            tabla = self._checkpoints[inicio].copy()
+        else:
+            tabla = self.tabla_inicial.copy()
+
+        for k in range(inicio, indice):
+            pivotear_tabla(tabla, *self.pivotes[k])
+            self._guardar_checkpoint(k + 1, tabla)
+        return tabla
+
+    def __getitem__(self, indice):
+        return self.tabla(indice)
+
+    def __iter__(self):
+        """
+        Recorre las tablas en orden manteniendo solo una copia de trabajo.
+        """
+        tabla = self.tabla_inicial.copy()
+        yield tabla.copy()
+        for fila_pivote, col_pivote in self.pivotes:
+            pivotear_tabla(tabla, fila_pivote, col_pivote)
+            yield tabla.copy()
+
+    def paginas(self, tamano=5):
+        """
+        Devuelve las tablas en páginas de (índice, tabla) de `tamano` elementos.
+        """
+        pagina = []
+        for indice, tabla in enumerate(self):
+            pagina.append((indice, tabla))
+            if len(pagina) == tamano:
+                yield pagina
+                pagina = []
+        if pagina:
+            yield pagina
@@ -1,10 +1,18 @@
 import customtkinter as ctk
 import tkinter as tk
+import copy
 import json
 import os
+import queue
+import threading
 import google.generativeai as genai
-from optimizacion import resolver_optimizacion
-from grafica import dibujar_grafico
+from almacen_vertices import AlmacenVertices
+from cache import CacheResultados, resolver_con_cache
+from control import ControlResolucion, Detenido
+from grafica import dibujar_curva_parametrica, dibujar_grafico
+from parametrico import barrido_costo, barrido_lado_derecho
+from problema import Problema
+from sensibilidad import formatear_sensibilidad
 import re
 import ast
 import operator as op
@@ -60,7 +68,7 @@ class FilaDeRestricciones(ctk.CTkFrame):
         
         # Selector de desigualdad antes del input c
         self.var_ineq = ctk.StringVar(value="<=")
-        self.dropdown = ctk.CTkOptionMenu(self, values=["<="], variable=self.var_ineq, width=70)
+        self.dropdown = ctk.CTkOptionMenu(self, values=["<=", ">=", "="], variable=self.var_ineq, width=70)
         self.dropdown.grid(row=0, column=n_variables, padx=5, pady=5)
         
         # Input c después del selector de desigualdad
@@ -125,6 +133,18 @@ class App(ctk.CTk):
 
         # Inicializar el número de variables
         self.n_variables = 0  # Valor predeterminado
+        
+        # Vértices incrementales: identificador en el almacén de cada fila resuelta
+        self.almacen = None
+        self.ids_almacen = []
+        self.restricciones_almacen = []
+        
+        # Resultados ya resueltos (también entre sesiones) por huella del problema
+        self.cache = CacheResultados(ruta=os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache_resultados.sqlite"))
+        
+        # Resolución en curso en el hilo de trabajo: su control y la cola de avisos hacia la interfaz
+        self.control = None
+        self.cola = queue.Queue()
         self.cambiar_modo()
 
     def construir_modo_manual(self):
@@ -171,9 +191,46 @@ class App(ctk.CTk):
         self.button_remove = ctk.CTkButton(self.frame_botones, text="- Eliminar Última Restricción", command=self.remover_fila_restriccion)
         self.button_remove.pack(side="left", padx=5, pady=5, fill="x", expand=True)
         
+        self.var_entero = ctk.BooleanVar(value=False)
+        self.check_entero = ctk.CTkCheckBox(self.frame_left, text="Variables enteras", variable=self.var_entero)
+        self.check_entero.pack(pady=5)
+        
         self.button_solve = ctk.CTkButton(self.frame_left, text="Resolver Optimización", command=self.resolver)
         self.button_solve.pack(pady=10, fill="x")
         
+        # Presupuesto de la resolución (vacío = sin límite) y cancelación
+        self.frame_control = ctk.CTkFrame(self.frame_left)
+        self.frame_control.pack(pady=5, fill="x")
+        
+        self.entry_max_segundos = ctk.CTkEntry(self.frame_control, width=90, placeholder_text="Tiempo máx. (s)")
+        self.entry_max_segundos.pack(side="left", padx=2)
+        self.entry_max_iteraciones = ctk.CTkEntry(self.frame_control, width=110, placeholder_text="Iteraciones máx.")
+        self.entry_max_iteraciones.pack(side="left", padx=2)
+        
+        self.button_cancel = ctk.CTkButton(self.frame_control, text="Cancelar", width=70,
+                                           command=self.cancelar, state="disabled")
+        self.button_cancel.pack(side="left", padx=2, fill="x", expand=True)
+        
+        # Barrido paramétrico: lado derecho de una restricción o costo de una variable (índices desde 1)
+        self.frame_parametrico = ctk.CTkFrame(self.frame_left)
+        self.frame_parametrico.pack(pady=5, fill="x")
+        
+        self.var_parametro = ctk.StringVar(value="Lado derecho")
+        self.dropdown_parametro = ctk.CTkOptionMenu(self.frame_parametrico, values=["Lado derecho", "Costo"],
+                                                    variable=self.var_parametro, width=110)
+        self.dropdown_parametro.pack(side="left", padx=2)
+        
+        self.entry_parametro = ctk.CTkEntry(self.frame_parametrico, width=40, placeholder_text="nº")
+        self.entry_parametro.pack(side="left", padx=2)
+        self.entry_desde = ctk.CTkEntry(self.frame_parametrico, width=60, placeholder_text="desde")
+        self.entry_desde.pack(side="left", padx=2)
+        self.entry_hasta = ctk.CTkEntry(self.frame_parametrico, width=60, placeholder_text="hasta")
+        self.entry_hasta.pack(side="left", padx=2)
+        
+        self.button_parametrico = ctk.CTkButton(self.frame_parametrico, text="Barrido", width=70,
+                                                command=self.barrido_parametrico)
+        self.button_parametrico.pack(side="left", padx=2, fill="x", expand=True)
+        
         self.text_output = ctk.CTkTextbox(self.frame_left, height=40)
         self.text_output.pack(pady=5, fill="both", expand=True)
 
@@ -318,7 +375,7 @@ class App(ctk.CTk):
         for r in datos['restricciones']:
             if 'a' not in r or 'c' not in r or 'inecuacion' not in r:
                 return False
-            if r['inecuacion'] not in ('<=', '>='):
+            if r['inecuacion'] not in ('<=', '>=', '='):
                 return False
                 
         return True
@@ -370,14 +427,60 @@ class App(ctk.CTk):
             filas = self.filas_restricciones.pop()
             filas.destroy()
         
-    def resolver(self):
-        self.text_output.delete("1.0", tk.END)
+    def sincronizar_almacen(self, anterior, restricciones, n_variables, control=None):
+        """
+        Devuelve (almacén, identificadores, restricciones) con el almacén de
+        vértices `anterior` actualizado solo en las filas que cambiaron desde
+        la última resolución. Corre en el hilo de trabajo: los cambios se
+        hacen sobre una copia, así que si el `control` lo detiene el almacén
+        de la interfaz queda como estaba.
+        """
+        almacen, ids, restricciones_almacen = anterior
+        if almacen is None or almacen.n_variables != n_variables:
+            almacen, ids, restricciones_almacen = AlmacenVertices(n_variables), [], []
+        elif restricciones == restricciones_almacen:
+            return anterior
+        else:
+            almacen, ids = copy.deepcopy(almacen), list(ids)
+        
+        for i, restriccion in enumerate(restricciones[:len(ids)]):
+            if restriccion != restricciones_almacen[i]:
+                almacen.reemplazar(ids[i], restriccion, control)
+        for restriccion in restricciones[len(ids):]:
+            ids.append(almacen.añadir(restriccion, control))
+        while len(ids) > len(restricciones):
+            almacen.eliminar(ids.pop())
+        return almacen, ids, list(restricciones)
+        
+    def mostrar_progreso(self, info):
+        """
+        Muestra el avance de la resolución: pivotes y objetivo del simplex,
+        combinaciones revisadas o incumbente y cota de la ramificación.
+        """
+        linea = f"{info['segundos']:.1f} s"
+        if 'nodos' in info:
+            incumbente = "-" if info['incumbente'] is None else f"{info['incumbente']:.2f}"
+            linea += f"  Nodos: {info['nodos']}  Incumbente: {incumbente}  Cota: {info['cota']:.2f}"
+        elif 'combinaciones' in info:
+            linea += f"  Combinaciones: {info['combinaciones']}/{info['total']}"
+        elif 'restricciones' in info:
+            linea += f"  Restricciones: {info['restricciones']}/{info['total']}"
+        else:
+            linea += f"  Fase {info['fase']}  Pivotes: {info['iteraciones']}"
+            if info['objetivo'] is not None:
+                linea += f"  Z: {info['objetivo']:.2f}"
+        self.text_output.insert(tk.END, linea + "\n")
+        self.text_output.see(tk.END)
         
+    def leer_problema(self):
+        """
+        Lee el objetivo y las restricciones de las entradas; None si hay errores.
+        """
         try:
             coeff_obj = [float(entry.get()) for entry in self.entries_obj]
         except ValueError:
             self.text_output.insert(tk.END, "Error en los coeficientes de la función objetivo.\n")
-            return
+            return None
         objetivo = {'coeff': coeff_obj, 'type': self.var_obj_type.get()}
         
         restricciones = []
@@ -385,14 +488,130 @@ class App(ctk.CTk):
             restriccion = fila.obtener_restriccion()
             if restriccion is None:
                 self.text_output.insert(tk.END, "Error en los datos de alguna restricción.\n")
-                return
+                return None
             restricciones.append(restriccion)
+        return objetivo, restricciones
+        
+    def leer_presupuesto(self):
+        """
+        Lee el tiempo y las iteraciones máximas; un campo vacío es sin límite.
+        """
+        texto_segundos = self.entry_max_segundos.get().strip()
+        texto_iteraciones = self.entry_max_iteraciones.get().strip()
+        max_segundos = float(texto_segundos) if texto_segundos else None
+        max_iteraciones = int(texto_iteraciones) if texto_iteraciones else None
+        return max_segundos, max_iteraciones
+        
+    def resolver(self):
+        self.text_output.delete("1.0", tk.END)
+        datos = self.leer_problema()
+        if datos is None:
+            return
+        objetivo, restricciones = datos
+        try:
+            max_segundos, max_iteraciones = self.leer_presupuesto()
+        except ValueError:
+            self.text_output.insert(tk.END, "Error en el tiempo o las iteraciones máximas.\n")
+            return
         
-        # Resolver el problema usando el método simplex
-        resultado, mensaje, puntos_factibles, tablas_simplex = resolver_optimizacion(objetivo, restricciones)
+        # Resolver el problema usando el método simplex; los arrays se construyen una sola vez
+        anterior = (self.almacen, self.ids_almacen, self.restricciones_almacen)
+        n_variables = self.n_variables
+        problema = Problema.desde_restricciones(restricciones, n_variables)
+        entero = self.var_entero.get()
+        
+        # El hilo de trabajo no toca los widgets: los avisos y el resultado llegan por la cola
+        self.control = ControlResolucion(max_segundos, max_iteraciones,
+                                         progreso=lambda info: self.cola.put(('progreso', info)))
+        control = self.control
+        def trabajo():
+            # El almacén se actualiza aquí, bajo el mismo control, y vuelve por la cola
+            sincronizado, almacen = anterior, None
+            try:
+                try:
+                    sincronizado = self.sincronizar_almacen(anterior, restricciones, n_variables, control)
+                    almacen = sincronizado[0]
+                except Detenido:
+                    # Sin almacén la resolución se detiene en su primera comprobación del control
+                    pass
+                salida = resolver_con_cache(self.cache, objetivo, problema, almacen=almacen,
+                                            entero=entero, sensibilidad=not entero, control=control)
+            except Exception as e:
+                salida = (None, f"Error: {str(e)}", [], [])
+            self.cola.put(('fin', (problema, salida, sincronizado)))
+        
+        self.button_solve.configure(state="disabled")
+        self.button_cancel.configure(state="normal")
+        threading.Thread(target=trabajo, daemon=True).start()
+        self.after(100, self.revisar_cola)
+        
+    def cancelar(self):
+        if self.control is not None:
+            self.control.cancelar()
+        
+    def revisar_cola(self):
+        """
+        Atiende en el hilo de la interfaz los avisos del hilo de trabajo y
+        vuelve a revisar la cola hasta que llega el resultado.
+        """
+        while True:
+            try:
+                tipo, datos = self.cola.get_nowait()
+            except queue.Empty:
+                self.after(100, self.revisar_cola)
+                return
+            if tipo == 'progreso':
+                self.mostrar_progreso(datos)
+            else:
+                break
+        
+        self.control = None
+        self.button_solve.configure(state="normal")
+        self.button_cancel.configure(state="disabled")
+        problema, (resultado, mensaje, puntos_factibles, tablas_simplex), sincronizado = datos
+        self.almacen, self.ids_almacen, self.restricciones_almacen = sincronizado
         self.text_output.insert(tk.END, mensaje + "\n")
+        if resultado is not None and 'sensibilidad' in resultado:
+            self.text_output.insert(tk.END, formatear_sensibilidad(resultado['sensibilidad']) + "\n")
+        self.text_output.see(tk.END)
         
-        if resultado is None:
+        if resultado is None or resultado['punto_optimo'] is None:
             return
-        print(tablas_simplex)
-        dibujar_grafico(restricciones, puntos_factibles, resultado['punto_optimo'], self.frame_right)
\ No newline at end of file
+        # Recorrer el historial por páginas; cada tabla se reconstruye al vuelo
+        if tablas_simplex:
+            for pagina in tablas_simplex.paginas():
+                for indice, tabla in pagina:
+                    print(f"Tabla {indice}:")
+                    print(tabla)
+        dibujar_grafico(problema, puntos_factibles, resultado['punto_optimo'], self.frame_top)
+        
+    def barrido_parametrico(self):
+        """
+        Recorre el lado derecho de una restricción o el costo de una variable
+        siguiendo la base y dibuja la curva del valor óptimo en el panel inferior.
+        """
+        self.text_output.delete("1.0", tk.END)
+        datos = self.leer_problema()
+        if datos is None:
+            return
+        objetivo, restricciones = datos
+        try:
+            indice = int(self.entry_parametro.get()) - 1
+            desde, hasta = float(self.entry_desde.get()), float(self.entry_hasta.get())
+            if self.var_parametro.get() == "Lado derecho":
+                barrido = barrido_lado_derecho(objetivo, restricciones, indice, desde, hasta)
+                etiqueta = f"Lado derecho de R{indice + 1}"
+            else:
+                barrido = barrido_costo(objetivo, restricciones, indice, desde, hasta)
+                etiqueta = f"Coeficiente de x{indice + 1}"
+        except (ValueError, IndexError) as e:
+            self.text_output.insert(tk.END, f"Error: {str(e)}\n")
+            return
+        
+        self.text_output.insert(tk.END, f"Puntos de quiebre ({barrido['pivotes']} pivotes):\n")
+        for t, z in zip(barrido['parametros'], barrido['valores']):
+            self.text_output.insert(tk.END, f"  {t:.2f} -> Z = {z:.2f}\n")
+        if barrido['estado'] != 'completo':
+            self.text_output.insert(tk.END, f"Problema {barrido['estado'].replace('_', ' ')} "
+                                            f"a partir de {barrido['parametros'][-1]:.2f}\n")
+        dibujar_curva_parametrica(barrido, self.frame_bottom, etiqueta)
\ No newline at end of file
@@ -0,0 +1,74 @@
+import numpy as np
+
+from forma_estandar import forma_estandar
+from problema import como_problema
+from simplex_revisado import resolver_forma_estandar, simplex_revisado, simplex_dual_revisado
+
+def _estado_error(error):
+    return 'infactible' if 'factible' in str(error) else 'no_acotado'
+
+def resolver_lote(objetivo, restricciones, objetivos=None, lados_derechos=None):
+    """
+    Resuelve el mismo conjunto de restricciones para una pila de objetivos
+    (k, n) y/o de lados derechos (k, m). Si se dan ambas pilas, el escenario
+    i usa la fila i de cada una; si falta una, se usa la del problema base.
+    Cada escenario parte de la base óptima anterior: simplex dual para
+    recuperar la factibilidad si cambia el lado derecho y simplex primal
+    para reoptimizar si cambia el objetivo.
+    Devuelve un diccionario de arrays con 'puntos' (k, n), 'valores' (k,),
+    'estados' (k,) ('optimo', 'infactible' o 'no_acotado') e 'iteraciones' (k,).
+    """
+    n_variables = len(objetivo['coeff'])
+    problema = como_problema(restricciones, n_variables)
+    if objetivos is None:
+        objetivos = np.array([objetivo['coeff']], dtype=float)
+    objetivos = np.atleast_2d(np.asarray(objetivos, dtype=float))
+    if lados_derechos is None:
+        lados_derechos = problema.b[None, :]
+    lados_derechos = np.atleast_2d(np.asarray(lados_derechos, dtype=float))
+    k = max(len(objetivos), len(lados_derechos))
+    if len(objetivos) not in (1, k) or len(lados_derechos) not in (1, k):
+        raise ValueError("Las pilas de objetivos y lados derechos deben tener la misma longitud.")
+    objetivos = np.broadcast_to(objetivos, (k, n_variables))
+    lados_derechos = np.broadcast_to(lados_derechos, (k, len(problema)))
+
+    puntos = np.full((k, n_variables), np.nan)
+    valores = np.full(k, np.nan)
+    estados = np.empty(k, dtype=object)
+    iteraciones = np.zeros(k, dtype=int)
+    signo = -1.0 if objetivo['type'] == 'max' else 1.0
+
+    fe, base, c_base = None, None, None
+    for i in range(k):
+        pivotes = []
+        try:
+            if base is None:
+                # Arranque en frío: dos fases sobre la forma estándar del escenario
+                fe = forma_estandar(dict(objetivo, coeff=objetivos[i]), problema.con_lado_derecho(lados_derechos[i]))
+                x, base, pivotes = resolver_forma_estandar(fe)
+                c_base = fe['c']
+            else:
+                # Las filas conservan la orientación de la forma estándar original
+                A, filas_extra, signos_extra = fe['A'], fe['filas_extra'], fe['signos_extra']
+                b = fe['signos_fila'] * lados_derechos[i]
+                c = c_base.copy()
+                c[:n_variables] = signo * objetivos[i]
+                # La base es dual factible para c_base: el dual recupera x_B >= 0
+                x, base, pivotes_fase = simplex_dual_revisado(A, b, c_base, filas_extra, signos_extra, base,
+                                                              excluidas=fe['artificiales'])
+                pivotes += pivotes_fase
+                x, base_nueva, pivotes_fase = simplex_revisado(A, b, c, filas_extra, signos_extra, base,
+                                                               excluidas=fe['artificiales'])
+                pivotes += pivotes_fase
+                base, c_base = base_nueva, c
+        except ValueError as e:
+            estados[i] = _estado_error(e)
+            iteraciones[i] = len(pivotes)
+            continue
+
+        puntos[i] = x[:n_variables]
+        valores[i] = np.dot(objetivos[i], puntos[i])
+        estados[i] = 'optimo'
+        iteraciones[i] = len(pivotes)
+
+    return {'puntos': puntos, 'valores': valores, 'estados': estados.astype(str), 'iteraciones': iteraciones}
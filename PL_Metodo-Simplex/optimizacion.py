@@ -1,176 +1,452 @@
 import numpy as np
+from functools import partial
 from itertools import combinations
+from math import comb
+from control import MENSAJES, Detenido
+from cortes import resolver_cortes
+from forma_estandar import forma_estandar, tabla_desde_forma
+from entero import resolver_entero
+from dispersa import densa
+from exacto import fraccion, resolver_simplex_exacto, resolver_sistema_exacto
+from escalado import escalar_problema, resolver_escalado
+from historial import HistorialSimplex, pivotear_tabla
+from precios import SelectorPrecios
+from presolve import presolve, postsolve
+from problema import Problema, como_problema
+from punto_interior import resolver_punto_interior
+from sensibilidad import analisis_sensibilidad
+from simplex_dual import resolver_simplex_dual
+from simplex_revisado import resolver_simplex_revisado
+from vertices import enumerar_vertices, enumerar_vertices_dd, enumerar_vertices_diferidos, enumerar_vertices_paralelo
 
-def encontrar_interseccion(restricciones):
+def encontrar_interseccion(restricciones, exacto=False):
     """
     Encuentra la intersección de n restricciones (sistema de ecuaciones lineales).
+    Con `exacto` el sistema se resuelve sin fracciones ni redondeo y las
+    coordenadas son Fraction.
     """
-    if not restricciones:
+    if not len(restricciones):
         return None
     
-    n_variables = len(restricciones[0]['a'])
-    A = np.array([r['a'] for r in restricciones])
-    b = np.array([r['c'] for r in restricciones])
+    problema = como_problema(restricciones)
+    if exacto:
+        x = resolver_sistema_exacto(densa(problema.A).tolist(), problema.b.tolist())
+        return None if x is None else tuple(x)
     
     try:
-        x = np.linalg.solve(A, b)
+        x = np.linalg.solve(densa(problema.A), problema.b)
         return tuple(float(round(val, 2)) for val in x)  # Redondear a 2 decimales
     except np.linalg.LinAlgError:
         return None  # No hay solución única o sistema incompatible
 
-def es_factible(punto, restricciones):
+def _cumple(fila, lado, sentido, x):
+    valor = sum(a * v for a, v in zip(fila, x))
+    return valor <= lado if sentido == 1 else valor >= lado if sentido == -1 else valor == lado
+
+def enumerar_vertices_exactos(restricciones, decimales=2, control=None):
     """
-    Verifica si un punto satisface todas las restricciones.
+    Puntos factibles en aritmética exacta (enumeración del método 'exacto'):
+    cada n-subconjunto de restricciones se intersecta con
+    encontrar_interseccion(exacto=True), la factibilidad se comprueba sin
+    tolerancias y los duplicados se quitan comparando fracciones, así que un
+    vértice degenerado (activo en más de n restricciones) aparece una sola
+    vez. Solo se redondea al devolverlos. Son C(m, n) sistemas exactos: es
+    para modelos pequeños. Con un `control` se informa cada 256
+    combinaciones y, si se detiene, Detenido lleva en `vertices` los ya hallados.
     """
-    for r in restricciones:
-        lhs = sum(r['a'][i] * punto[i] for i in range(len(punto)))
-        if r['inecuacion'] == '<=' and lhs > r['c'] + 1e-9:
-            return False
-        elif r['inecuacion'] == '>=' and lhs < r['c'] - 1e-9:
-            return False
-    return True
+    problema = como_problema(restricciones)
+    n_variables = problema.n_variables
+    filas = [[fraccion(v) for v in fila] for fila in densa(problema.A).tolist()]
+    lados = [fraccion(v) for v in problema.b.tolist()]
+    total = comb(len(problema), n_variables)
+    exactos = set()
+    
+    def redondeados():
+        return sorted({tuple(float(round(v, decimales)) + 0.0 for v in x) for x in exactos})
+    
+    for k, indices in enumerate(combinations(range(len(problema)), n_variables)):
+        if control is not None and k % 256 == 0:
+            try:
+                control.informar(combinaciones=k, total=total)
+            except Detenido as e:
+                e.vertices = redondeados()
+                raise
+        x = encontrar_interseccion([problema[i] for i in indices], exacto=True)
+        if x is None or x in exactos:
+            continue
+        if all(_cumple(fila, lado, sentido, x) for fila, lado, sentido in zip(filas, lados, problema.sentidos)):
+            exactos.add(x)
+    return redondeados()
 
 def inicializar_tabla_simplex(objetivo, restricciones):
     """
     Inicializa la tabla simplex a partir de la función objetivo y las restricciones.
+    Admite restricciones '<=', '>=' y '=' con cualquier signo en el lado derecho;
+    si hacen falta variables artificiales incluye la fila de fase I.
     """
-    n_variables = len(objetivo['coeff'])
-    n_restricciones = len(restricciones)
-    
-    # Coeficientes de la función objetivo (multiplicados por -1 para maximizar)
-    if objetivo['type'] == 'max':
-        c = np.array([-coeff for coeff in objetivo['coeff']])
-    else:  # minimización
-        c = np.array(objetivo['coeff'])
-    
-    # Matriz de coeficientes de las restricciones
-    A = np.array([r['a'] for r in restricciones])
-    b = np.array([r['c'] for r in restricciones])
-    
-    # Identidad para las variables de holgura
-    identidad = np.eye(n_restricciones)
-    
-    # Tabla simplex inicial
-    tabla = np.hstack((A, identidad, b.reshape(-1, 1)))
-    tabla = np.vstack((tabla, np.hstack((c, np.zeros(n_restricciones + 1)))))
-    
-    return tabla
+    return tabla_desde_forma(forma_estandar(objetivo, restricciones))
 
-def encontrar_columna_pivote(tabla):
+def encontrar_columna_pivote(tabla, fila_objetivo=-1, excluidas=None, precios=None, n_restricciones=None):
     """
-    Encuentra la columna pivote (la más negativa en la última fila).
+    Encuentra la columna pivote (la más negativa en la fila objetivo, o la
+    que elija la regla de `precios` si se indica un SelectorPrecios).
+    Las columnas `excluidas` no pueden entrar en la base.
     """
-    return np.argmin(tabla[-1, :-1])
+    costos = tabla[fila_objetivo, :-1].copy()
+    if excluidas is not None:
+        costos[excluidas] = np.inf
+    if precios is None:
+        return np.argmin(costos)
+    if n_restricciones is None:
+        n_restricciones = len(tabla) - 1
+    return precios.columna(costos, tabla, n_restricciones)
 
-def encontrar_fila_pivote(tabla, col_pivote):
+def encontrar_fila_pivote(tabla, col_pivote, n_restricciones=None, base=None):
     """
     Encuentra la fila pivote usando la regla del mínimo cociente.
+    Si se pasa la `base`, los empates se deshacen por el menor índice de
+    variable básica (necesario para la regla de Bland).
     """
-    ratios = []
-    for i in range(len(tabla) - 1):
-        if tabla[i, col_pivote] > 0:
-            ratios.append(tabla[i, -1] / tabla[i, col_pivote])
-        else:
-            ratios.append(np.inf)
-    return np.argmin(ratios)
+    if n_restricciones is None:
+        n_restricciones = len(tabla) - 1
+    columna = tabla[:n_restricciones, col_pivote]
+    ratios = np.full(n_restricciones, np.inf)
+    positivos = columna > 1e-9
+    if not np.any(positivos):
+        raise ValueError("El problema no está acotado.")
+    ratios[positivos] = tabla[:n_restricciones, -1][positivos] / columna[positivos]
+    if base is None:
+        return np.argmin(ratios)
+    empates = np.where(ratios <= ratios.min() + 1e-9)[0]
+    return empates[np.argmin(np.asarray(base)[empates])]
 
 def actualizar_tabla(tabla, fila_pivote, col_pivote):
     """
     Actualiza la tabla simplex usando la operación de pivote.
     """
-    tabla[fila_pivote] /= tabla[fila_pivote, col_pivote]
-    for i in range(len(tabla)):
-        if i != fila_pivote:
-            tabla[i] -= tabla[i, col_pivote] * tabla[fila_pivote]
+    pivotear_tabla(tabla, fila_pivote, col_pivote)
 
-def es_optimo(tabla):
+def es_optimo(tabla, fila_objetivo=-1, excluidas=None):
     """
     Verifica si la solución actual es óptima.
     """
-    return all(tabla[-1, :-1] >= 0)
+    costos = tabla[fila_objetivo, :-1].copy()
+    if excluidas is not None:
+        costos[excluidas] = 0.0
+    return all(costos >= -1e-9)
 
-def resolver_simplex(objetivo, restricciones):
+def _iterar_tabla(tabla, base, historial, n_restricciones, fila_objetivo, excluidas=None, precios=None,
+                  max_iteraciones=10000, aviso=None):
     """
-    Resuelve el problema usando el método simplex.
-    Devuelve la solución óptima, el valor óptimo y las tablas intermedias.
+    Pivota hasta que la fila objetivo indicada no tenga costos negativos.
+    `aviso(tabla)` se llama antes de cada pivote y puede detener la
+    resolución lanzando control.Detenido.
     """
-    tabla = inicializar_tabla_simplex(objetivo, restricciones)
-    tablas_intermedias = [tabla.copy()]  # Guardar la tabla inicial
-    
-    while not es_optimo(tabla):
-        col_pivote = encontrar_columna_pivote(tabla)
-        fila_pivote = encontrar_fila_pivote(tabla, col_pivote)
+    if precios is None:
+        precios = SelectorPrecios()
+    precios.reiniciar(tabla, n_restricciones)
+    for _ in range(max_iteraciones):
+        if es_optimo(tabla, fila_objetivo, excluidas):
+            return
+        if aviso is not None:
+            aviso(tabla)
+        col_pivote = encontrar_columna_pivote(tabla, fila_objetivo, excluidas, precios, n_restricciones)
+        fila_pivote = encontrar_fila_pivote(tabla, col_pivote, n_restricciones, base if precios.en_bland else None)
+        precios.pivote(tabla, fila_pivote, col_pivote, base)
         actualizar_tabla(tabla, fila_pivote, col_pivote)
-        tablas_intermedias.append(tabla.copy())  # Guardar la tabla actualizada
-    
-    # Extraer solución óptima
+        base[fila_pivote] = col_pivote
+        historial.registrar(fila_pivote, col_pivote)  # Guardar solo el pivote
+        precios.fin_iteracion()
+    raise ValueError("Se alcanzó el máximo de iteraciones del simplex.")
+
+def _solucion_base(tabla, base, objetivo, decimales):
+    """
+    Solución básica de la tabla y su valor, redondeados si se pide.
+    """
     n_variables = len(objetivo['coeff'])
     solucion = np.zeros(n_variables)
+    for fila, col in enumerate(base):
+        if col < n_variables:
+            solucion[col] = tabla[fila, -1]
+    valor_optimo = np.dot(objetivo['coeff'], solucion)
+    if decimales is None:
+        return [float(x) for x in solucion], float(valor_optimo)
     
-    for i in range(n_variables):
-        col = tabla[:, i]
-        if np.sum(col == 1) == 1 and np.sum(col == 0) == len(col) - 1:
-            fila = np.where(col == 1)[0][0]
-            solucion[i] = tabla[fila, -1]
+    # Convertir y redondear la solución a tipos nativos de Python
+    solucion = [float(round(x, decimales)) for x in solucion]  # Redondear (2 decimales por defecto)
+    valor_optimo = float(round(valor_optimo, decimales))  # Redondear (2 decimales por defecto)
+    return solucion, valor_optimo
+
+def resolver_simplex(objetivo, restricciones, regla='dantzig', estadisticas=None, decimales=2, final=None,
+                     control=None):
+    """
+    Resuelve el problema usando el método simplex en dos fases.
+    `regla` es la regla de precios de la columna que entra (ver precios.REGLAS);
+    las iteraciones y tiempos se acumulan en `estadisticas` (EstadisticasPrecios).
+    Si se pasa el diccionario `final`, se guardan en él la forma estándar
+    ('forma') y la base óptima ('base') para el análisis de sensibilidad.
+    Con un `control` (control.ControlResolucion) cada pivote cuenta como
+    iteración y la resolución puede detenerse; si se detiene en la fase II,
+    la excepción Detenido lleva la solución factible actual en `mejor`.
+    Devuelve la solución óptima, el valor óptimo y el historial de tablas
+    (tabla inicial más registro de pivotes). Con `decimales=None` la
+    solución no se redondea.
+    """
+    precios = SelectorPrecios(regla, estadisticas=estadisticas)
+    fe = forma_estandar(objetivo, restricciones)
+    tabla = tabla_desde_forma(fe)
+    tablas_intermedias = HistorialSimplex(tabla.copy())  # Guardar la tabla inicial
+    n_restricciones = len(restricciones)
+    base = list(fe['base'])
+    artificiales = fe['artificiales']
     
-    valor_optimo = tabla[-1, -1]
+    def aviso(fase):
+        if control is None:
+            return None
+        def avisar(tabla):
+            # La fila objetivo guarda -z del problema de mínimo
+            z = -tabla[-1, -1] if objetivo['type'] == 'min' else tabla[-1, -1]
+            try:
+                control.iteracion(fase=fase, objetivo=float(z) if fase == 2 else None)
+            except Detenido as e:
+                # En la fase II la base actual es factible: es la mejor solución hasta el corte
+                if fase == 2:
+                    e.mejor = _solucion_base(tabla, base, objetivo, decimales)
+                e.historial = tablas_intermedias
+                raise
+        return avisar
     
-    # Convertir y redondear la solución a tipos nativos de Python
-    solucion = [float(round(x, 2)) for x in solucion]  # Redondear a 2 decimales
-    valor_optimo = float(round(valor_optimo, 2))  # Redondear a 2 decimales
+    if len(artificiales):
+        # Fase I: minimizar la suma de las artificiales
+        _iterar_tabla(tabla, base, tablas_intermedias, n_restricciones, n_restricciones, precios=precios,
+                      aviso=aviso(1))
+        if -tabla[n_restricciones, -1] > 1e-7:
+            raise ValueError("El problema no tiene solución factible.")
+        
+        # Sacar de la base las artificiales que quedaron con valor cero
+        es_artificial = np.zeros(tabla.shape[1] - 1, dtype=bool)
+        es_artificial[artificiales] = True
+        for fila, col in enumerate(base):
+            if not es_artificial[col]:
+                continue
+            candidatas = np.where(~es_artificial & (np.abs(tabla[fila, :-1]) > 1e-9))[0]
+            if len(candidatas):
+                actualizar_tabla(tabla, fila, candidatas[0])
+                base[fila] = candidatas[0]
+                tablas_intermedias.registrar(fila, candidatas[0])
+    
+    # Fase II con las artificiales fuera de la base
+    _iterar_tabla(tabla, base, tablas_intermedias, n_restricciones, -1, artificiales, precios, aviso=aviso(2))
+    if final is not None:
+        final.update(forma=fe, base=list(base))
     
+    # Extraer solución óptima a partir de la base
+    solucion, valor_optimo = _solucion_base(tabla, base, objetivo, decimales)
     return solucion, valor_optimo, tablas_intermedias
 
-def resolver_optimizacion(objetivo, restricciones):
+def _resolver_reducido(objetivo, restricciones, motor, enumeracion):
+    """
+    Presolve, resolución del problema reducido y postsolve de la solución y los vértices.
+    """
+    reducido = presolve(objetivo, restricciones)
+    if len(reducido['columnas']):
+        solucion, _, tablas_simplex = motor(reducido['objetivo'], reducido['restricciones'], decimales=None)
+    else:
+        solucion, tablas_simplex = [], []
+    solucion = postsolve(reducido, [solucion])[0]
+    valor_optimo = float(round(np.dot(objetivo['coeff'], solucion), 2))  # Redondear a 2 decimales
+    solucion = [float(round(v, 2)) + 0.0 for v in solucion]  # Redondear a 2 decimales
+
+    # Vértices: solo reducciones que conservan la región, incluyendo x >= 0
+    region = presolve(objetivo, restricciones, conservar_region=True)
+    n_region = len(region['columnas'])
+    positividad = Problema(np.eye(n_region), np.zeros(n_region), np.full(n_region, -1))
+    if enumeracion is None:
+        vertices = []
+    elif not n_region:
+        vertices = [()]
+    elif enumeracion == 'diferida':
+        vertices = enumerar_vertices_diferidos(region['restricciones'] + positividad, decimales=9)
+    elif enumeracion == 'dd' or (enumeracion == 'auto' and n_region >= 3):
+        vertices = enumerar_vertices_dd(region['restricciones'] + positividad, decimales=9)
+    else:
+        vertices = enumerar_vertices(region['restricciones'] + positividad, decimales=9)
+    puntos_factibles = []
+    if vertices:
+        puntos = np.round(postsolve(region, vertices), 2) + 0.0
+        puntos_factibles = [tuple(float(v) for v in p) for p in np.unique(puntos, axis=0)]
+
+    mensaje = (f"Solución óptima: {tuple(solucion)}\n"
+               f"Valor óptimo: {valor_optimo:.2f}")
+    return {'punto_optimo': solucion, 'valor_optimo': valor_optimo}, mensaje, puntos_factibles, tablas_simplex
+
+def _resultado_detenido(e):
+    """
+    Salida de resolver_optimizacion cuando un control detiene la resolución:
+    la mejor solución factible encontrada (si la hay), el estado y el
+    historial hasta el corte.
+    """
+    solucion, valor_optimo = e.mejor if e.mejor is not None else (None, None)
+    mensaje = str(e)
+    if e.mejor is not None:
+        mensaje += (f"\nMejor solución factible: {tuple(solucion)}\n"
+                    f"Valor: {valor_optimo:.2f}")
+    else:
+        mensaje += "\nNo se llegó a una solución factible."
+    resultado = {'punto_optimo': solucion, 'valor_optimo': valor_optimo, 'estado': e.estado}
+    return resultado, mensaje, [], e.historial if e.historial is not None else []
+
+# Motores simplex disponibles para resolver_optimizacion
+METODOS = {
+    'tabla': resolver_simplex,
+    'revisado': resolver_simplex_revisado,
+    'dual': resolver_simplex_dual,
+    'punto_interior': resolver_punto_interior,
+    'cortes': resolver_cortes,
+    'exacto': resolver_simplex_exacto,
+}
+
+def resolver_optimizacion(objetivo, restricciones, metodo='tabla', enumeracion='auto', n_procesos=1, tamano_bloque=4096,
+                          almacen=None, regla=None, reducir=False, escalar=False, entero=False, enteras=None,
+                          progreso=None, sensibilidad=False, control=None):
     """
     Resuelve el problema y devuelve la solución óptima, valor óptimo, puntos factibles y tablas intermedias.
+    `metodo` selecciona el motor ('tabla', 'revisado', 'dual',
+    'punto_interior', 'cortes' o 'exacto'); 'dual' trabaja sobre una base de filas y
+    conviene con muchas restricciones, 'punto_interior' con modelos grandes
+    y densos (termina con crossover a un vértice) y 'cortes' con pocas
+    variables y decenas de miles de restricciones de las que pocas son
+    activas (genera las restricciones de forma diferida). 'exacto' pivota
+    en aritmética entera exacta (ver exacto) para modelos degenerados.
+    `enumeracion` elige cómo se calculan los puntos factibles: 'dd' (doble
+    descripción), 'diferida' (doble descripción sobre un conjunto de trabajo
+    que crece con las restricciones violadas, como los planos de corte),
+    'combinaciones' (intersección de cada n-subconjunto), 'exacta' (las
+    combinaciones en aritmética exacta, ver enumerar_vertices_exactos), None
+    (no se enumeran: los puntos factibles quedan vacíos) o 'auto', que usa
+    'diferida' con el método 'cortes', 'exacta' con 'exacto' y, con los
+    demás, doble descripción a partir de 3 variables. Con `n_procesos`
+    distinto de 1 las combinaciones se reparten entre varios procesos (None usa
+    todos los núcleos); `tamano_bloque` acota la memoria de cada bloque.
+    Si se pasa un `almacen` (AlmacenVertices) sincronizado con `restricciones`,
+    los puntos factibles se toman de él sin volver a enumerar.
+    `regla` fija la regla de precios del método 'tabla' (ver precios.REGLAS).
+    Con `reducir` se aplica el presolve, se resuelve el problema reducido y la
+    solución y los vértices se llevan al espacio original; en ese caso los
+    vértices son los de la región con x >= 0, que es la que resuelve el simplex.
+    Con `escalar` el motor y la enumeración de vértices trabajan sobre el
+    problema escalado por filas y columnas, y el escalado se deshace después.
+    Con `entero` la solución se busca por ramificación y acotación (ver
+    entero.resolver_entero) entre los puntos con las variables de `enteras`
+    (None: todas) enteras; `progreso` recibe el incumbente y la cota durante
+    la búsqueda y `n_procesos` reparte los subárboles.
+    Con `sensibilidad` (métodos 'tabla' y 'revisado', sin presolve, escalado
+    ni modo entero) el resultado incluye en 'sensibilidad' los precios
+    sombra, costos reducidos y rangos calculados desde la base óptima.
+    Con un `control` (control.ControlResolucion) la resolución se puede
+    cancelar o limitar en tiempo e iteraciones (pivotes del método 'tabla');
+    el resultado lleva en 'estado' el código 'optimo', 'cancelado',
+    'limite_tiempo' o 'limite_iteraciones' y, si se detuvo, la mejor
+    solución factible encontrada (o None) y los vértices hallados hasta entonces.
     """
     try:
-        # Resolver usando simplex
-        solucion, valor_optimo, tablas_simplex = resolver_simplex(objetivo, restricciones)
+        if metodo not in METODOS:
+            raise ValueError(f"Método desconocido: {metodo}")
+        motor = METODOS[metodo]
+        restricciones = como_problema(restricciones, len(objetivo['coeff']))
+        if regla is not None:
+            if metodo != 'tabla':
+                raise ValueError("La regla de precios solo se aplica al método 'tabla'.")
+            motor = partial(resolver_simplex, regla=regla)
+        final = {}
+        if sensibilidad:
+            if metodo not in ('tabla', 'revisado') or escalar or reducir or entero:
+                raise ValueError("La sensibilidad requiere el método 'tabla' o 'revisado' sin presolve, "
+                                 "escalado ni modo entero.")
+            motor = partial(motor, final=final)
+        if control is not None and metodo == 'tabla':
+            motor = partial(motor, control=control)
+        if escalar:
+            motor = partial(resolver_escalado, motor)
         
-        # Verificar si la solución es un vector de ceros
-        if all(abs(x) < 1e-9 for x in solucion):
-            print("Advertencia: La solución óptima es un vector de ceros. Descartando esta solución.")
-            solucion = None
-            valor_optimo = None
+        if reducir:
+            if entero:
+                raise ValueError("El modo entero no admite el presolve.")
+            return _resolver_reducido(objetivo, restricciones, motor, enumeracion)
         
-        # Calcular puntos factibles (intersecciones de restricciones)
-        n_variables = len(objetivo['coeff'])
-        intersecciones = []
+        if control is not None and entero:
+            # Los avisos de la ramificación también pasan por el control
+            progreso_usuario = progreso
+            def progreso(info):
+                if progreso_usuario is not None:
+                    progreso_usuario(info)
+                control.informar(**info)
         
-        # Generar combinaciones de n_variables restricciones
-        for restricciones_combinadas in combinations(restricciones, n_variables):
-            punto = encontrar_interseccion(restricciones_combinadas)
-            if punto is not None:
-                intersecciones.append(punto)
-        
-        # Filtrar puntos factibles
-        puntos_factibles = [p for p in intersecciones if es_factible(p, restricciones)]
-        puntos_factibles = list(set([tuple(float(round(coord, 2)) for coord in p) for p in puntos_factibles]))
+        # Resolver usando simplex
+        try:
+            if control is not None:
+                control.verificar()
+            solucion, valor_optimo, tablas_simplex = motor(objetivo, restricciones)
+            if entero:
+                # La relajación lineal queda en el historial; la solución es la entera
+                solucion, valor_optimo, info_entero = resolver_entero(objetivo, restricciones, enteras,
+                                                                      n_procesos=n_procesos, progreso=progreso)
+        except Detenido as e:
+            return _resultado_detenido(e)
         
-        # Si la solución simplex es un vector de ceros, buscar la mejor solución entre los puntos factibles
-        if solucion is None and puntos_factibles:
-            mejor_punto = None
-            mejor_valor = np.inf if objetivo['type'] == 'min' else -np.inf
-            
-            for punto in puntos_factibles:
-                valor = sum(objetivo['coeff'][i] * punto[i] for i in range(n_variables))
-                if (objetivo['type'] == 'min' and valor < mejor_valor) or (objetivo['type'] == 'max' and valor > mejor_valor):
-                    mejor_punto = punto
-                    mejor_valor = valor
-            
-            solucion = [float(round(x, 2)) for x in mejor_punto]  # Redondear a 2 decimales
-            valor_optimo = float(round(mejor_valor, 2))  # Redondear a 2 decimales
+        # Calcular puntos factibles (vértices de la región)
+        region, decimales = restricciones, 2
+        if escalar and almacen is None:
+            # Se enumera en el espacio escalado y se redondea tras deshacer la escala
+            _, region, factores = escalar_problema(objetivo, restricciones)
+            decimales = 9
+        if almacen is not None:
+            enumeracion = 'almacen'
+        elif enumeracion == 'auto':
+            if metodo == 'cortes':
+                enumeracion = 'diferida'
+            elif metodo == 'exacto' and not escalar:
+                enumeracion = 'exacta'
+            else:
+                enumeracion = 'dd' if len(objetivo['coeff']) >= 3 else 'combinaciones'
+        estado = 'optimo'
+        try:
+            if enumeracion is None:
+                puntos_factibles = []
+            elif enumeracion == 'almacen':
+                puntos_factibles = almacen.vertices()
+            elif enumeracion == 'dd':
+                puntos_factibles = enumerar_vertices_dd(region, decimales, control)
+            elif enumeracion == 'diferida':
+                puntos_factibles = enumerar_vertices_diferidos(region, decimales, control=control)
+            elif enumeracion == 'exacta':
+                puntos_factibles = enumerar_vertices_exactos(region, decimales, control)
+            elif n_procesos == 1:
+                puntos_factibles = enumerar_vertices(region, tamano_bloque, decimales, control)
+            else:
+                puntos_factibles, _, _ = enumerar_vertices_paralelo(region, n_procesos=n_procesos,
+                                                                    tamano_bloque=tamano_bloque, decimales=decimales)
+        except Detenido as e:
+            # La solución ya es óptima; solo faltan vértices para la gráfica
+            estado, puntos_factibles = e.estado, e.vertices or []
+        if escalar and almacen is None and puntos_factibles:
+            puntos = np.round(np.array(puntos_factibles) * factores, 2) + 0.0
+            puntos_factibles = [tuple(float(v) for v in p) for p in np.unique(puntos, axis=0)]
         
         # Mensaje de salida
-        if solucion is not None:
-            mensaje = (f"Solución óptima: {tuple(solucion)}\n"
-                       f"Valor óptimo: {valor_optimo:.2f}")
-        else:
-            mensaje = "No se encontró una solución óptima válida."
+        mensaje = (f"Solución óptima: {tuple(solucion)}\n"
+                   f"Valor óptimo: {valor_optimo:.2f}")
+        if entero:
+            mensaje += f"\nNodos explorados: {info_entero['nodos']}"
+            if info_entero['estado'] == 'limite':
+                mensaje += f"\nLímite de nodos alcanzado (brecha {100 * info_entero['brecha']:.2f} %)"
+        if estado != 'optimo':
+            mensaje += f"\n{MENSAJES[estado]} Los puntos factibles están incompletos."
         
-        return {'punto_optimo': solucion, 'valor_optimo': valor_optimo}, mensaje, puntos_factibles, tablas_simplex
+        resultado = {'punto_optimo': solucion, 'valor_optimo': valor_optimo, 'estado': estado}
+        if sensibilidad:
+            resultado['sensibilidad'] = analisis_sensibilidad(final['forma'], final['base'])
+        return resultado, mensaje, puntos_factibles, tablas_simplex
     
     except Exception as e:
         return None, f"Error: {str(e)}", [], []
\ No newline at end of file
@@ -0,0 +1,194 @@
+import numpy as np
+
+from forma_estandar import forma_estandar
+from problema import como_problema
+from simplex_revisado import (FactorizacionBase, _columna, _costos_reducidos, _matriz_base,
+                              resolver_forma_estandar)
+
+def _puntos_quiebre(parametros, valores, tol=1e-9):
+    """
+    Conserva los extremos y los puntos donde cambia la pendiente; los
+    pivotes degenerados o que no cambian la pendiente no son quiebres.
+    """
+    puntos = [(parametros[0], valores[0])]
+    for k in range(1, len(parametros)):
+        t, z = parametros[k], valores[k]
+        if abs(t - puntos[-1][0]) <= tol:
+            continue
+        if len(puntos) >= 2:
+            (t0, z0), (t1, z1) = puntos[-2], puntos[-1]
+            # Pendiente igual a la del tramo anterior: el último punto no es quiebre
+            if abs((z1 - z0) * (t - t1) - (z - z1) * (t1 - t0)) <= tol * (1 + abs(z1)) * abs(t - t0):
+                puntos.pop()
+        puntos.append((t, z))
+    return [float(t) for t, _ in puntos], [float(z) for _, z in puntos]
+
+def _resultado(parametros, valores, pivotes, estado):
+    parametros, valores = _puntos_quiebre(parametros, valores)
+    return {'parametros': parametros, 'valores': valores, 'pivotes': pivotes, 'estado': estado}
+
+def _pivotar(fact, A, filas_extra, signos_extra, base, x_base, b, fila_pivote, col_pivote, alfa):
+    """
+    Cambia la base y su factorización (eta o refactorización).
+    """
+    theta = x_base[fila_pivote] / alfa[fila_pivote]
+    x_base -= theta * alfa
+    x_base[fila_pivote] = theta
+    base[fila_pivote] = col_pivote
+    if fact.necesita_refactorizar():
+        fact.refactorizar(_matriz_base(A, filas_extra, signos_extra, base))
+        x_base[:] = fact.ftran(b)
+    else:
+        fact.actualizar(fila_pivote, alfa)
+
+def barrido_lado_derecho(objetivo, restricciones, fila, desde, hasta, max_pivotes=1000, tol=1e-9):
+    """
+    Valor óptimo en función del lado derecho de la restricción `fila`
+    cuando recorre [desde, hasta], siguiendo la base: se resuelve una vez en
+    `desde` y, mientras la base sigue siendo factible, el valor es lineal;
+    al anularse una variable básica un pivote del simplex dual da la base
+    del tramo siguiente. Devuelve un diccionario con los 'parametros' y
+    'valores' de los puntos de quiebre (exactos, no muestreados), los
+    'pivotes' dados y el 'estado': 'completo', o 'infactible' si el
+    problema deja de tener solución antes de `hasta` (el último punto es
+    donde termina la región factible), o 'limite' si se dieron `max_pivotes`.
+    """
+    n_variables = len(objetivo['coeff'])
+    problema = como_problema(restricciones, n_variables)
+    b = problema.b.copy()
+    b[fila] = desde
+    fe = forma_estandar(objetivo, problema.con_lado_derecho(b))
+    _, base, _ = resolver_forma_estandar(fe)
+
+    A, b, c = fe['A'], fe['b'].copy(), fe['c']
+    filas_extra, signos_extra = fe['filas_extra'], fe['signos_extra']
+    coeff = np.array(objetivo['coeff'], dtype=float)
+    m, n_total = len(b), len(c)
+    es_artificial = np.zeros(n_total, dtype=bool)
+    es_artificial[fe['artificiales']] = True
+
+    # b(u) = b + u * direccion, con t = desde + paso * u
+    paso = 1.0 if hasta >= desde else -1.0
+    longitud = abs(hasta - desde)
+    direccion = np.zeros(m)
+    direccion[fila] = paso * fe['signos_fila'][fila]
+
+    base = list(base)
+    fact = FactorizacionBase(_matriz_base(A, filas_extra, signos_extra, base))
+    x_base = fact.ftran(b)
+    u, pivotes = 0.0, 0
+
+    def valor():
+        x = np.zeros(n_total)
+        x[base] = x_base
+        return coeff @ x[:n_variables]
+
+    parametros, valores = [desde], [valor()]
+    while True:
+        # Primera variable básica que se anula al avanzar; las artificiales deben seguir en cero
+        w = fact.ftran(direccion)
+        limites = np.full(m, np.inf)
+        baja = w < -tol
+        limites[baja] = np.maximum(x_base[baja], 0.0) / -w[baja]
+        limites[es_artificial[base] & (np.abs(w) > tol)] = 0.0
+        fila_pivote = int(np.argmin(limites))
+        avance = min(limites[fila_pivote], longitud - u)
+        x_base += avance * w
+        b += avance * direccion
+        u += avance
+        parametros.append(desde + paso * u)
+        valores.append(valor())
+        if u >= longitud:
+            return _resultado(parametros, valores, pivotes, 'completo')
+        if es_artificial[base[fila_pivote]]:
+            return _resultado(parametros, valores, pivotes, 'infactible')
+        if pivotes >= max_pivotes:
+            return _resultado(parametros, valores, pivotes, 'limite')
+
+        # Pivote del simplex dual sobre la fila que se anula
+        e = np.zeros(m)
+        e[fila_pivote] = 1.0
+        rho = fact.btran(e)
+        fila_tabla = np.concatenate((A.T @ rho, signos_extra * rho[filas_extra]))
+        d = _costos_reducidos(A, filas_extra, signos_extra, c, fact.btran(c[base]))
+        candidatas = ~es_artificial & (fila_tabla < -tol)
+        candidatas[base] = False
+        if not np.any(candidatas):
+            return _resultado(parametros, valores, pivotes, 'infactible')
+        ratios = np.full(n_total, np.inf)
+        ratios[candidatas] = np.maximum(d[candidatas], 0.0) / -fila_tabla[candidatas]
+        col_pivote = int(np.argmin(ratios))
+        x_base[fila_pivote] = 0.0
+        alfa = fact.ftran(_columna(A, filas_extra, signos_extra, col_pivote))
+        _pivotar(fact, A, filas_extra, signos_extra, base, x_base, b, fila_pivote, col_pivote, alfa)
+        pivotes += 1
+
+def barrido_costo(objetivo, restricciones, variable, desde, hasta, max_pivotes=1000, tol=1e-9):
+    """
+    Valor óptimo en función del coeficiente de `variable` en el objetivo
+    cuando recorre [desde, hasta]. Mientras la base sigue siendo óptima la
+    solución no cambia y el valor es lineal; cuando un costo reducido llega
+    a cero un pivote del simplex primal da la base del tramo siguiente.
+    Devuelve el mismo diccionario que barrido_lado_derecho, con estado
+    'no_acotado' si el problema deja de estar acotado antes de `hasta`.
+    """
+    n_variables = len(objetivo['coeff'])
+    problema = como_problema(restricciones, n_variables)
+    coeff = np.array(objetivo['coeff'], dtype=float)
+    coeff[variable] = desde
+    fe = forma_estandar({'coeff': coeff, 'type': objetivo['type']}, problema)
+    _, base, _ = resolver_forma_estandar(fe)
+
+    A, b, c = fe['A'], fe['b'], fe['c'].copy()
+    filas_extra, signos_extra = fe['filas_extra'], fe['signos_extra']
+    m, n_total = len(b), len(c)
+    es_artificial = np.zeros(n_total, dtype=bool)
+    es_artificial[fe['artificiales']] = True
+
+    # c(u) = c + u * direccion (c está en forma de mínimo: -coeff si se maximiza)
+    paso = 1.0 if hasta >= desde else -1.0
+    longitud = abs(hasta - desde)
+    direccion = np.zeros(n_total)
+    direccion[variable] = paso * (-1.0 if objetivo['type'] == 'max' else 1.0)
+
+    base = list(base)
+    fact = FactorizacionBase(_matriz_base(A, filas_extra, signos_extra, base))
+    x_base = fact.ftran(b)
+    u, pivotes = 0.0, 0
+
+    def valor():
+        x = np.zeros(n_total)
+        x[base] = x_base
+        return coeff @ x[:n_variables]
+
+    parametros, valores = [desde], [valor()]
+    while True:
+        # Primer costo reducido no básico que llega a cero al avanzar
+        d = _costos_reducidos(A, filas_extra, signos_extra, c, fact.btran(c[base]))
+        dd = _costos_reducidos(A, filas_extra, signos_extra, direccion, fact.btran(direccion[base]))
+        candidatas = ~es_artificial & (dd < -tol)
+        candidatas[base] = False
+        limites = np.full(n_total, np.inf)
+        limites[candidatas] = np.maximum(d[candidatas], 0.0) / -dd[candidatas]
+        col_pivote = int(np.argmin(limites))
+        avance = min(limites[col_pivote], longitud - u)
+        c += avance * direccion
+        u += avance
+        coeff[variable] = desde + paso * u
+        parametros.append(coeff[variable])
+        valores.append(valor())
+        if u >= longitud:
+            return _resultado(parametros, valores, pivotes, 'completo')
+        if pivotes >= max_pivotes:
+            return _resultado(parametros, valores, pivotes, 'limite')
+
+        # Pivote del simplex primal con la columna cuyo costo reducido se anula
+        alfa = fact.ftran(_columna(A, filas_extra, signos_extra, col_pivote))
+        positivos = alfa > tol
+        if not np.any(positivos):
+            return _resultado(parametros, valores, pivotes, 'no_acotado')
+        ratios = np.full(m, np.inf)
+        ratios[positivos] = np.maximum(x_base[positivos], 0.0) / alfa[positivos]
+        fila_pivote = int(np.argmin(ratios))
+        _pivotar(fact, A, filas_extra, signos_extra, base, x_base, b, fila_pivote, col_pivote, alfa)
+        pivotes += 1
@@ -0,0 +1,195 @@
+import numpy as np
+from time import perf_counter
+
+class Dantzig:
+    """
+    Entra la columna con el costo reducido más negativo.
+    """
+    nombre = 'dantzig'
+
+    def reiniciar(self, tabla, n_restricciones):
+        pass
+
+    def elegir(self, costos, tabla, n_restricciones):
+        return int(np.argmin(costos))
+
+    def pivote(self, tabla, fila_pivote, col_pivote, base):
+        pass
+
+class Parcial(Dantzig):
+    """
+    Precios parciales con lista de candidatas: se examina un segmento de
+    columnas cada vez (empezando donde terminó el anterior) y se guardan
+    las `n_candidatas` mejores, que se vuelven a usar mientras sigan
+    mejorando antes de examinar más columnas.
+    """
+    nombre = 'parcial'
+
+    def __init__(self, tamano_segmento=None, n_candidatas=5):
+        self.tamano_segmento = tamano_segmento
+        self.n_candidatas = n_candidatas
+
+    def reiniciar(self, tabla, n_restricciones):
+        n_columnas = tabla.shape[1] - 1
+        self._segmento = self.tamano_segmento or max(16, int(np.sqrt(n_columnas)))
+        self._cursor = 0
+        self._candidatas = np.empty(0, dtype=int)
+
+    def elegir(self, costos, tabla, n_restricciones):
+        # Precios múltiples: reutilizar las candidatas que siguen siendo negativas
+        self._candidatas = self._candidatas[costos[self._candidatas] < -1e-9]
+        if len(self._candidatas):
+            return int(self._candidatas[np.argmin(costos[self._candidatas])])
+
+        n_columnas = len(costos)
+        for _ in range(0, n_columnas, self._segmento):
+            indices = (self._cursor + np.arange(self._segmento)) % n_columnas
+            self._cursor = (self._cursor + self._segmento) % n_columnas
+            negativas = indices[costos[indices] < -1e-9]
+            if len(negativas):
+                orden = np.argsort(costos[negativas])[:self.n_candidatas]
+                self._candidatas = negativas[orden]
+                return int(self._candidatas[0])
+        return int(np.argmin(costos))
+
+class Devex(Dantzig):
+    """
+    Regla Devex de Forrest y Goldfarb: maximiza d_j^2 / w_j con pesos de
+    referencia aproximados que se actualizan con la fila pivote.
+    """
+    nombre = 'devex'
+
+    def reiniciar(self, tabla, n_restricciones):
+        self._pesos = np.ones(tabla.shape[1] - 1)
+
+    def elegir(self, costos, tabla, n_restricciones):
+        puntuacion = np.where(costos < 0, costos ** 2 / self._pesos, 0.0)
+        return int(np.argmax(puntuacion))
+
+    def pivote(self, tabla, fila_pivote, col_pivote, base):
+        fila = tabla[fila_pivote, :-1]
+        alfa = fila[col_pivote]
+        peso_entrante = self._pesos[col_pivote]
+        self._pesos = np.maximum(self._pesos, (fila / alfa) ** 2 * peso_entrante)
+        self._pesos[base[fila_pivote]] = max(peso_entrante / alfa ** 2, 1.0)
+        self._pesos[col_pivote] = 1.0
+
+class MaximaPendiente(Dantzig):
+    """
+    Máxima pendiente exacta: maximiza d_j^2 / (1 + ||B^-1 a_j||^2). En la
+    tabla las columnas B^-1 a_j son explícitas, así que las normas salen
+    de la propia tabla.
+    """
+    nombre = 'maxima_pendiente'
+
+    def elegir(self, costos, tabla, n_restricciones):
+        pesos = 1.0 + np.einsum('ij,ij->j', tabla[:n_restricciones, :-1], tabla[:n_restricciones, :-1])
+        puntuacion = np.where(costos < 0, costos ** 2 / pesos, 0.0)
+        return int(np.argmax(puntuacion))
+
+class Bland(Dantzig):
+    """
+    Regla de Bland: entra la primera columna con costo reducido negativo.
+    Junto con el desempate por menor índice en el cociente evita los ciclos.
+    """
+    nombre = 'bland'
+
+    def elegir(self, costos, tabla, n_restricciones):
+        return int(np.argmax(costos < -1e-9))
+
+REGLAS = {
+    'dantzig': Dantzig,
+    'parcial': Parcial,
+    'devex': Devex,
+    'maxima_pendiente': MaximaPendiente,
+    'bland': Bland,
+}
+
+class EstadisticasPrecios:
+    """
+    Acumula, por regla, problemas resueltos, iteraciones, tiempo y pivotes
+    degenerados para comparar reglas en una familia de modelos.
+    """
+    def __init__(self):
+        self.datos = {}
+
+    def _entrada(self, regla):
+        return self.datos.setdefault(regla, {'problemas': 0, 'iteraciones': 0, 'tiempo': 0.0,
+                                             'degenerados': 0, 'cambios_a_bland': 0})
+
+    def registrar(self, regla, iteraciones, tiempo, degenerados=0, cambios_a_bland=0):
+        entrada = self._entrada(regla)
+        entrada['iteraciones'] += iteraciones
+        entrada['tiempo'] += tiempo
+        entrada['degenerados'] += degenerados
+        entrada['cambios_a_bland'] += cambios_a_bland
+
+    def registrar_problema(self, regla):
+        self._entrada(regla)['problemas'] += 1
+
+    def resumen(self):
+        """
+        Iteraciones y tiempo medios por problema para cada regla.
+        """
+        return {regla: {'iteraciones_por_problema': d['iteraciones'] / max(d['problemas'], 1),
+                        'tiempo_por_problema': d['tiempo'] / max(d['problemas'], 1), **d}
+                for regla, d in self.datos.items()}
+
+# Estadísticas por defecto de todas las resoluciones con la tabla
+estadisticas_globales = EstadisticasPrecios()
+
+class SelectorPrecios:
+    """
+    Aplica la regla elegida y pasa a Bland cuando se encadenan
+    `umbral_degeneracion` pivotes degenerados; al primer pivote que mejora
+    el objetivo vuelve a la regla original.
+    """
+    def __init__(self, regla='dantzig', umbral_degeneracion=50, estadisticas=None, tol=1e-9):
+        if regla not in REGLAS:
+            raise ValueError(f"Regla de precios desconocida: {regla}")
+        self.regla = REGLAS[regla]()
+        self.bland = Bland()
+        self.umbral_degeneracion = umbral_degeneracion
+        self.estadisticas = estadisticas_globales if estadisticas is None else estadisticas
+        self.tol = tol
+        self.en_bland = False
+        self._degenerados_seguidos = 0
+        self.estadisticas.registrar_problema(self.regla.nombre)
+
+    @property
+    def activa(self):
+        return self.bland if self.en_bland else self.regla
+
+    def reiniciar(self, tabla, n_restricciones):
+        self.regla.reiniciar(tabla, n_restricciones)
+        self.en_bland = False
+        self._degenerados_seguidos = 0
+
+    def columna(self, costos, tabla, n_restricciones):
+        self._inicio = perf_counter()
+        return self.activa.elegir(costos, tabla, n_restricciones)
+
+    def pivote(self, tabla, fila_pivote, col_pivote, base):
+        """
+        Se llama antes de pivotar: actualiza los pesos de la regla y detecta
+        los atascos por degeneración.
+        """
+        self.regla.pivote(tabla, fila_pivote, col_pivote, base)
+        self._activa = self.activa.nombre
+        self._degenerado = abs(tabla[fila_pivote, -1]) <= self.tol
+        self._cambio = 0
+        if self._degenerado:
+            self._degenerados_seguidos += 1
+            if not self.en_bland and self._degenerados_seguidos >= self.umbral_degeneracion:
+                self.en_bland = True
+                self._cambio = 1
+        else:
+            self._degenerados_seguidos = 0
+            self.en_bland = False
+
+    def fin_iteracion(self):
+        """
+        Anota la iteración completa (precio, cociente y pivote) en las estadísticas.
+        """
+        self.estadisticas.registrar(self._activa, 1, perf_counter() - self._inicio,
+                                    int(self._degenerado), self._cambio)
@@ -0,0 +1,301 @@
+import logging
+import numpy as np
+from time import perf_counter
+
+from problema import Problema
+from vertices import matrices_restricciones
+
+registro = logging.getLogger(__name__)
+
+def _actividad(G, l, u):
+    """
+    Cotas mínima y máxima de G x con l <= x <= u (u puede ser infinito).
+    """
+    with np.errstate(invalid='ignore'):
+        minimo = np.where(G > 0, G * l, np.where(G < 0, G * u, 0.0)).sum(axis=1)
+        maximo = np.where(G > 0, G * u, np.where(G < 0, G * l, 0.0)).sum(axis=1)
+    return minimo, maximo
+
+class _Presolve:
+    """
+    Estado del presolve: filas en forma G x <= h (las '>=' se cambian de signo)
+    o G x = h, cotas l <= x <= u y pila de eliminaciones para el postsolve.
+    """
+    def __init__(self, objetivo, restricciones, tol):
+        self.tol = tol
+        self.n_variables = len(objetivo['coeff'])
+        coeff = np.array(objetivo['coeff'], dtype=float)
+        self.c = coeff if objetivo['type'] == 'max' else -coeff
+        A, b, sentidos = matrices_restricciones(restricciones, self.n_variables)
+        signo = np.where(sentidos == -1, -1.0, 1.0)
+        self.G = A * signo[:, None]
+        self.h = b * signo
+        self.igualdad = sentidos == 0
+        self.filas = np.ones(len(b), dtype=bool)
+        self.columnas = np.ones(self.n_variables, dtype=bool)
+        self.l = np.zeros(self.n_variables)
+        self.u = np.full(self.n_variables, np.inf)
+        self.fijas = np.full(self.n_variables, np.nan)
+        self.pila = []
+        self.conteo = {}
+
+    def _anotar(self, reduccion, cantidad):
+        if cantidad:
+            self.conteo[reduccion] = self.conteo.get(reduccion, 0) + int(cantidad)
+
+    def _infactible(self):
+        raise ValueError("El problema no tiene solución factible.")
+
+    def _activas(self):
+        return np.where(self.filas)[0]
+
+    def filas_vacias(self):
+        G = self.G[self.filas][:, self.columnas]
+        vacias = self._activas()[~np.any(np.abs(G) > self.tol, axis=1)]
+        h = self.h[vacias]
+        if np.any(h[~self.igualdad[vacias]] < -self.tol) or np.any(np.abs(h[self.igualdad[vacias]]) > self.tol):
+            self._infactible()
+        self.filas[vacias] = False
+        self._anotar('filas vacías', len(vacias))
+        return len(vacias)
+
+    def filas_unitarias(self):
+        """
+        Las filas con una sola variable pasan a ser cotas de esa variable.
+        """
+        cambios = 0
+        for i in self._activas():
+            no_nulos = np.where(self.columnas & (np.abs(self.G[i]) > self.tol))[0]
+            if len(no_nulos) != 1:
+                continue
+            j = no_nulos[0]
+            cota = self.h[i] / self.G[i, j]
+            if self.igualdad[i]:
+                self.l[j] = max(self.l[j], cota)
+                self.u[j] = min(self.u[j], cota)
+            elif self.G[i, j] > 0:
+                self.u[j] = min(self.u[j], cota)
+            else:
+                self.l[j] = max(self.l[j], cota)
+            self.filas[i] = False
+            cambios += 1
+        if np.any(self.l > self.u + self.tol * (1.0 + np.abs(self.l))):
+            self._infactible()
+        self._anotar('filas unitarias', cambios)
+        return cambios
+
+    def _fijar(self, j, valor):
+        self.fijas[j] = valor
+        self.h -= self.G[:, j] * valor
+        self.columnas[j] = False
+
+    def columnas_fijas(self):
+        fijas = np.where(self.columnas & (self.u - self.l <= self.tol * (1.0 + np.abs(self.l))))[0]
+        for j in fijas:
+            self._fijar(j, self.l[j])
+        self._anotar('columnas fijas', len(fijas))
+        return len(fijas)
+
+    def columnas_dominadas(self):
+        """
+        Si subir x_j no mejora el objetivo ni ayuda a ninguna fila, x_j = l_j;
+        si siempre ayuda y tiene cota superior, x_j = u_j.
+        """
+        G = self.G[self.filas]
+        igualdad = self.igualdad[self.filas]
+        cambios = 0
+        for j in np.where(self.columnas)[0]:
+            columna = G[:, j]
+            if np.any(np.abs(columna[igualdad]) > self.tol):
+                continue
+            if self.c[j] <= 0 and np.all(columna >= -self.tol):
+                self._fijar(j, self.l[j])
+            elif self.c[j] >= 0 and np.all(columna <= self.tol) and np.isfinite(self.u[j]):
+                self._fijar(j, self.u[j])
+            else:
+                continue
+            cambios += 1
+        self._anotar('columnas dominadas', cambios)
+        return cambios
+
+    def columnas_holgura(self):
+        """
+        Una variable sin costo ni cota superior que solo ayuda a sus filas
+        de desigualdad actúa como holgura: se quitan esas filas y en el
+        postsolve se le da el menor valor que las cumple.
+        """
+        cambios = 0
+        for j in np.where(self.columnas & (np.abs(self.c) <= self.tol) & np.isinf(self.u))[0]:
+            activas = self._activas()
+            columna = self.G[activas, j]
+            usadas = activas[np.abs(columna) > self.tol]
+            if not len(usadas) or np.any(self.igualdad[usadas]) or np.any(self.G[usadas, j] > 0):
+                continue
+            # Solo las columnas libres: las ya fijadas están descontadas de h
+            self.pila.append((j, self.G[usadas] * self.columnas, self.h[usadas].copy()))
+            self.filas[usadas] = False
+            self.columnas[j] = False
+            cambios += 1
+        self._anotar('columnas holgura', cambios)
+        return cambios
+
+    def filas_duplicadas(self):
+        """
+        Filas paralelas: entre desigualdades con la misma dirección se queda la
+        más restrictiva; las desigualdades implicadas por una igualdad sobran.
+        """
+        activas = self._activas()
+        G = self.G[activas][:, self.columnas]
+        escala = np.abs(G).max(axis=1)
+        Gn = G / escala[:, None]
+        hn = self.h[activas] / escala
+        igualdad = self.igualdad[activas]
+        # Las igualdades se orientan con el primer coeficiente no nulo positivo
+        primero = Gn[np.arange(len(Gn)), np.argmax(np.abs(Gn) > self.tol, axis=1)]
+        orientacion = np.where(igualdad & (primero < 0), -1.0, 1.0)
+        Gn *= orientacion[:, None]
+        hn *= orientacion
+        claves = np.round(Gn / self.tol).astype(np.int64)
+
+        eliminar = np.zeros(len(activas), dtype=bool)
+        igualdades, mejores = {}, {}
+        for k in np.where(igualdad)[0]:
+            clave = claves[k].tobytes()
+            if clave in igualdades:
+                if abs(hn[igualdades[clave]] - hn[k]) > self.tol * (1.0 + abs(hn[k])):
+                    self._infactible()
+                eliminar[k] = True
+            else:
+                igualdades[clave] = k
+        for k in np.where(~igualdad)[0]:
+            clave = claves[k].tobytes()
+            for signo in (1, -1):
+                e = igualdades.get((signo * claves[k]).tobytes())
+                if e is not None:
+                    if hn[k] < signo * hn[e] - self.tol * (1.0 + abs(hn[k])):
+                        self._infactible()
+                    eliminar[k] = True
+            if eliminar[k]:
+                continue
+            if clave in mejores:
+                otra = mejores[clave]
+                if hn[k] < hn[otra]:
+                    eliminar[otra] = True
+                    mejores[clave] = k
+                else:
+                    eliminar[k] = True
+            else:
+                mejores[clave] = k
+        self.filas[activas[eliminar]] = False
+        self._anotar('filas duplicadas', eliminar.sum())
+        return int(eliminar.sum())
+
+    def filas_redundantes(self):
+        """
+        Quita las desigualdades que se cumplen para cualquier x entre sus
+        cotas y detecta las filas imposibles de cumplir.
+        """
+        activas = self._activas()
+        G = self.G[activas][:, self.columnas]
+        minimo, maximo = _actividad(G, self.l[self.columnas], self.u[self.columnas])
+        h = self.h[activas]
+        holgura = self.tol * (1.0 + np.abs(h))
+        igualdad = self.igualdad[activas]
+        if np.any(minimo > h + holgura) or np.any(igualdad & (maximo < h - holgura)):
+            self._infactible()
+        redundantes = ~igualdad & (maximo <= h + holgura)
+        self.filas[activas[redundantes]] = False
+        self._anotar('filas redundantes', redundantes.sum())
+        return int(redundantes.sum())
+
+    def filas_dominadas(self):
+        """
+        Con x >= 0, g_i x <= h_i sobra si existe otra fila con g_k >= g_i
+        componente a componente y h_k <= h_i (tras normalizar cada fila).
+        """
+        activas = self._activas()
+        desigualdades = activas[~self.igualdad[activas]]
+        G = self.G[desigualdades][:, self.columnas]
+        escala = np.abs(G).max(axis=1)
+        G = G / escala[:, None]
+        h = self.h[desigualdades] / escala
+        vivas = np.ones(len(desigualdades), dtype=bool)
+        for i in range(len(desigualdades)):
+            dominantes = vivas & np.all(G >= G[i] - self.tol, axis=1) & (h <= h[i] + self.tol)
+            dominantes[i] = False
+            if np.any(dominantes):
+                vivas[i] = False
+        self.filas[desigualdades[~vivas]] = False
+        self._anotar('filas dominadas', (~vivas).sum())
+        return int((~vivas).sum())
+
+def presolve(objetivo, restricciones, tol=1e-9, max_pasadas=10, conservar_region=False):
+    """
+    Reduce el problema antes de resolverlo: filas vacías, duplicadas,
+    dominadas o redundantes por cotas, filas de una variable (pasan a
+    cotas), columnas fijas, dominadas y de holgura. Repite las reducciones
+    hasta que no cambia nada. Las columnas dominadas y de holgura conservan
+    el óptimo pero no la región; con `conservar_region` se omiten para que
+    los vértices del problema reducido sean los de la región original.
+    Devuelve un diccionario con el problema
+    reducido ('objetivo', 'restricciones'), los datos para `postsolve`, el
+    recuento de cada reducción ('conteo') y el tiempo empleado.
+    """
+    inicio = perf_counter()
+    estado = _Presolve(objetivo, restricciones, tol)
+    for _ in range(max_pasadas):
+        cambios = estado.filas_unitarias() + estado.columnas_fijas()
+        if not conservar_region:
+            cambios += estado.columnas_dominadas() + estado.columnas_holgura()
+        cambios += estado.filas_vacias()
+        if estado.filas.any() and estado.columnas.any():
+            cambios += estado.filas_duplicadas() + estado.filas_redundantes() + estado.filas_dominadas()
+        if not cambios:
+            break
+
+    # Problema reducido: filas restantes más las cotas que no son x >= 0
+    columnas = np.where(estado.columnas)[0]
+    activas = estado._activas()
+    identidad = np.eye(len(columnas))
+    inferiores = estado.l[columnas] > tol
+    superiores = np.isfinite(estado.u[columnas])
+    reducidas = Problema(
+        np.vstack((estado.G[activas][:, columnas], identidad[inferiores], identidad[superiores])),
+        np.concatenate((estado.h[activas], estado.l[columnas][inferiores], estado.u[columnas][superiores])),
+        np.concatenate((np.where(estado.igualdad[activas], 0, 1), np.full(inferiores.sum(), -1),
+                        np.ones(superiores.sum()))))
+
+    tiempo = perf_counter() - inicio
+    for reduccion, cantidad in estado.conteo.items():
+        registro.info("presolve: %s: %d", reduccion, cantidad)
+    registro.info("presolve: %d x %d -> %d x %d en %.4f s", len(restricciones), estado.n_variables,
+                  len(reducidas), len(columnas), tiempo)
+
+    return {
+        'objetivo': {'type': objetivo['type'], 'coeff': [objetivo['coeff'][j] for j in columnas]},
+        'restricciones': reducidas,
+        'columnas': columnas,
+        'fijas': estado.fijas,
+        'cotas_inferiores': estado.l,
+        'pila': estado.pila,
+        'n_variables': estado.n_variables,
+        'conteo': estado.conteo,
+        'tiempo': tiempo,
+    }
+
+def postsolve(reducido, puntos):
+    """
+    Lleva puntos (k, n') del problema reducido al espacio original (k, n):
+    coloca las variables fijas y deshace en orden inverso las columnas de
+    holgura eliminadas.
+    """
+    columnas = reducido['columnas']
+    puntos = np.asarray(puntos, dtype=float).reshape(len(puntos), len(columnas))
+    x = np.tile(reducido['fijas'], (len(puntos), 1))
+    x[:, columnas] = puntos
+    for j, G, h in reversed(reducido['pila']):
+        # g x <= h con g_j < 0: x_j >= (h - g_resto x_resto) / g_j
+        resto = np.delete(np.arange(x.shape[1]), j)
+        requerido = (h[None, :] - x[:, resto] @ G[:, resto].T) / G[:, j][None, :]
+        x[:, j] = np.maximum(reducido['cotas_inferiores'][j], requerido.max(axis=1))
+    return x
@@ -0,0 +1,158 @@
+import numpy as np
+
+# Códigos de sentido de las restricciones
+SENTIDOS = {'<=': 1, '>=': -1, '=': 0}
+INECUACIONES = {1: '<=', -1: '>=', 0: '='}
+
+def fila_densa(a, n_variables):
+    """
+    Coeficientes de una restricción como vector denso. `a` puede ser una
+    lista densa o un diccionario disperso {índice de variable: coeficiente}.
+    """
+    if isinstance(a, dict):
+        fila = np.zeros(n_variables)
+        if a:
+            fila[list(a.keys())] = list(a.values())
+        return fila
+    return np.asarray(a, dtype=float)
+
+def numero_variables(restricciones):
+    """
+    Número de variables deducido de las filas: la longitud de una fila densa
+    o, si todas son dispersas, el mayor índice más uno.
+    """
+    if isinstance(restricciones, Problema):
+        return restricciones.n_variables
+    for r in restricciones:
+        if not isinstance(r['a'], dict):
+            return len(r['a'])
+    return max((max(r['a'], default=-1) + 1 for r in restricciones), default=0)
+
+class Problema:
+    """
+    Restricciones A x (<=, >=, =) b guardadas en arrays contiguos de solo
+    lectura: la matriz A (m, n), el lado derecho b (m,) y los sentidos como
+    códigos int8 (1 para '<=', -1 para '>=' y 0 para '='). A es densa o, si
+    las filas llegan como diccionarios {índice: coeficiente}, una
+    MatrizDispersa, y no se densifica hasta que un motor lo necesita. Se
+    construye una vez, es inmutable y se puede usar como clave de
+    diccionario (dos problemas solo son iguales si A tiene el mismo
+    almacenamiento). Se comporta también como la lista de diccionarios
+    {'a', 'c', 'inecuacion'} de antes.
+    """
+    __slots__ = ('A', 'b', 'sentidos', '_hash')
+
+    def __init__(self, A, b, sentidos):
+        # + 0.0 cambia -0.0 por 0.0 para que el hash sea coherente con la igualdad
+        from dispersa import MatrizDispersa
+        b = np.array(b, dtype=float).reshape(-1) + 0.0
+        if isinstance(A, MatrizDispersa):
+            # Los ceros (y -0.0) ya se descartan al construirla
+            for array in (A.datos, A.indices, A.punteros):
+                array.setflags(write=False)
+        else:
+            A = np.array(A, dtype=float, ndmin=2) + 0.0
+            A.setflags(write=False)
+        sentidos = np.asarray(sentidos)
+        if sentidos.dtype.kind in 'UO':
+            sentidos = [SENTIDOS[s] for s in sentidos]
+        sentidos = np.array(sentidos, dtype=np.int8).reshape(-1)
+        if not A.shape[0] == len(b) == len(sentidos):
+            raise ValueError("A, b y los sentidos deben tener el mismo número de filas.")
+        for array in (b, sentidos):
+            array.setflags(write=False)
+        object.__setattr__(self, 'A', A)
+        object.__setattr__(self, 'b', b)
+        object.__setattr__(self, 'sentidos', sentidos)
+        object.__setattr__(self, '_hash', None)
+
+    @classmethod
+    def desde_restricciones(cls, restricciones, n_variables=None):
+        """
+        Adaptador del formato de diccionarios: cada 'a' puede ser una lista
+        densa o un diccionario {índice: coeficiente}. Si alguna fila es un
+        diccionario, A se guarda dispersa.
+        """
+        from dispersa import MatrizDispersa
+        if n_variables is None:
+            n_variables = numero_variables(restricciones)
+        if any(isinstance(r['a'], dict) for r in restricciones):
+            A = MatrizDispersa.desde_restricciones(restricciones, n_variables)
+        else:
+            A = np.array([fila_densa(r['a'], n_variables) for r in restricciones],
+                         dtype=float).reshape(len(restricciones), n_variables)
+        b = [r['c'] for r in restricciones]
+        sentidos = [SENTIDOS[r['inecuacion']] for r in restricciones]
+        return cls(A, b, sentidos)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Problema es inmutable.")
+
+    def __reduce__(self):
+        return Problema, (self.A, self.b, self.sentidos)
+
+    @property
+    def n_variables(self):
+        return self.A.shape[1]
+
+    @property
+    def dispersa(self):
+        return not isinstance(self.A, np.ndarray)
+
+    def con_lado_derecho(self, b):
+        """
+        Mismo problema con otro lado derecho.
+        """
+        return Problema(self.A, b, self.sentidos)
+
+    def __len__(self):
+        return len(self.b)
+
+    def __getitem__(self, i):
+        return {'a': [float(v) for v in self.A[i]], 'c': float(self.b[i]),
+                'inecuacion': INECUACIONES[int(self.sentidos[i])]}
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __add__(self, otro):
+        from dispersa import apilar
+        otro = como_problema(otro, self.n_variables)
+        return Problema(apilar(self.A, otro.A), np.concatenate((self.b, otro.b)),
+                        np.concatenate((self.sentidos, otro.sentidos)))
+
+    def __radd__(self, otro):
+        return como_problema(otro, self.n_variables) + self
+
+    def __eq__(self, otro):
+        if not isinstance(otro, Problema):
+            return NotImplemented
+        if self.dispersa != otro.dispersa or self.A.shape != otro.A.shape:
+            return False
+        iguales = all(np.array_equal(x, y) for x, y in zip(self._arrays_A(), otro._arrays_A()))
+        return iguales and np.array_equal(self.b, otro.b) and np.array_equal(self.sentidos, otro.sentidos)
+
+    def _arrays_A(self):
+        if self.dispersa:
+            return self.A.datos, self.A.indices, self.A.punteros
+        return self.A,
+
+    def __hash__(self):
+        if self._hash is None:
+            bytes_A = tuple(array.tobytes() for array in self._arrays_A())
+            object.__setattr__(self, '_hash', hash((self.A.shape, bytes_A, self.b.tobytes(),
+                                                    self.sentidos.tobytes())))
+        return self._hash
+
+    def __repr__(self):
+        almacenamiento = ", disperso" if self.dispersa else ""
+        return f"Problema({len(self)} restricciones, {self.n_variables} variables{almacenamiento})"
+
+def como_problema(restricciones, n_variables=None):
+    """
+    Devuelve `restricciones` como Problema, convirtiendo la lista de
+    diccionarios si hace falta.
+    """
+    if isinstance(restricciones, Problema):
+        return restricciones
+    return Problema.desde_restricciones(restricciones, n_variables)
@@ -0,0 +1,155 @@
+import numpy as np
+from functools import partial
+
+from dispersa import densa
+from forma_estandar import forma_estandar, tabla_desde_forma
+from historial import HistorialSimplex
+from simplex_revisado import (FactorizacionBase, _expulsar_artificiales, _matriz_base, resolver_forma_estandar,
+                              simplex_revisado)
+
+def _matriz_densa(fe):
+    """
+    Matriz [A | E] densa de la forma estándar sin las columnas artificiales.
+    """
+    A = densa(fe['A'])
+    m, n = A.shape
+    no_artificiales = np.setdiff1d(np.arange(len(fe['filas_extra'])), fe['artificiales'] - n)
+    E = np.zeros((m, len(no_artificiales)))
+    E[fe['filas_extra'][no_artificiales], np.arange(len(no_artificiales))] = fe['signos_extra'][no_artificiales]
+    return np.hstack((A, E)), np.concatenate((np.arange(n), n + no_artificiales))
+
+def _paso_maximo(v, dv):
+    """
+    Mayor paso en [0, 1] que mantiene v + paso * dv >= 0.
+    """
+    negativos = dv < 0
+    if not np.any(negativos):
+        return 1.0
+    return min(1.0, float(np.min(-v[negativos] / dv[negativos])))
+
+def mehrotra(A, b, c, max_iteraciones=100, tol=1e-8, regularizacion=1e-12):
+    """
+    Método primal-dual predictor-corrector de Mehrotra para
+    min c^T x, A x = b, x >= 0. Cada iteración resuelve las ecuaciones
+    normales A D A^T dy = r con una factorización de Cholesky.
+    Devuelve x, y, s y el número de iteraciones.
+    """
+    m, N = A.shape
+    identidad = regularizacion * np.eye(m)
+
+    # Punto inicial de Mehrotra
+    L = np.linalg.cholesky(A @ A.T + identidad)
+    resolver = lambda r: np.linalg.solve(L.T, np.linalg.solve(L, r))
+    x = A.T @ resolver(b)
+    y = resolver(A @ c)
+    s = c - A.T @ y
+    x += max(-1.5 * x.min(), 0.0) if N else 0.0
+    s += max(-1.5 * s.min(), 0.0) if N else 0.0
+    xs = x @ s
+    x += 0.5 * xs / max(s.sum(), 1e-300)
+    s += 0.5 * xs / max(x.sum(), 1e-300)
+    x, s = np.maximum(x, 1e-8), np.maximum(s, 1e-8)
+
+    norma_b, norma_c = 1.0 + np.linalg.norm(b), 1.0 + np.linalg.norm(c)
+    for iteracion in range(max_iteraciones):
+        rp = b - A @ x
+        rd = c - A.T @ y - s
+        mu = x @ s / N
+        primal, dual = c @ x, b @ y
+        if (np.linalg.norm(rp) / norma_b < tol and np.linalg.norm(rd) / norma_c < tol
+                and abs(primal - dual) / (1.0 + abs(primal)) < tol):
+            return x, y, s, iteracion
+        if not np.isfinite(mu) or np.abs(x).max() > 1e12 or np.abs(y).max() > 1e12:
+            break
+
+        D = x / s
+        L = np.linalg.cholesky((A * D) @ A.T + identidad)
+
+        def direccion(rc):
+            # S dx + X ds = rc, A dx = rp, A^T dy + ds = rd
+            dy = np.linalg.solve(L.T, np.linalg.solve(L, rp - A @ ((rc - x * rd) / s)))
+            dx = D * (A.T @ dy) + (rc - x * rd) / s
+            ds = rd - A.T @ dy
+            return dx, dy, ds
+
+        # Predictor (dirección afín) y corrector con centrado
+        dx, dy, ds = direccion(-x * s)
+        paso_p, paso_d = _paso_maximo(x, dx), _paso_maximo(s, ds)
+        mu_afin = (x + paso_p * dx) @ (s + paso_d * ds) / N
+        sigma = (mu_afin / mu) ** 3
+        dx, dy, ds = direccion(-x * s - dx * ds + sigma * mu)
+
+        paso_p = min(1.0, 0.995 * _paso_maximo(x, dx))
+        paso_d = min(1.0, 0.995 * _paso_maximo(s, ds))
+        x += paso_p * dx
+        y += paso_d * dy
+        s += paso_d * ds
+    raise ValueError("El método de punto interior no convergió.")
+
+def crossover(fe, x, tol=1e-9):
+    """
+    Pasa de la solución interior a un vértice: toma como base las columnas
+    linealmente independientes de mayor valor en x (completando con
+    artificiales en cero) y termina con el simplex revisado.
+    Devuelve el vector x completo de la forma estándar.
+    """
+    A, b = fe['A'], fe['b']
+    m, n = A.shape
+    filas_extra, signos_extra = fe['filas_extra'], fe['signos_extra']
+    artificiales = fe['artificiales']
+    n_total = n + len(filas_extra)
+    es_artificial = np.zeros(n_total, dtype=bool)
+    es_artificial[artificiales] = True
+
+    # Selección voraz con Gram-Schmidt de columnas independientes
+    base, ortonormal = [], np.zeros((m, 0))
+    completa = np.hstack((densa(A), np.zeros((m, len(filas_extra)))))
+    completa[filas_extra, n + np.arange(len(filas_extra))] = signos_extra
+    candidatas = [j for j in np.argsort(-x) if not es_artificial[j]] + list(artificiales)
+    for j in candidatas:
+        columna = completa[:, j]
+        residuo = columna - ortonormal @ (ortonormal.T @ columna)
+        residuo -= ortonormal @ (ortonormal.T @ residuo)  # Reortogonalizar
+        if np.linalg.norm(residuo) > 1e-7 * (1.0 + np.linalg.norm(columna)):
+            base.append(int(j))
+            ortonormal = np.column_stack((ortonormal, residuo / np.linalg.norm(residuo)))
+            if len(base) == m:
+                break
+
+    # Reordenar la base por filas y comprobar su factibilidad primal
+    fact = FactorizacionBase(_matriz_base(A, filas_extra, signos_extra, base))
+    x_base = fact.ftran(b)
+    if len(base) < m or np.any(x_base < -1e-7 * (1.0 + np.abs(x_base))) \
+            or np.any(x_base[es_artificial[base]] > 1e-7):
+        x_completo, _, _ = resolver_forma_estandar(fe)
+        return x_completo
+    base, _ = _expulsar_artificiales(A, filas_extra, signos_extra, base, artificiales)
+    x_completo, _, _ = simplex_revisado(A, b, fe['c'], filas_extra, signos_extra, base, excluidas=artificiales)
+    return x_completo
+
+def resolver_punto_interior(objetivo, restricciones, con_crossover=True, decimales=2):
+    """
+    Resuelve el problema con el método de punto interior. Con
+    `con_crossover` la solución se lleva a un vértice (solución básica). Si
+    el método no converge (problema infactible o no acotado) el estado lo
+    decide el simplex revisado. El historial solo tiene la tabla inicial.
+    """
+    fe = forma_estandar(objetivo, restricciones)
+    matriz, columnas = _matriz_densa(fe)
+    try:
+        x_interior, _, _, _ = mehrotra(matriz, fe['b'], fe['c'][columnas])
+        x = np.zeros(len(fe['c']))
+        x[columnas] = x_interior
+        if con_crossover:
+            x = crossover(fe, x)
+    except (ValueError, np.linalg.LinAlgError):
+        x, _, _ = resolver_forma_estandar(fe)
+
+    historial = HistorialSimplex(constructor=partial(tabla_desde_forma, fe))
+    solucion = x[:fe['n_variables']]
+    valor_optimo = np.dot(objetivo['coeff'], solucion)
+    if decimales is None:
+        return [float(v) for v in solucion], float(valor_optimo), historial
+    solucion = [float(round(v, decimales)) + 0.0 for v in solucion]  # Redondear (2 decimales por defecto)
+    valor_optimo = float(round(valor_optimo, decimales))  # Redondear (2 decimales por defecto)
+    return solucion, valor_optimo, historial
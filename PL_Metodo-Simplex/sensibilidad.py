@@ -0,0 +1,89 @@
+import numpy as np
+
+from dispersa import densa
+from simplex_revisado import _matriz_base
+
+def analisis_sensibilidad(fe, base, tol=1e-9):
+    """
+    Análisis de sensibilidad a partir de la forma estándar `fe` y de la base
+    óptima (índice de la variable básica de cada fila), sin volver a resolver.
+    Todo se expresa en el problema original (sentido y signos de las filas):
+    'precios_sombra' (m,) es la variación del valor óptimo por unidad de
+    lado derecho, 'costos_reducidos' (n,) la de cada variable de decisión,
+    'rango_lado_derecho' (m, 2) y 'rango_costos' (n, 2) los intervalos en los
+    que cada b_i o cada coeficiente puede moverse (uno a la vez) sin que la
+    base deje de ser óptima.
+    """
+    A, b, c = densa(fe['A']), fe['b'], fe['c']
+    filas_extra, signos_extra = fe['filas_extra'], fe['signos_extra']
+    n, signos_fila = fe['n_variables'], fe['signos_fila']
+    base = np.asarray(base, dtype=int)
+    # c = -coeff en maximización: -1 si el problema es de máximo, +1 si es de mínimo
+    sentido = -1.0 if fe['tipo'] == 'max' else 1.0
+
+    M = np.hstack((A, _matriz_base(A, filas_extra, signos_extra, range(n, len(c)))))
+    B = _matriz_base(A, filas_extra, signos_extra, base)
+    y = np.linalg.solve(B.T, c[base])
+    d = c - M.T @ y
+    d[base] = 0.0
+    B_inv = np.linalg.inv(B)
+    x_base = B_inv @ b
+    tabla = B_inv @ M
+
+    es_artificial = np.zeros(len(c), dtype=bool)
+    es_artificial[fe['artificiales']] = True
+    no_basicas = np.setdiff1d(np.where(~es_artificial)[0], base)
+
+    # Lado derecho: x_B + s_i Δ B^-1 e_i >= 0 (las artificiales básicas deben seguir en cero)
+    coeff_b = signos_fila * b
+    rango_b = np.empty((len(b), 2))
+    for i in range(len(b)):
+        w = signos_fila[i] * B_inv[:, i]
+        artificial = es_artificial[base] & (np.abs(w) > tol)
+        if artificial.any():
+            rango_b[i] = coeff_b[i], coeff_b[i]
+            continue
+        subir, bajar = w < -tol, w > tol
+        delta_max = np.min(-x_base[subir] / w[subir]) if subir.any() else np.inf
+        delta_min = np.max(-x_base[bajar] / w[bajar]) if bajar.any() else -np.inf
+        rango_b[i] = coeff_b[i] + delta_min, coeff_b[i] + delta_max
+
+    # Costos: d_k - δ α_rk >= 0 para las no básicas si j es básica en la fila r; d_j + δ >= 0 si no
+    coeff = sentido * c[:n]
+    rango_c = np.empty((n, 2))
+    fila_de = {int(j): r for r, j in enumerate(base)}
+    for j in range(n):
+        if j in fila_de:
+            alfa = tabla[fila_de[j], no_basicas]
+            dk = d[no_basicas]
+            pos, neg = alfa > tol, alfa < -tol
+            delta_max = np.min(dk[pos] / alfa[pos]) if pos.any() else np.inf
+            delta_min = np.max(dk[neg] / alfa[neg]) if neg.any() else -np.inf
+        else:
+            delta_min, delta_max = -d[j], np.inf
+        if sentido < 0:
+            delta_min, delta_max = -delta_max, -delta_min
+        rango_c[j] = coeff[j] + delta_min, coeff[j] + delta_max
+
+    return {
+        'precios_sombra': sentido * signos_fila * y + 0.0,
+        'costos_reducidos': sentido * d[:n] + 0.0,
+        'rango_lado_derecho': rango_b,
+        'rango_costos': rango_c,
+        'base': [int(j) for j in base],
+    }
+
+def _intervalo(rango):
+    return f"[{rango[0]:.2f}, {rango[1]:.2f}]".replace('inf', '∞')
+
+def formatear_sensibilidad(sensibilidad):
+    """
+    Texto con los precios sombra, costos reducidos y rangos para la interfaz.
+    """
+    lineas = ["Análisis de sensibilidad", "Restricción  Precio sombra  Rango del lado derecho"]
+    for i, (precio, rango) in enumerate(zip(sensibilidad['precios_sombra'], sensibilidad['rango_lado_derecho'])):
+        lineas.append(f"R{i + 1:<11}{precio:>13.2f}  {_intervalo(rango)}")
+    lineas.append("Variable  Costo reducido  Rango del coeficiente")
+    for j, (costo, rango) in enumerate(zip(sensibilidad['costos_reducidos'], sensibilidad['rango_costos'])):
+        lineas.append(f"x{j + 1:<8}{costo:>14.2f}  {_intervalo(rango)}")
+    return "\n".join(lineas)
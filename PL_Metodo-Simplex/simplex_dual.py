@@ -0,0 +1,118 @@
+import numpy as np
+from functools import partial
+
+from forma_estandar import forma_estandar, tabla_desde_forma
+from historial import HistorialSimplex
+from vertices import matrices_restricciones, _desigualdades
+
+def problema_en_filas(objetivo, restricciones, cota=None):
+    """
+    Reescribe el problema como max c x sujeto a G x <= h, sin columnas de
+    holgura. Tras las restricciones van las filas -x <= 0 y, al final, una
+    caja x <= cota que da una base dual factible de partida.
+    'origen' guarda la restricción original de cada fila (-1 para x >= 0 y
+    -2 para la caja).
+    """
+    n_variables = len(objetivo['coeff'])
+    A, b, sentidos = matrices_restricciones(restricciones, n_variables)
+    G, h, origen = _desigualdades(A, b, sentidos)
+    if cota is None:
+        cota = 1e6 * (1.0 + (np.abs(h).max() if len(h) else 0.0))
+    identidad = np.eye(n_variables)
+    c = np.array(objetivo['coeff'], dtype=float)
+    return {
+        'G': np.vstack((G, -identidad, identidad)),
+        'h': np.concatenate((h, np.zeros(n_variables), np.full(n_variables, cota))),
+        'c': c if objetivo['type'] == 'max' else -c,
+        'origen': np.concatenate((origen, np.full(n_variables, -1), np.full(n_variables, -2))),
+        'n_variables': n_variables,
+    }
+
+def base_inicial(pf):
+    """
+    Base dual factible: para cada variable, la fila de caja si c_j > 0 y la de
+    no negatividad en otro caso (c = G_B^T y con y_j = |c_j|).
+    """
+    n = pf['n_variables']
+    m = len(pf['h'])
+    return [m - n + j if pf['c'][j] > 0 else m - 2 * n + j for j in range(n)]
+
+def simplex_dual_filas(G, h, c, base, max_iteraciones=10000, tol=1e-9):
+    """
+    Simplex dual con base de filas: la base son n restricciones activas
+    (matriz n x n) en lugar de m columnas, lo que conviene cuando m >> n.
+    Parte de una base dual factible (c = G_B^T y, y >= 0) y en cada paso
+    incorpora la restricción violada de mayor peso de máxima pendiente dual
+    (exacto, calculado para todas las violadas con un único sistema) y elige
+    la fila que sale con el test de cociente de Harris.
+    Devuelve x, la base final, los multiplicadores y las iteraciones.
+    """
+    base = list(base)
+    tolerancias = tol * (1.0 + np.abs(h))
+    for iteracion in range(max_iteraciones):
+        B = G[base]
+        x = np.linalg.solve(B, h[base])
+        violacion = G @ x - h
+        violadas = np.where(violacion > tolerancias)[0]
+        y_w = np.linalg.solve(B.T, np.column_stack((c, G[violadas].T)))
+        y, W = y_w[:, 0], y_w[:, 1:]
+        if not len(violadas):
+            return x, base, y, iteracion
+
+        # Máxima pendiente dual: violación^2 / ||(B^-T g_q, 1)||^2
+        pesos = 1.0 + np.einsum('ij,ij->j', W, W)
+        k = int(np.argmax(violacion[violadas] ** 2 / pesos))
+        entra, w = int(violadas[k]), W[:, k]
+
+        # Test de Harris: cota relajada del paso y, entre las filas que la
+        # respetan, el pivote de mayor magnitud
+        positivas = w > tol
+        if not np.any(positivas):
+            raise ValueError("El problema no tiene solución factible.")
+        y = np.maximum(y, 0.0)
+        paso = np.min((y[positivas] + tol) / w[positivas])
+        candidatas = np.where(positivas & (y <= paso * w))[0]
+        sale = int(candidatas[np.argmax(w[candidatas])])
+        base[sale] = entra
+    raise ValueError("Se alcanzó el máximo de iteraciones del simplex dual.")
+
+def optimizar_filas(pf, base=None, max_iteraciones=10000, tol=1e-9):
+    """
+    Resuelve el problema en filas. Con `base` (de una resolución anterior con
+    las mismas filas) reoptimiza tras cambiar 'h' sin partir de cero.
+    Si al final alguna fila de la caja es activa con multiplicador positivo,
+    se agranda la caja y se reoptimiza; si sigue activa, el problema no está
+    acotado. Devuelve x, base, multiplicadores e iteraciones.
+    """
+    if base is None:
+        base = base_inicial(pf)
+    G, h, c = pf['G'], pf['h'].copy(), pf['c']
+    caja = pf['origen'] == -2
+    total = 0
+    for ampliacion in range(2):
+        x, base, y, iteraciones = simplex_dual_filas(G, h, c, base, max_iteraciones, tol)
+        total += iteraciones
+        if not np.any(caja[base] & (y > tol * (1.0 + np.abs(c).max()))):
+            return x, base, y, total
+        h[caja] *= 1e3
+    raise ValueError("El problema no está acotado.")
+
+def resolver_simplex_dual(objetivo, restricciones, decimales=2):
+    """
+    Resuelve el problema con el simplex dual de base de filas.
+    Devuelve la solución óptima, el valor óptimo y el historial; como el
+    método no pivota sobre la tabla, el historial solo tiene la tabla inicial.
+    Con `decimales=None` la solución no se redondea.
+    """
+    pf = problema_en_filas(objetivo, restricciones)
+    x, _, _, _ = optimizar_filas(pf)
+
+    historial = HistorialSimplex(constructor=partial(tabla_desde_forma, forma_estandar(objetivo, restricciones)))
+
+    valor_optimo = np.dot(objetivo['coeff'], x)
+    if decimales is None:
+        return [float(v) for v in x], float(valor_optimo), historial
+    solucion = [float(round(v, decimales)) + 0.0 for v in x]  # Redondear (2 decimales por defecto)
+    valor_optimo = float(round(valor_optimo, decimales))  # Redondear (2 decimales por defecto)
+
+    return solucion, valor_optimo, historial
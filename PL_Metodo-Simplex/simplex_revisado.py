@@ -0,0 +1,380 @@
+from functools import partial
+
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse import csc_matrix, issparse
+from scipy.sparse.linalg import splu
+
+from dispersa import MatrizDispersa, conviene_dispersa
+from forma_estandar import costos_fase_uno, forma_estandar, tabla_desde_forma
+from historial import HistorialSimplex
+
+class FactorizacionBase:
+    """
+    Factorización LU de la matriz base con actualizaciones en forma
+    producto: LAPACK (pivoteo parcial) si B es densa y SuperLU (splu) si es
+    una matriz dispersa de scipy, para que la memoria dependa de los no
+    nulos de la base y no de m x m. Cada pivote añade un vector eta; tras
+    `max_etas` pivotes se refactoriza (por defecto m / 4, entre 10 y 50:
+    con bases pequeñas refactorizar cuesta menos que aplicar muchos etas).
+    """
+    def __init__(self, B, max_etas=None):
+        self.max_etas = max_etas if max_etas is not None else min(50, max(10, B.shape[0] // 4))
+        self.refactorizar(B)
+
+    def refactorizar(self, B):
+        if issparse(B):
+            try:
+                self.lu = splu(csc_matrix(B))
+            except RuntimeError:
+                raise np.linalg.LinAlgError("La base es singular")
+            diagonal = self.lu.U.diagonal()
+        else:
+            self.lu = lu_factor(B, check_finite=False)
+            diagonal = np.diag(self.lu[0])
+        if len(diagonal) and np.min(np.abs(diagonal)) < 1e-12:
+            raise np.linalg.LinAlgError("La base es singular")
+        self.etas = []
+
+    def _resolver(self, v, traspuesta=False):
+        if isinstance(self.lu, tuple):
+            return lu_solve(self.lu, v, trans=int(traspuesta), check_finite=False)
+        return self.lu.solve(np.asarray(v, dtype=float), trans='T' if traspuesta else 'N')
+
+    def necesita_refactorizar(self):
+        return len(self.etas) >= self.max_etas
+
+    def ftran(self, a):
+        """
+        Resuelve B x = a.
+        """
+        x = self._resolver(a)
+        for r, eta in self.etas:
+            xr = x[r] / eta[r]
+            x -= xr * eta
+            x[r] = xr
+        return x
+
+    def btran(self, c):
+        """
+        Resuelve B^T y = c.
+        """
+        w = np.array(c, dtype=float)
+        for r, eta in reversed(self.etas):
+            w[r] = (w[r] - eta @ w + eta[r] * w[r]) / eta[r]
+        return self._resolver(w, traspuesta=True)
+
+    def actualizar(self, fila_pivote, columna_ftran):
+        """
+        Registra el cambio de base: la columna en la posición `fila_pivote`
+        se sustituye por la columna cuyo FTRAN es `columna_ftran`.
+        """
+        self.etas.append((fila_pivote, columna_ftran.copy()))
+
+def _columna(A, filas_extra, signos_extra, j):
+    """
+    Devuelve la columna j de [A | E], donde E son columnas unitarias implícitas.
+    """
+    n = A.shape[1]
+    if j < n:
+        return A[:, j].astype(float)
+    col = np.zeros(A.shape[0])
+    col[filas_extra[j - n]] = signos_extra[j - n]
+    return col
+
+def _matriz_base(A, filas_extra, signos_extra, base):
+    """
+    Columnas `base` de [A | E]: densa si A es densa y dispersa (CSC de
+    scipy) si A es MatrizDispersa.
+    """
+    if isinstance(A, MatrizDispersa):
+        return _base_dispersa(A, filas_extra, signos_extra, base)
+    return np.column_stack([_columna(A, filas_extra, signos_extra, j) for j in base])
+
+def _base_dispersa(A, filas_extra, signos_extra, base):
+    """
+    Matriz base en CSC tomando las columnas de A de su traspuesta (CSR de
+    A^T) sin densificar nada.
+    """
+    columnas_A = A.T
+    n = A.shape[1]
+    base = np.asarray(base, dtype=np.int64)
+    estructural = base < n
+    j = np.where(estructural, base, 0)
+    longitudes = np.where(estructural, np.diff(columnas_A.punteros)[j], 1)
+    punteros = np.concatenate(([0], np.cumsum(longitudes)))
+
+    # Los no nulos de las columnas de A salen de A^T; las de E tienen uno solo
+    de_A = np.repeat(estructural, longitudes)
+    posiciones = np.arange(punteros[-1]) - np.repeat(punteros[:-1] - columnas_A.punteros[j], longitudes)
+    filas = np.empty(punteros[-1], dtype=np.int64)
+    datos = np.empty(punteros[-1])
+    filas[de_A] = columnas_A.indices[posiciones[de_A]]
+    datos[de_A] = columnas_A.datos[posiciones[de_A]]
+    filas[~de_A] = filas_extra[base[~estructural] - n]
+    datos[~de_A] = signos_extra[base[~estructural] - n]
+    return csc_matrix((datos, filas, punteros), shape=(A.shape[0], len(base)))
+
+def _costos_reducidos(A, filas_extra, signos_extra, c, y):
+    """
+    Calcula c - [A | E]^T y sin formar la parte unitaria de la matriz.
+    """
+    return c - np.concatenate((A.T @ y, signos_extra * y[filas_extra]))
+
+def _productos_columnas(A, y, inicio, fin):
+    """
+    A[:, inicio:fin]^T y recorriendo solo ese bloque de columnas.
+    """
+    if isinstance(A, MatrizDispersa):
+        return A.T.bloque_filas(inicio, fin) @ y
+    return y @ A[:, inicio:fin]
+
+def _fila_bloque(A, filas_extra, signos_extra, y, inicio, fin):
+    """
+    [A | E]^T y en las columnas inicio..fin-1.
+    """
+    n = A.shape[1]
+    fila = np.empty(fin - inicio)
+    if inicio < n:
+        fila[:min(fin, n) - inicio] = _productos_columnas(A, y, inicio, min(fin, n))
+    if fin > n:
+        extra = slice(max(inicio, n) - n, fin - n)
+        fila[max(inicio, n) - inicio:] = signos_extra[extra] * y[filas_extra[extra]]
+    return fila
+
+def _costos_reducidos_bloque(A, filas_extra, signos_extra, c, y, inicio, fin):
+    """
+    Costos reducidos de las columnas inicio..fin-1 de [A | E].
+    """
+    return c[inicio:fin] - _fila_bloque(A, filas_extra, signos_extra, y, inicio, fin)
+
+def simplex_revisado(A, b, c, filas_extra, signos_extra, base, excluidas=None, max_etas=None, max_iteraciones=10000,
+                     tamano_segmento=None, tol=1e-9):
+    """
+    Minimiza c^T x sujeto a [A | E] x = b, x >= 0 partiendo de una base factible.
+    E son columnas unitarias (fila, signo) que no se almacenan explícitamente.
+    Las columnas `excluidas` nunca entran en la base.
+    Precios parciales: las columnas se recorren por segmentos de
+    `tamano_segmento` (por defecto max(4096, 10 m), así que en modelos poco
+    anchos hay un solo segmento) y entra la de menor costo reducido del
+    primer segmento que tenga alguno negativo; el siguiente pivote empieza a
+    buscar en ese mismo segmento.
+    Devuelve el vector x completo, la base final y los pivotes (fila, columna).
+    """
+    m, n = A.shape
+    n_total = n + len(filas_extra)
+    base = list(base)
+    fact = FactorizacionBase(_matriz_base(A, filas_extra, signos_extra, base), max_etas)
+    x_base = fact.ftran(b)
+    pivotes = []
+
+    # Columnas que pueden entrar: ni básicas ni excluidas
+    permitidas = np.ones(n_total, dtype=bool)
+    if excluidas is not None:
+        permitidas[excluidas] = False
+    candidatas = permitidas.copy()
+    candidatas[base] = False
+    if tamano_segmento is None:
+        tamano_segmento = max(4096, 10 * m)
+    n_segmentos = max(1, -(-n_total // tamano_segmento))
+    segmento = 0
+
+    for _ in range(max_iteraciones):
+        y = fact.btran(c[base])
+        col_pivote = None
+        for k in range(n_segmentos):
+            actual = (segmento + k) % n_segmentos
+            inicio = actual * tamano_segmento
+            fin = min(inicio + tamano_segmento, n_total)
+            d = _costos_reducidos_bloque(A, filas_extra, signos_extra, c, y, inicio, fin)
+            d[~candidatas[inicio:fin]] = 0.0
+            j = int(np.argmin(d))
+            if d[j] < -tol:
+                col_pivote, segmento = inicio + j, actual
+                break
+        if col_pivote is None:
+            break
+
+        alfa = fact.ftran(_columna(A, filas_extra, signos_extra, col_pivote))
+        positivos = alfa > tol
+        if not np.any(positivos):
+            raise ValueError("El problema no está acotado.")
+        ratios = np.full(m, np.inf)
+        ratios[positivos] = x_base[positivos] / alfa[positivos]
+        fila_pivote = int(np.argmin(ratios))
+        theta = ratios[fila_pivote]
+
+        x_base -= theta * alfa
+        x_base[fila_pivote] = theta
+        candidatas[base[fila_pivote]] = permitidas[base[fila_pivote]]
+        candidatas[col_pivote] = False
+        base[fila_pivote] = col_pivote
+        pivotes.append((fila_pivote, col_pivote))
+
+        if fact.necesita_refactorizar():
+            fact.refactorizar(_matriz_base(A, filas_extra, signos_extra, base))
+            x_base = fact.ftran(b)
+        else:
+            fact.actualizar(fila_pivote, alfa)
+    else:
+        raise ValueError("Se alcanzó el máximo de iteraciones del simplex revisado.")
+
+    x = np.zeros(n_total)
+    x[base] = x_base
+    return x, base, pivotes
+
+def simplex_dual_revisado(A, b, c, filas_extra, signos_extra, base, excluidas=None, max_etas=None, max_iteraciones=10000, tol=1e-9):
+    """
+    Simplex dual sobre la misma forma que `simplex_revisado`, partiendo de una
+    base dual factible (costos reducidos no negativos) cuyo x_B puede tener
+    componentes negativas, p. ej. tras cambiar el lado derecho.
+    Devuelve el vector x completo, la base final y los pivotes (fila, columna).
+    """
+    m, n = A.shape
+    n_total = n + len(filas_extra)
+    base = list(base)
+    permitidas = np.ones(n_total, dtype=bool)
+    if excluidas is not None:
+        permitidas[excluidas] = False
+    fact = FactorizacionBase(_matriz_base(A, filas_extra, signos_extra, base), max_etas)
+    x_base = fact.ftran(b)
+    d = _costos_reducidos(A, filas_extra, signos_extra, c, fact.btran(c[base]))
+    pivotes = []
+
+    for _ in range(max_iteraciones):
+        fila_pivote = int(np.argmin(x_base))
+        if x_base[fila_pivote] >= -tol:
+            break
+
+        # Fila pivote de la tabla sin formar B^-1 A; los costos reducidos se
+        # actualizan con ella y solo se recalculan al refactorizar
+        e = np.zeros(m)
+        e[fila_pivote] = 1.0
+        rho = fact.btran(e)
+        fila = np.concatenate((A.T @ rho, signos_extra * rho[filas_extra]))
+
+        candidatas = permitidas & (fila < -tol)
+        candidatas[base] = False
+        if not np.any(candidatas):
+            raise ValueError("El problema no tiene solución factible.")
+        ratios = np.full(n_total, np.inf)
+        ratios[candidatas] = np.maximum(d[candidatas], 0.0) / -fila[candidatas]
+        col_pivote = int(np.argmin(ratios))
+
+        alfa = fact.ftran(_columna(A, filas_extra, signos_extra, col_pivote))
+        theta = x_base[fila_pivote] / alfa[fila_pivote]
+        x_base -= theta * alfa
+        x_base[fila_pivote] = theta
+        d -= d[col_pivote] / fila[col_pivote] * fila
+        base[fila_pivote] = col_pivote
+        d[base] = 0.0
+        pivotes.append((fila_pivote, col_pivote))
+
+        if fact.necesita_refactorizar():
+            fact.refactorizar(_matriz_base(A, filas_extra, signos_extra, base))
+            x_base = fact.ftran(b)
+            d = _costos_reducidos(A, filas_extra, signos_extra, c, fact.btran(c[base]))
+        else:
+            fact.actualizar(fila_pivote, alfa)
+    else:
+        raise ValueError("Se alcanzó el máximo de iteraciones del simplex dual.")
+
+    x = np.zeros(n_total)
+    x[base] = x_base
+    return x, base, pivotes
+
+def _expulsar_artificiales(A, filas_extra, signos_extra, base, artificiales, tamano_segmento=1024, tol=1e-9):
+    """
+    Saca de la base las variables artificiales que terminaron la fase I en cero,
+    pivotando sobre cualquier columna no artificial con elemento no nulo en su fila.
+    La fila de la tabla se calcula por segmentos hasta dar con una columna.
+    """
+    m, n = A.shape
+    n_total = n + len(filas_extra)
+    es_artificial = np.zeros(n_total, dtype=bool)
+    es_artificial[artificiales] = True
+    base = list(base)
+    pivotes = []
+    fact = None
+    for fila in range(m):
+        if not es_artificial[base[fila]]:
+            continue
+        if fact is None:
+            fact = FactorizacionBase(_matriz_base(A, filas_extra, signos_extra, base))
+        e = np.zeros(m)
+        e[fila] = 1.0
+        rho = fact.btran(e)
+        for inicio in range(0, n_total, tamano_segmento):
+            fin = min(inicio + tamano_segmento, n_total)
+            fila_tabla = _fila_bloque(A, filas_extra, signos_extra, rho, inicio, fin)
+            candidatas = np.where(~es_artificial[inicio:fin] & (np.abs(fila_tabla) > tol))[0]
+            if len(candidatas):
+                entra = inicio + int(candidatas[0])
+                break
+        else:
+            continue
+        alfa = fact.ftran(_columna(A, filas_extra, signos_extra, entra))
+        base[fila] = entra
+        pivotes.append((fila, entra))
+        if fact.necesita_refactorizar():
+            fact.refactorizar(_matriz_base(A, filas_extra, signos_extra, base))
+        else:
+            fact.actualizar(fila, alfa)
+    return base, pivotes
+
+def resolver_forma_estandar(fe):
+    """
+    Resuelve la forma estándar en dos fases con el simplex revisado.
+    Devuelve el vector x completo, la base óptima y los pivotes.
+    """
+    A, b = fe['A'], fe['b']
+    filas_extra, signos_extra = fe['filas_extra'], fe['signos_extra']
+    artificiales = fe['artificiales']
+    base = fe['base']
+    pivotes = []
+
+    if len(artificiales):
+        # Fase I: minimizar la suma de las artificiales
+        x, base, pivotes_fase = simplex_revisado(A, b, costos_fase_uno(fe), filas_extra, signos_extra, base)
+        pivotes += pivotes_fase
+        if x[artificiales].sum() > 1e-7:
+            raise ValueError("El problema no tiene solución factible.")
+        base, pivotes_fase = _expulsar_artificiales(A, filas_extra, signos_extra, base, artificiales)
+        pivotes += pivotes_fase
+
+    # Fase II con las artificiales fuera de la base
+    x, base, pivotes_fase = simplex_revisado(A, b, fe['c'], filas_extra, signos_extra, base, excluidas=artificiales)
+    pivotes += pivotes_fase
+    return x, base, pivotes
+
+def resolver_simplex_revisado(objetivo, restricciones, decimales=2, dispersa=None, final=None):
+    """
+    Resuelve el problema con el simplex revisado en dos fases.
+    Devuelve la solución óptima, el valor óptimo y el historial de tablas,
+    que solo se materializan si se consultan. Con `decimales=None` la
+    solución no se redondea. `dispersa` fuerza (True) o evita (False) el
+    almacenamiento disperso de A; por defecto se decide según la densidad.
+    Con A dispersa también la base se factoriza dispersa (SuperLU).
+    Con el diccionario `final` se devuelven en él la forma estándar y la base
+    óptima, como en optimizacion.resolver_simplex.
+    """
+    if dispersa is None:
+        dispersa = conviene_dispersa(restricciones, len(objetivo['coeff']))
+    fe = forma_estandar(objetivo, restricciones, dispersa)
+    x, base, pivotes = resolver_forma_estandar(fe)
+    if final is not None:
+        final.update(forma=fe, base=list(base))
+
+    historial = HistorialSimplex(constructor=partial(tabla_desde_forma, fe))
+    for fila_pivote, col_pivote in pivotes:
+        historial.registrar(fila_pivote, col_pivote)
+
+    solucion = x[:fe['n_variables']]
+    valor_optimo = np.dot(objetivo['coeff'], solucion)
+    if decimales is None:
+        return [float(v) for v in solucion], float(valor_optimo), historial
+
+    solucion = [float(round(v, decimales)) for v in solucion]  # Redondear (2 decimales por defecto)
+    valor_optimo = float(round(valor_optimo, decimales))  # Redondear (2 decimales por defecto)
+
+    return solucion, valor_optimo, historial
@@ -0,0 +1,390 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, islice
+from math import comb
+
+from control import Detenido
+from dispersa import MatrizDispersa
+from evaluacion import mascara_factibles
+from problema import SENTIDOS, Problema, fila_densa, numero_variables
+
+def matrices_restricciones(restricciones, n_variables=None, dispersa=False):
+    """
+    Convierte la lista de restricciones en la matriz A, el vector b y los sentidos.
+    Las filas pueden ser listas densas o diccionarios {índice: coeficiente};
+    con `dispersa` A se devuelve como MatrizDispersa. Un Problema devuelve
+    directamente sus arrays (A se convierte solo si su almacenamiento no es
+    el pedido).
+    """
+    if isinstance(restricciones, Problema):
+        A = restricciones.A
+        if dispersa and not restricciones.dispersa:
+            A = MatrizDispersa.desde_densa(A)
+        elif not dispersa and restricciones.dispersa:
+            A = A.densa()
+        return A, restricciones.b, restricciones.sentidos
+    if n_variables is None:
+        n_variables = numero_variables(restricciones)
+    if dispersa:
+        A = MatrizDispersa.desde_restricciones(restricciones, n_variables)
+    else:
+        A = np.array([fila_densa(r['a'], n_variables) for r in restricciones],
+                     dtype=float).reshape(len(restricciones), n_variables)
+    b = np.array([r['c'] for r in restricciones], dtype=float)
+    sentidos = np.array([SENTIDOS[r['inecuacion']] for r in restricciones], dtype=np.int8)
+    return A, b, sentidos
+
+def resolver_bloque(A, b, indices, tol=1e-12):
+    """
+    Resuelve de una vez los sistemas A[indices[k]] x = b[indices[k]].
+    Los sistemas singulares se descartan comparando el determinante con el
+    producto de las normas de sus filas. Devuelve los puntos y las filas
+    de `indices` que tienen solución única.
+    """
+    M = A[indices]
+    rhs = b[indices]
+    normas = np.prod(np.linalg.norm(M, axis=2), axis=1)
+    validos = np.abs(np.linalg.det(M)) > tol * np.where(normas > 0, normas, 1.0)
+    validos &= normas > 0
+    puntos = np.linalg.solve(M[validos], rhs[validos][..., None])[..., 0]
+    return puntos, validos
+
+def _bloques_factibles(A, b, sentidos, combinaciones, tamano_bloque):
+    """
+    Recorre un iterador de combinaciones por bloques y devuelve, bloque a
+    bloque, los puntos de intersección que son factibles.
+    """
+    n_variables = A.shape[1]
+    while True:
+        indices = np.array(list(islice(combinaciones, tamano_bloque)), dtype=int)
+        if not len(indices):
+            break
+        puntos, _ = resolver_bloque(A, b, indices.reshape(-1, n_variables))
+        # Los bloques sin puntos también se devuelven: el control avisa entre bloques
+        yield puntos[mascara_factibles(A, b, sentidos, puntos)] if len(puntos) else puntos
+
+def sin_duplicados(bloques, decimales, n_variables):
+    bloques = [p for p in bloques if len(p)]
+    if not bloques:
+        return np.empty((0, n_variables))
+    return np.unique(np.round(np.vstack(bloques), decimales) + 0.0, axis=0)
+
+def enumerar_vertices(restricciones, tamano_bloque=4096, decimales=2, control=None):
+    """
+    Calcula los puntos factibles intersectando cada subconjunto de n restricciones.
+    Las combinaciones se procesan por bloques de `tamano_bloque`, de modo que
+    la memoria no depende de C(m, n). Con un `control` se informa de las
+    combinaciones recorridas tras cada bloque y, si se detiene, la excepción
+    Detenido lleva en `vertices` los puntos encontrados hasta entonces.
+    """
+    if not restricciones:
+        return []
+    A, b, sentidos = matrices_restricciones(restricciones)
+    m, n_variables = A.shape
+    combinaciones = combinations(range(m), n_variables)
+    bloques = _bloques_factibles(A, b, sentidos, combinaciones, tamano_bloque)
+    if control is not None:
+        bloques = _bloques_controlados(bloques, control, tamano_bloque, comb(m, n_variables), decimales, n_variables)
+    vertices = sin_duplicados(bloques, decimales, n_variables)
+    return [tuple(float(coord) for coord in p) for p in vertices]
+
+def _bloques_controlados(bloques, control, tamano_bloque, total, decimales, n_variables):
+    """
+    Pasa los bloques avisando al control; al detenerse adjunta los vértices ya hallados.
+    """
+    hallados = []
+    for k, bloque in enumerate(bloques, start=1):
+        if len(bloque):
+            hallados.append(bloque)
+        yield bloque
+        try:
+            control.informar(combinaciones=min(k * tamano_bloque, total), total=total)
+        except Detenido as e:
+            e.vertices = [tuple(float(coord) for coord in p) for p in sin_duplicados(hallados, decimales, n_variables)]
+            raise
+
+def desrangear_combinacion(rango, m, k):
+    """
+    Devuelve la combinación de k elementos de range(m) que ocupa la posición
+    `rango` en orden lexicográfico (el mismo que itertools.combinations).
+    """
+    combinacion = []
+    x = 0
+    for restantes in range(k, 0, -1):
+        while True:
+            cantidad = comb(m - x - 1, restantes - 1)
+            if rango < cantidad:
+                break
+            rango -= cantidad
+            x += 1
+        combinacion.append(x)
+        x += 1
+    return combinacion
+
+def combinaciones_en_rango(inicio, fin, m, k):
+    """
+    Genera las combinaciones con rango en [inicio, fin) sin recorrer las anteriores.
+    """
+    if inicio >= fin:
+        return
+    c = desrangear_combinacion(inicio, m, k)
+    for _ in range(inicio, fin):
+        yield tuple(c)
+        i = k - 1
+        while i >= 0 and c[i] == m - k + i:
+            i -= 1
+        if i < 0:
+            return
+        c[i] += 1
+        for j in range(i + 1, k):
+            c[j] = c[j - 1] + 1
+
+def _enumerar_rango(A, b, sentidos, coeff, inicio, fin, tamano_bloque, decimales):
+    """
+    Trabajo de cada proceso: vértices factibles sin duplicados del rango
+    de combinaciones [inicio, fin) y su mejor valor de `coeff` (a maximizar).
+    """
+    combinaciones = combinaciones_en_rango(inicio, fin, A.shape[0], A.shape[1])
+    vertices = sin_duplicados(_bloques_factibles(A, b, sentidos, combinaciones, tamano_bloque), decimales, A.shape[1])
+    if coeff is None or not len(vertices):
+        return vertices, -np.inf, None
+    valores = vertices @ coeff
+    k = int(np.argmax(valores))
+    return vertices, float(valores[k]), vertices[k]
+
+def enumerar_vertices_paralelo(restricciones, objetivo=None, n_procesos=None, tamano_rango=None, tamano_bloque=4096, decimales=2):
+    """
+    Reparte el espacio de combinaciones en rangos contiguos entre varios
+    procesos. Cada proceso devuelve sus vértices factibles locales y su mejor
+    valor objetivo; los resultados se combinan al final.
+    Devuelve los puntos factibles, el mejor punto y el mejor valor (o None).
+    """
+    if not restricciones:
+        return [], None, None
+    A, b, sentidos = matrices_restricciones(restricciones)
+    m, n_variables = A.shape
+    total = comb(m, n_variables)
+
+    coeff = None
+    if objetivo is not None:
+        coeff = np.array(objetivo['coeff'], dtype=float)
+        if objetivo['type'] == 'min':
+            coeff = -coeff
+
+    if tamano_rango is None:
+        tamano_rango = max(tamano_bloque, -(-total // (4 * (n_procesos or 4))))
+    rangos = [(inicio, min(inicio + tamano_rango, total)) for inicio in range(0, total, tamano_rango)]
+
+    with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+        futuros = [ejecutor.submit(_enumerar_rango, A, b, sentidos, coeff, inicio, fin, tamano_bloque, decimales)
+                   for inicio, fin in rangos]
+        resultados = [f.result() for f in futuros]
+
+    vertices = sin_duplicados([r[0] for r in resultados], decimales, n_variables)
+    puntos_factibles = [tuple(float(coord) for coord in p) for p in vertices]
+
+    mejor = max(resultados, key=lambda r: r[1], default=None)
+    if mejor is None or mejor[2] is None:
+        return puntos_factibles, None, None
+    mejor_valor = mejor[1] if objetivo['type'] == 'max' else -mejor[1]
+    return puntos_factibles, tuple(float(coord) for coord in mejor[2]), float(mejor_valor)
+
+def _desigualdades(A, b, sentidos):
+    """
+    Reescribe las restricciones como G x <= h (las igualdades como dos filas).
+    Devuelve también el índice de la restricción original de cada fila.
+    """
+    filas, rhs, origen = [], [], []
+    for i, sentido in enumerate(sentidos):
+        if sentido in (1, 0):
+            filas.append(A[i])
+            rhs.append(b[i])
+            origen.append(i)
+        if sentido in (-1, 0):
+            filas.append(-A[i])
+            rhs.append(-b[i])
+            origen.append(i)
+    n_variables = A.shape[1]
+    return (np.array(filas, dtype=float).reshape(-1, n_variables), np.array(rhs, dtype=float),
+            np.array(origen, dtype=int))
+
+def _descripcion_doble(H, tol=1e-9, control=None):
+    """
+    Método de doble descripción para el cono {z : H z <= 0}.
+    Devuelve los rayos extremos (por filas), la base del espacio de linealidad
+    y la incidencia rayo-restricción (restricciones activas en cada rayo).
+    Con un `control` se informa tras cada restricción incorporada.
+    """
+    d = H.shape[1]
+    linealidad = np.eye(d)
+    rayos = np.empty((0, d))
+    incidencia = np.empty((0, 0), dtype=bool)
+
+    for k, h in enumerate(H):
+        if control is not None:
+            control.informar(restricciones=k, total=len(H), rayos=len(rayos))
+        incidencia = np.hstack((incidencia, np.zeros((len(rayos), 1), dtype=bool)))
+
+        v = linealidad @ h
+        if len(linealidad) and np.max(np.abs(v)) > tol:
+            # La restricción corta el espacio de linealidad: una dirección pasa a ser rayo
+            p = int(np.argmax(np.abs(v)))
+            direccion = linealidad[p]
+            linealidad = np.delete(linealidad - np.outer(v / v[p], direccion), p, axis=0)
+            if len(rayos):
+                rayos = rayos - np.outer((rayos @ h) / v[p], direccion)
+            nuevo = -direccion if v[p] > 0 else direccion
+            rayos = np.vstack((rayos, nuevo / np.max(np.abs(nuevo))))
+            incidencia[:, k] = True
+            incidencia = np.vstack((incidencia, np.zeros((1, k + 1), dtype=bool)))
+            incidencia[-1, :k] = True
+            continue
+
+        s = rayos @ h
+        positivos = np.where(s > tol)[0]
+        negativos = np.where(s < -tol)[0]
+        if not len(positivos):
+            incidencia[:, k] = np.abs(s) <= tol
+            continue
+
+        # Rayos adyacentes a ambos lados del hiperplano generan un rayo nuevo
+        minimo_activas = d - len(linealidad) - 2
+        nuevos, incidencias_nuevas = [], []
+        for i in positivos:
+            for j in negativos:
+                comunes = incidencia[i, :k] & incidencia[j, :k]
+                if comunes.sum() < minimo_activas:
+                    continue
+                if np.count_nonzero(np.all(incidencia[:, :k][:, comunes], axis=1)) > 2:
+                    continue
+                rayo = s[i] * rayos[j] - s[j] * rayos[i]
+                nuevos.append(rayo / np.max(np.abs(rayo)))
+                incidencias_nuevas.append(np.append(comunes, True))
+
+        conservar = s <= tol
+        incidencia[:, k] = np.abs(s) <= tol
+        rayos = rayos[conservar]
+        incidencia = incidencia[conservar]
+        if nuevos:
+            rayos = np.vstack((rayos, nuevos))
+            incidencia = np.vstack((incidencia, incidencias_nuevas))
+
+    return rayos, linealidad, incidencia
+
+def vertices_descripcion_doble(restricciones, tol=1e-9, control=None):
+    """
+    Enumera los vértices del poliedro con el método de doble descripción sobre
+    el cono homogeneizado {(x, t) : A x - b t <= 0, t >= 0}. El coste depende
+    del número de rayos que se generan, no de C(m, n).
+    Devuelve los vértices (sin redondear) y, para cada uno, la máscara de
+    restricciones originales activas.
+    """
+    A, b, sentidos = matrices_restricciones(restricciones)
+    m, n_variables = A.shape
+    G, h, origen = _desigualdades(A, b, sentidos)
+
+    # Homogeneizar y normalizar filas; la fila t >= 0 va primero
+    H = np.hstack((G, -h[:, None]))
+    normas = np.linalg.norm(H, axis=1)
+    utiles = normas > tol
+    H = np.vstack((np.append(np.zeros(n_variables), -1.0), H[utiles] / normas[utiles, None]))
+    origen = np.concatenate(([-1], origen[utiles]))
+
+    # Filas nulas con lado derecho negativo: 0 <= h < 0 es infactible
+    if np.any(~utiles & (h < -tol)):
+        return np.empty((0, n_variables)), np.zeros((0, m), dtype=bool)
+
+    rayos, linealidad, incidencia = _descripcion_doble(H, tol, control)
+    if len(linealidad):
+        # El poliedro contiene una recta: no tiene vértices
+        return np.empty((0, n_variables)), np.zeros((0, m), dtype=bool)
+
+    es_vertice = rayos[:, -1] > tol
+    vertices = rayos[es_vertice, :-1] / rayos[es_vertice, -1:]
+    activas = np.zeros((len(vertices), m), dtype=bool)
+    for fila, restriccion in enumerate(origen):
+        if restriccion >= 0:
+            activas[:, restriccion] |= incidencia[es_vertice, fila]
+    return vertices, activas
+
+def enumerar_vertices_dd(restricciones, decimales=2, control=None):
+    """
+    Puntos factibles calculados con doble descripción, en el mismo formato
+    que `enumerar_vertices` (`control` como en `enumerar_vertices`, pero sin
+    vértices parciales: hasta el final los rayos no son vértices del poliedro).
+    """
+    if not restricciones:
+        return []
+    vertices, _ = vertices_descripcion_doble(restricciones, control=control)
+    vertices = sin_duplicados([vertices], decimales, numero_variables(restricciones))
+    return [tuple(float(coord) for coord in p) for p in vertices]
+
+def enumerar_vertices_diferidos(restricciones, decimales=2, filas_por_ronda=20, tol=1e-9, control=None):
+    """
+    Vértices por doble descripción sobre un conjunto de trabajo de
+    restricciones que crece bajo demanda, como en los planos de corte: en
+    cada ronda se calculan los vértices, rayos y direcciones de linealidad
+    del poliedro de trabajo, se evalúan todas las restricciones a la vez y se
+    añaden las `filas_por_ronda` más violadas. Cuando ningún generador viola
+    ninguna restricción, el poliedro de trabajo (que contiene a la región)
+    está dentro de ella, así que sus vértices son los de la región. Conviene
+    con muchas restricciones de las que solo unas pocas definen la región.
+    Devuelve los puntos en el mismo formato que `enumerar_vertices`.
+    """
+    if not restricciones:
+        return []
+    A, b, sentidos = matrices_restricciones(restricciones)
+    n_variables = A.shape[1]
+    G, h, _ = _desigualdades(A, b, sentidos)
+    normas = np.linalg.norm(G, axis=1)
+    utiles = normas > tol
+    if np.any(~utiles & (h < -tol)):
+        return []
+    G, h = G[utiles] / normas[utiles, None], h[utiles] / normas[utiles]
+    tolerancias = tol * (1.0 + np.abs(h))
+
+    en_trabajo = np.zeros(len(h), dtype=bool)
+    fila_t = np.append(np.zeros(n_variables), -1.0)
+    while True:
+        H = np.vstack((fila_t, np.hstack((G[en_trabajo], -h[en_trabajo, None]))))
+        rayos, linealidad, _ = _descripcion_doble(H, tol, control)
+
+        # Generadores (x, t): vértices con t = 1, rayos y ± direcciones de linealidad con t = 0
+        es_vertice = rayos[:, -1] > tol
+        rayos[es_vertice] /= rayos[es_vertice, -1:]
+        generadores = np.vstack((rayos, linealidad, -linealidad))
+        exceso = G @ generadores[:, :-1].T - h[:, None] * generadores[:, -1]
+        violacion = exceso.max(axis=1, initial=-np.inf)
+        violadas = np.where((violacion > tolerancias) & ~en_trabajo)[0]
+        if not len(violadas):
+            break
+        en_trabajo[violadas[np.argsort(-violacion[violadas])[:filas_por_ronda]]] = True
+
+    if len(linealidad):
+        # La región contiene una recta: no tiene vértices
+        return []
+    vertices = sin_duplicados([rayos[es_vertice, :-1]], decimales, n_variables)
+    return [tuple(float(coord) for coord in p) for p in vertices]
+
+def caras_poliedro(restricciones):
+    """
+    Devuelve las caras del poliedro como listas ordenadas de vértices.
+    Cada restricción aporta una cara con los vértices que la tienen activa.
+    """
+    if not restricciones:
+        return []
+    A, _, _ = matrices_restricciones(restricciones)
+    vertices, activas = vertices_descripcion_doble(restricciones)
+    caras = []
+    for k in range(A.shape[0]):
+        puntos = vertices[activas[:, k]]
+        puntos = np.unique(np.round(puntos, 9), axis=0)
+        if len(puntos) < 3:
+            continue
+        # Ordenar los vértices por ángulo dentro del plano de la cara
+        centro = puntos.mean(axis=0)
+        base_plano = np.linalg.svd(A[k][None, :])[2][1:3]
+        coords = (puntos - centro) @ base_plano.T
+        orden = np.argsort(np.arctan2(coords[:, 1], coords[:, 0]))
+        caras.append(puntos[orden])
+    return caras